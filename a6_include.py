@@ -1,3 +1,12 @@
+from bisect import bisect_left
+from math import isqrt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class DynamicArrayException(Exception):
     pass
 
@@ -86,6 +95,246 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# ---------- Stronger hash functions, selectable by name ---------- #
+
+MASK_32 = 0xFFFFFFFF
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    32-bit FNV-1a hash of the UTF-8 bytes of key.
+    Every byte is xor-ed in and then multiplied by the FNV prime, so
+    order matters and anagrams no longer collide.
+    """
+    hash = 0x811C9DC5
+    for byte in key.encode('utf-8', 'surrogatepass'):
+        hash = ((hash ^ byte) * 0x01000193) & MASK_32
+    return hash
+
+
+def murmur_hash(key: str, seed: int = 0) -> int:
+    """
+    32-bit MurmurHash3 (x86_32) of the UTF-8 bytes of key.
+    Mixes four bytes at a time and finishes with an avalanche step,
+    so every output bit depends on every input bit.
+    """
+    data = key.encode('utf-8', 'surrogatepass')
+    length = len(data)
+    hash = seed & MASK_32
+    tail_start = length - length % 4
+
+    for index in range(0, tail_start, 4):
+        block = int.from_bytes(data[index:index + 4], 'little')
+        block = (block * 0xCC9E2D51) & MASK_32
+        block = ((block << 15) | (block >> 17)) & MASK_32
+        block = (block * 0x1B873593) & MASK_32
+        hash ^= block
+        hash = ((hash << 13) | (hash >> 19)) & MASK_32
+        hash = (hash * 5 + 0xE6546B64) & MASK_32
+
+    # the last 1-3 bytes, if any
+    if tail_start < length:
+        block = int.from_bytes(data[tail_start:], 'little')
+        block = (block * 0xCC9E2D51) & MASK_32
+        block = ((block << 15) | (block >> 17)) & MASK_32
+        block = (block * 0x1B873593) & MASK_32
+        hash ^= block
+
+    # finaliser
+    hash ^= length
+    hash ^= hash >> 16
+    hash = (hash * 0x85EBCA6B) & MASK_32
+    hash ^= hash >> 13
+    hash = (hash * 0xC2B2AE35) & MASK_32
+    hash ^= hash >> 16
+    return hash
+
+
+def seeded_hash(seed: int = 0):
+    """
+    Return a hash function wrapping the built-in hash(), mixed with seed.
+    Fast (it runs in C), but str hashes change between interpreter runs
+    unless PYTHONHASHSEED is set, so it is not in STABLE_HASH_FUNCTIONS.
+    """
+    def hash_function(key: str) -> int:
+        return hash((seed, key))
+
+    hash_function.__name__ = 'seeded_hash_' + str(seed)
+    return hash_function
+
+
+# hash functions the HashMap constructors accept by name
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a_hash,
+    'murmur3': murmur_hash,
+    'builtin': seeded_hash(0),
+}
+
+# registered names whose hashes are the same in every process and every run;
+# only these can be stored in files (mmap_map, snapshot) or computed in one
+# process and used in another (sharded_map). 'builtin' is salted per process.
+STABLE_HASH_FUNCTIONS = frozenset(('hash_function_1', 'hash_function_2', 'fnv1a', 'murmur3'))
+
+
+def get_hash_function(function):
+    """
+    Return function itself if it is callable, otherwise the registered
+    hash function named function. Raises ValueError for unknown names.
+    """
+    if callable(function):
+        return function
+    if function not in HASH_FUNCTIONS:
+        raise ValueError(f"unknown hash function {function!r}, "
+                         f"expected one of {', '.join(HASH_FUNCTIONS)}")
+    return HASH_FUNCTIONS[function]
+
+
+def is_stable_hash_function(function) -> bool:
+    """
+    Return True if function (a name or a function, possibly wrapped by
+    mixed()) is registered under a name in STABLE_HASH_FUNCTIONS.
+    Unregistered functions are not known to be stable.
+    """
+    function = get_hash_function(function)
+    function = getattr(function, 'unmixed', function)
+    return any(HASH_FUNCTIONS[name] is function for name in STABLE_HASH_FUNCTIONS)
+
+
+# ------------- Table sizing: prime table and powers of two ------------- #
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# primes, each roughly double the one before and as far as possible from
+# the neighbouring powers of two; used instead of searching for a prime
+PRIME_CAPACITIES = (
+    3, 7, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593,
+    49157, 98317, 196613, 393241, 786433, 1572869, 3145739, 6291469,
+    12582917, 25165843, 50331653, 100663319, 201326611, 402653189,
+    805306457, 1610612741,
+)
+
+# ways a HashMap can round a requested capacity, see round_capacity()
+SIZINGS = ('prime', 'table', 'pow2')
+
+
+def table_prime(capacity: int) -> int:
+    """
+    Return the smallest prime in PRIME_CAPACITIES that is >= capacity.
+    Past the end of the table, the next prime is searched for as usual.
+    """
+    index = bisect_left(PRIME_CAPACITIES, capacity)
+    if index < len(PRIME_CAPACITIES):
+        return PRIME_CAPACITIES[index]
+
+    capacity |= 1
+    while any(capacity % factor == 0 for factor in range(3, isqrt(capacity) + 1, 2)):
+        capacity += 2
+    return capacity
+
+
+def power_of_two(capacity: int) -> int:
+    """
+    Return the smallest power of two that is >= capacity (at least 2).
+    """
+    return max(2, 1 << (capacity - 1).bit_length())
+
+
+def mix_hash(hash: int) -> int:
+    """
+    Scramble a hash into an unsigned 64-bit value whose bits all depend on
+    every input bit (splitmix64 finaliser). The sample hash functions only
+    vary in their low bits, which is all a power-of-two table looks at.
+    """
+    hash &= MASK_64
+    hash = ((hash ^ (hash >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    hash = ((hash ^ (hash >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return hash ^ (hash >> 31)
+
+
+def mixed(function):
+    """
+    Return a hash function computing mix_hash(function(key)).
+    The original function is kept as .unmixed so hash_many() can still
+    use its batch version.
+    """
+    def hash_function(key: str) -> int:
+        return mix_hash(function(key))
+
+    hash_function.__name__ = 'mixed_' + getattr(function, '__name__', 'hash')
+    hash_function.unmixed = function
+    return hash_function
+
+
+# ------- Batch versions of the sample hash functions (NumPy) ------- #
+
+# keys are encoded this many at a time, bounding the code point matrix size
+HASH_BATCH_ROWS = 65536
+
+
+def _code_points(keys: list):
+    """
+    Encode a list of strings as an int64 matrix with one row per key and one
+    column per character (code point), zero-padded to the longest key.
+    """
+    width = max(1, max(len(key) for key in keys))
+    encoded = np.array(keys, dtype='<U' + str(width))
+    return encoded.view(np.uint32).reshape(len(keys), width).astype(np.int64)
+
+
+def _hash_batch(keys, weights_for) -> "np.ndarray":
+    """
+    Hash a sequence of strings as the dot product of each key's code points
+    with weights_for(width), in chunks of HASH_BATCH_ROWS keys.
+    """
+    keys = list(keys)
+    hashes = np.zeros(len(keys), dtype=np.int64)
+    for start in range(0, len(keys), HASH_BATCH_ROWS):
+        codes = _code_points(keys[start:start + HASH_BATCH_ROWS])
+        hashes[start:start + codes.shape[0]] = codes @ weights_for(codes.shape[1])
+    return hashes
+
+
+def hash_function_1_batch(keys) -> "np.ndarray":
+    """
+    Batch version of hash_function_1: takes a sequence of strings and returns
+    a NumPy int64 array of their hashes, identical to the scalar function.
+    """
+    return _hash_batch(keys, lambda width: np.ones(width, dtype=np.int64))
+
+
+def hash_function_2_batch(keys) -> "np.ndarray":
+    """
+    Batch version of hash_function_2: takes a sequence of strings and returns
+    a NumPy int64 array of their hashes, identical to the scalar function.
+    """
+    return _hash_batch(keys, lambda width: np.arange(1, width + 1, dtype=np.int64))
+
+
+# scalar hash function -> batch version, used by hash_many()
+BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+}
+
+
+def hash_many(function, keys: list) -> list:
+    """
+    Return [function(key) for key in keys], computed with the NumPy batch
+    version of function when there is one, NumPy is installed and every key
+    is a str. Used by the bulk HashMap methods.
+    """
+    unmixed = getattr(function, 'unmixed', None)
+    if unmixed is not None:
+        return [mix_hash(hash) for hash in hash_many(unmixed, keys)]
+
+    batch = BATCH_HASH_FUNCTIONS.get(function)
+    if batch is None or np is None or not keys or not all(type(key) is str for key in keys):
+        return [function(key) for key in keys]
+    return batch(keys).tolist()
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -93,11 +342,17 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        hash is the full (un-modded) hash of the key, cached so the
+        map can rehash without calling the hash function again.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -131,9 +386,13 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, remove, contains, find, unlink, length, iterator
     """
 
+    # classes used for new nodes and for iteration
+    _node_type = SLNode
+    _iterator_type = LinkedListIterator
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -156,22 +415,23 @@ class LinkedList:
 
     def __iter__(self) -> LinkedListIterator:
         """Return an iterator for the list, starting at the head."""
-        return LinkedListIterator(self._head)
+        return self._iterator_type(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = self._node_type(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash is given, stored hashes are compared before keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -182,15 +442,50 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash is given, stored hashes are compared before keys.
+        """
         node = self._head
+        if hash is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
+
         while node:
-            if node.key == key:
+            if node.hash == hash and node.key == key:
                 return node
             node = node.next
         return node
 
+    def find(self, key: str, hash: int) -> (SLNode, SLNode, int, int):
+        """
+        Search like contains() with a hash, also counting the work done.
+        Return (node before the match, matching node or None,
+        nodes examined, full key comparisons made).
+        """
+        previous, node = None, self._head
+        probes = comparisons = 0
+        while node:
+            probes += 1
+            if node.hash == hash:
+                comparisons += 1
+                if node.key == key:
+                    break
+            previous, node = node, node.next
+        return previous, node, probes, comparisons
+
+    def unlink(self, previous: SLNode, node: SLNode) -> None:
+        """Remove node, given the node before it (None for the head), as returned by find()."""
+        if previous:
+            previous.next = node.next
+        else:
+            self._head = node.next
+        self._size -= 1
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
@@ -200,10 +495,15 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        hash is the full (un-modded) hash of the key, cached so the
+        map can rehash without calling the hash function again.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -211,3 +511,100 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ------------- Slotted (memory-lean) variants of the above ------------- #
+
+def _slotted(cls: type, slots: tuple, **attributes) -> type:
+    """
+    Build a copy of cls named "Slotted<cls>" that keeps its attributes in
+    __slots__ instead of a per-instance __dict__. Methods are shared with cls;
+    attributes replaces class attributes on the copy (e.g. the node type).
+    """
+    namespace = {name: attr for name, attr in vars(cls).items()
+                 if name not in ('__dict__', '__weakref__')}
+    namespace.update(attributes)
+    namespace['__slots__'] = slots
+    namespace['__qualname__'] = 'Slotted' + cls.__name__
+    return type('Slotted' + cls.__name__, cls.__bases__, namespace)
+
+
+SlottedDynamicArray = _slotted(DynamicArray, ('_data',))
+SlottedSLNode = _slotted(SLNode, ('key', 'value', 'next', 'hash'))
+SlottedLinkedListIterator = _slotted(LinkedListIterator, ('_node',))
+SlottedLinkedList = _slotted(LinkedList, ('_head', '_size'),
+                             _node_type=SlottedSLNode,
+                             _iterator_type=SlottedLinkedListIterator)
+SlottedHashEntry = _slotted(HashEntry, ('key', 'value', 'hash', 'is_tombstone'))
+
+
+def to_list(items) -> list:
+    """
+    Return the elements of a (Slotted)DynamicArray, or of any other
+    iterable, as a list. Used by the bulk HashMap methods.
+    """
+    if isinstance(items, (DynamicArray, SlottedDynamicArray)):
+        return [items.get_at_index(index) for index in range(items.length())]
+    return list(items)
+
+
+# ---------- Lazy views of a map's entries (both HashMaps) ---------- #
+
+class MapView:
+    """
+    Live view of a map's entries, like dict.keys()/values()/items().
+    Nothing is copied: every iter() starts a new generator over the map's
+    buckets, so iterations are independent of each other. A generator
+    raises RuntimeError if the map gets a key added or removed, or its
+    table resized or cleared, while it is being iterated.
+    """
+
+    def __init__(self, map) -> None:
+        """Initialize the view of map, which provides _live_entries() and get_size()."""
+        self._map = map
+
+    def __len__(self) -> int:
+        """Return the number of entries in the map."""
+        return self._map.get_size()
+
+    def __iter__(self):
+        """Return a new generator over the view's items."""
+        return (self._item(entry) for entry in self._map._live_entries())
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return type(self).__name__ + '(' + str(list(self)) + ')'
+
+
+class KeysView(MapView):
+    """
+    View of a map's keys
+    """
+
+    @staticmethod
+    def _item(entry) -> str:
+        return entry.key
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if key is in the map (one lookup, no iteration)."""
+        return self._map.contains_key(key)
+
+
+class ValuesView(MapView):
+    """
+    View of a map's values
+    """
+
+    @staticmethod
+    def _item(entry) -> object:
+        return entry.value
+
+
+class ItemsView(MapView):
+    """
+    View of a map's (key, value) pairs
+    """
+
+    @staticmethod
+    def _item(entry) -> tuple:
+        return entry.key, entry.value
@@ -0,0 +1,280 @@
+import asyncio
+
+from hash_map_sc import IncrementalHashMap
+from a6_include import DynamicArray, to_list, hash_function_1, hash_function_2
+
+
+class AsyncHashMap(IncrementalHashMap):
+    """
+    IncrementalHashMap for use inside an asyncio event loop.
+
+    put/get/contains_key/remove stay synchronous and cheap. When put() crosses
+    the load limit while a loop is running, the map does not allocate the new
+    bucket array on the spot: it schedules a growth task that builds the array
+    yield_every buckets at a time, installs it, and migrates the old buckets
+    yield_every at a time, giving the loop a turn after each step. Until the
+    new array is installed the current one keeps taking puts (its chains get
+    a little longer); afterwards lookups consult both arrays as usual.
+
+    The coroutines aput_many, aget_many, aremove_many, aclear and aresize_table
+    do the work of the bulk and whole-table methods in steps the same way. The
+    synchronous put_many, get_many, remove_many, clear and resize_table are
+    still there, working like IncrementalHashMap's in one go. Without a running
+    loop, put() grows like IncrementalHashMap.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 slotted: bool = False,
+                 migration_budget: int = 0,
+                 yield_every: int = 256,
+                 batch_size: int = 256,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty AsyncHashMap.
+        yield_every is the number of buckets allocated or migrated between yields to the loop,
+        batch_size the number of keys the bulk coroutines handle between yields.
+        The growth task does all of the migrating, so by default single operations migrate
+        nothing (migration_budget=0); give a budget if the map is also used without a loop.
+        """
+        super().__init__(capacity, function, slotted, migration_budget, sizing)
+        self.yield_every = yield_every
+        self.batch_size = batch_size
+        self._grower = None
+
+    def is_growing(self) -> bool:
+        """
+        Return True while a growth task is allocating or migrating
+        """
+        return self._grower is not None
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Input: requested capacity of the new bucket array
+        Output: None
+        Method schedules a cooperative growth task when called inside a running loop
+        (once; later calls while it runs do nothing), otherwise migrates like IncrementalHashMap
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            super()._start_migration(new_capacity)
+            return
+        if self._grower is None:
+            self._grower = loop.create_task(self._grow(new_capacity))
+
+    async def _grow(self, new_capacity: int) -> None:
+        """
+        Input: requested capacity of the new bucket array
+        Output: None
+        Coroutine finishes any migration in progress, allocates the new bucket array and
+        migrates into it, yielding to the loop every yield_every buckets. Grows again if the
+        table is over the load limit by the time the migration is done.
+        """
+        try:
+            await self._drain()
+            while True:
+                new_capacity = self._round_capacity(new_capacity)
+                self._begin_migration(await self._allocate(new_capacity))
+                await self._drain()
+                # puts made meanwhile can fill the new table too, and put() leaves that to this task
+                if int(self.table_load()) < 1:
+                    break
+                new_capacity = self._capacity * 2
+        finally:
+            if self._grower is asyncio.current_task():
+                self._grower = None
+
+    async def _allocate(self, capacity: int):
+        """
+        Input: capacity
+        Output: bucket array of capacity empty lists, built yield_every lists at a time
+        """
+        list_type, lists = self._list_type, []
+        for start in range(0, capacity, self.yield_every):
+            lists.extend(list_type() for _ in range(start, min(start + self.yield_every, capacity)))
+            await asyncio.sleep(0)
+        return self._array_type(lists)
+
+    async def _drain(self) -> None:
+        """
+        Migrate everything left in the old bucket array, yield_every buckets at a time
+        """
+        while self._old_buckets is not None:
+            self._migrate(self.yield_every)
+            await asyncio.sleep(0)
+
+    async def _wait_growing(self) -> None:
+        """
+        Wait until no growth task is running
+        """
+        # another waiter may start a new growth task before this one resumes, so check again
+        while self._grower is not None and self._grower is not asyncio.current_task():
+            grower = self._grower
+            try:
+                await asyncio.shield(grower)
+            except asyncio.CancelledError:
+                # clear() dropped the growth task; only a cancellation of the caller goes on
+                if not grower.cancelled():
+                    raise
+
+    def _cancel_growing(self) -> None:
+        """
+        Cancel any growth task, wherever it is (only for callers about to drop every entry)
+        """
+        if self._grower is not None and self._grower is not asyncio.current_task():
+            self._grower.cancel()
+            self._grower = None
+
+    # ------------------------------------------------------------------ #
+
+    async def aresize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Coroutine changes capacity of hash table by an incremental migration done in steps.
+        All existing key/value pairs remain in the map throughout.
+        """
+        if new_capacity < 1:
+            return
+
+        await self._wait_growing()
+        # same rule as HashMap.resize_table: every entry must fit under the load limit
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size and self._size - 1 >= new_capacity:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        # a task of its own, so waiting for it never means waiting for the caller's task
+        self._grower = asyncio.get_running_loop().create_task(self._grow(new_capacity))
+        await self._wait_growing()
+
+    async def aput_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Coroutine grows the table once, in steps, for all of the new keys, then puts the pairs
+        batch_size at a time, yielding to the loop between batches
+        """
+        pairs = to_list(pairs)
+        await self._wait_growing()
+        needed = self._size + len(pairs)
+        if needed - 1 >= self._capacity:
+            await self.aresize_table(needed)
+
+        for start in range(0, len(pairs), self.batch_size):
+            for key, value in pairs[start:start + self.batch_size]:
+                self.put(key, value)
+            await asyncio.sleep(0)
+
+    async def aget_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Coroutine returns a DA holding the value of each key, in order (None for keys not in the map),
+        yielding to the loop every batch_size keys
+        """
+        return_da = DynamicArray()
+        keys = to_list(keys)
+        for start in range(0, len(keys), self.batch_size):
+            for key in keys[start:start + self.batch_size]:
+                return_da.append(self.get(key))
+            await asyncio.sleep(0)
+        return return_da
+
+    async def aremove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Coroutine removes every given key, yielding to the loop every batch_size keys
+        """
+        keys = to_list(keys)
+        for start in range(0, len(keys), self.batch_size):
+            for key in keys[start:start + self.batch_size]:
+                self.remove(key)
+            await asyncio.sleep(0)
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap in one go like IncrementalHashMap.clear,
+        dropping any growth task
+        """
+        self._cancel_growing()
+        super().clear()
+
+    async def aclear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Coroutine builds an empty bucket array of the current capacity in steps, then swaps it in.
+        Entries put while it is building are cleared too.
+        """
+        self._cancel_growing()
+        capacity = self._capacity
+        buckets = await self._allocate(capacity)
+
+        # everything is dropped, so a growth task started meanwhile can simply stop
+        self._cancel_growing()
+        self._old_buckets = None
+        self._migrate_idx = 0
+        self._buckets = buckets
+        self._capacity = capacity
+        self._size = 0
+        self._empty = capacity
+        self._max_chain = 0
+        self._version += 1
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics like IncrementalHashMap.stats, plus whether a growth task runs
+        """
+        stats = super().stats()
+        stats['growing'] = self._grower is not None
+        return stats
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    async def main() -> None:
+        print("\nput grows in the background")
+        print("---------------------------")
+        m = AsyncHashMap(11, hash_function_2, yield_every=4)
+        for i in range(12):
+            m.put('str' + str(i), i)
+        print(m.get_capacity(), m.is_growing(), m.get('str3'))
+        await asyncio.sleep(0)
+        print(m.get_capacity(), m.is_migrating(), m.get('str3'))
+        while m.is_growing():
+            await asyncio.sleep(0)
+        print(m.get_capacity(), m.get_size(), m.empty_buckets(), m.get('str11'))
+
+        print("\nasync bulk methods")
+        print("------------------")
+        m = AsyncHashMap(11, hash_function_1, batch_size=100)
+        await m.aput_many(('key' + str(i), i) for i in range(1000))
+        print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+        values = await m.aget_many(['key1', 'key999', 'nope'])
+        print(values)
+        await m.aremove_many('key' + str(i) for i in range(500))
+        print(m.get_size(), m.contains_key('key1'), m.contains_key('key501'))
+        await m.aresize_table(5000)
+        print(m.get_capacity(), m.get_size(), m.get('key777'))
+        await m.aclear()
+        print(m.get_size(), m.get_capacity(), m.get('key777'))
+
+        print("\nsynchronous bulk methods")
+        print("------------------------")
+        m.put_many(('key' + str(i), i) for i in range(100))
+        print(m.get_many(['key1', 'key99', 'nope']), m.get_size())
+        m.remove_many('key' + str(i) for i in range(50))
+        m.resize_table(400)
+        print(m.get_size(), m.get_capacity(), m.get('key77'))
+        m.clear()
+        print(m.get_size(), m.is_growing())
+
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Event-loop lag benchmark: growing a map inside a running asyncio loop.
+
+A writer task puts --size keys into an empty map (capacity 11), yielding to
+the loop every --batch puts, while a ticker task asks to wake up every
+--interval seconds and records how late each wake-up is. A resize done
+inside one put() holds the loop for the whole rehash, which shows up as one
+very late tick; AsyncHashMap spreads the same work over many short steps.
+
+    python bench_async.py
+    python bench_async.py --size 1000000 --hash fnv1a
+
+The cyclic garbage collector's full collections also stall the loop, for
+longer as the number of nodes grows; --no-gc leaves it off so only the map's
+own pauses are measured.
+"""
+import argparse
+import asyncio
+import gc
+import sys
+import time
+
+import hash_map_sc
+from async_map import AsyncHashMap
+
+
+MAPS = {
+    'sc': lambda function: hash_map_sc.HashMap(11, function),
+    'incremental': lambda function: hash_map_sc.IncrementalHashMap(11, function),
+    'async': lambda function: AsyncHashMap(11, function),
+}
+
+
+async def ticker(interval: float, lags: list, done: asyncio.Event) -> None:
+    """
+    Sleep for interval over and over until done is set, appending how late each wake-up was
+    """
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(map_name: str, function: str, size: int, batch: int, interval: float, bulk: bool,
+              yield_every: int = 256) -> dict:
+    """
+    Input: map name, hash function name, keys to put, puts between yields, tick interval,
+    whether the async map loads through its aput_many coroutine, and its yield_every
+    Output: result dict (seconds taken and tick lag statistics)
+    """
+    m = MAPS[map_name](function)
+    if map_name == 'async':
+        m.yield_every = yield_every
+    keys = ['key' + str(i) for i in range(size)]
+    lags, done = [], asyncio.Event()
+    tick_task = asyncio.create_task(ticker(interval, lags, done))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    if bulk:
+        m.batch_size = batch
+        await m.aput_many((key, idx) for idx, key in enumerate(keys))
+    else:
+        for idx in range(0, size, batch):
+            for key in keys[idx:idx + batch]:
+                m.put(key, 0)
+            await asyncio.sleep(0)
+        # the map is only done once a background growth has finished too
+        while getattr(m, 'is_growing', lambda: False)():
+            await asyncio.sleep(0)
+    seconds = time.perf_counter() - start
+
+    done.set()
+    await tick_task
+    lags.sort()
+    return {
+        'map': map_name + (' aput_many' if bulk else ''),
+        'seconds': seconds,
+        'ticks': len(lags),
+        'p50': lags[len(lags) // 2] if lags else 0.0,
+        'p99': lags[min(len(lags) - 1, len(lags) * 99 // 100)] if lags else 0.0,
+        'max': lags[-1] if lags else 0.0,
+        'capacity': m.get_capacity(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000, help='keys to put')
+    parser.add_argument('--batch', type=int, default=256, help='puts between yields to the loop')
+    parser.add_argument('--interval', type=float, default=0.001, help='ticker interval in seconds')
+    parser.add_argument('--yield-every', type=int, default=256,
+                        help="AsyncHashMap buckets allocated or migrated between yields")
+    parser.add_argument('--hash', default='fnv1a', help='name of a hash function in HASH_FUNCTIONS')
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS), default=list(MAPS))
+    parser.add_argument('--no-gc', action='store_true', help='disable the cyclic garbage collector')
+    args = parser.parse_args()
+
+    if args.no_gc:
+        gc.disable()
+
+    runs = [(name, False) for name in args.maps]
+    if 'async' in args.maps:
+        runs.append(('async', True))
+
+    print(f"{args.size} keys, yield every {args.batch} puts, {args.interval * 1000:g} ms ticks, {args.hash}"
+          + (", gc off" if args.no_gc else ""))
+    print(f"{'map':<20}{'seconds':>9}{'ticks':>8}{'p50 lag ms':>12}{'p99 lag ms':>12}"
+          f"{'max lag ms':>12}{'capacity':>10}")
+    for name, bulk in runs:
+        result = asyncio.run(run(name, args.hash, args.size, args.batch, args.interval, bulk,
+                                 args.yield_every))
+        print(f"{result['map']:<20}{result['seconds']:>9.2f}{result['ticks']:>8}"
+              f"{result['p50'] * 1000:>12.2f}{result['p99'] * 1000:>12.2f}{result['max'] * 1000:>12.2f}"
+              f"{result['capacity']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Hash function benchmark: throughput and key distribution of every function
+registered in a6_include.HASH_FUNCTIONS.
+
+For each key set and hash function it reports keys hashed per second, the
+number of distinct hashes, and two distributions taken from real maps built
+with that function: the length of the chain each key sits in (SC map) and the
+number of probes needed to find each key (OA map), as mean / p50 / p99 / max.
+
+    python bench_hash.py
+    python bench_hash.py --size 50000 --functions fnv1a murmur3 builtin
+    python bench_hash.py --file words.txt --histogram
+"""
+import argparse
+import random
+import string
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import HASH_FUNCTIONS
+
+
+def synthetic_keys(size: int) -> dict:
+    """
+    Input: number of keys per set
+    Output: dict of key set name -> list of distinct keys
+    """
+    rng = random.Random(261)
+    digits = '0123456789'
+    anagrams = set()
+    while len(anagrams) < size:
+        anagrams.add('key' + ''.join(rng.sample(digits, 8)))
+    randoms = set()
+    while len(randoms) < size:
+        randoms.add(''.join(rng.choices(string.ascii_letters, k=rng.randint(4, 16))))
+    return {
+        'sequential': ['key' + str(i) for i in range(size)],
+        'anagram': sorted(anagrams),
+        'random': sorted(randoms),
+    }
+
+
+def file_keys(path: str) -> list:
+    """
+    Input: path of a text file
+    Output: its distinct non-blank lines, in file order
+    """
+    with open(path, encoding='utf-8') as file:
+        return list(dict.fromkeys(line.strip() for line in file if line.strip()))
+
+
+def throughput(function, keys: list) -> float:
+    """
+    Input: hash function and keys
+    Output: keys hashed per second
+    """
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def chain_lengths(function, keys: list) -> list:
+    """
+    Input: hash function and keys
+    Output: for each key, the length of the SC chain it ends up in
+    """
+    m = hash_map_sc.HashMap(11, function)
+    m.put_many((key, None) for key in keys)
+    lengths = []
+    for idx in range(m.get_capacity()):
+        length = m._buckets[idx].length()
+        lengths.extend([length] * length)
+    return lengths
+
+
+def probe_lengths(function, keys: list) -> list:
+    """
+    Input: hash function and keys
+    Output: for each key, the number of slots a successful OA lookup examines
+    """
+    m = hash_map_oa.HashMap(11, function)
+    m.put_many((key, None) for key in keys)
+    lengths = []
+    # the map reports the slots each lookup examined to its probe hook (see instrumentation.py),
+    # so the counts follow its own hashing, sizing and probe sequence
+    m._probe_hook = lambda op, probes, comparisons, tombstones: lengths.append(probes)
+    for key in keys:
+        m.get(key)
+    return lengths
+
+
+def summary(lengths: list) -> str:
+    """
+    Input: list of lengths
+    Output: "mean p50 p99 max" as a fixed-width string
+    """
+    ordered = sorted(lengths)
+    mean = sum(ordered) / len(ordered)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)]
+    return f"{mean:>7.2f}{p50:>5}{p99:>6}{ordered[-1]:>7}"
+
+
+def histogram(lengths: list, buckets: int = 8) -> str:
+    """
+    Input: list of lengths
+    Output: counts of keys with length 1, 2, ... buckets-1 and buckets or more
+    """
+    counts = [0] * buckets
+    for length in lengths:
+        counts[min(length, buckets) - 1] += 1
+    return '  '.join(f"{idx + 1}{'+' if idx == buckets - 1 else ''}:{count}" for idx, count in enumerate(counts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=20_000, help='keys per synthetic key set')
+    parser.add_argument('--file', action='append', default=[], help='extra key set, one key per line')
+    parser.add_argument('--functions', nargs='+', choices=list(HASH_FUNCTIONS), default=list(HASH_FUNCTIONS))
+    parser.add_argument('--histogram', action='store_true', help='also print the full length histograms')
+    args = parser.parse_args()
+
+    key_sets = synthetic_keys(args.size)
+    for path in args.file:
+        key_sets[path] = file_keys(path)
+
+    print(f"{'keys':<12}{'function':<17}{'keys/s':>11}{'distinct':>10}"
+          f"  {'chain':>7}{'p50':>5}{'p99':>6}{'max':>7}"
+          f"  {'probe':>7}{'p50':>5}{'p99':>6}{'max':>7}")
+    for set_name, keys in key_sets.items():
+        for name in args.functions:
+            function = HASH_FUNCTIONS[name]
+            distinct = len(set(function(key) for key in keys))
+            chains = chain_lengths(function, keys)
+            probes = probe_lengths(function, keys)
+            print(f"{set_name:<12}{name:<17}{throughput(function, keys):>11.0f}{distinct:>10}"
+                  f"  {summary(chains)}  {summary(probes)}")
+            if args.histogram:
+                print(f"{'':<12}  chains  {histogram(chains)}")
+                print(f"{'':<12}  probes  {histogram(probes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Memory comparison of the HashMap implementations.
+
+Keys and values are created before tracing starts, so the figures are the
+bytes the map structure itself costs per entry (slots, entry objects, the
+DynamicArray), not the keys and values it stores.
+
+    python bench_memory.py                         # 100k, 1M and 5M keys
+    python bench_memory.py --sizes 1000000 --maps sc sc-slotted
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import hash_map_compact
+import hash_map_oa
+import hash_map_robin_hood
+import hash_map_sc
+
+# The sample hash functions only produce a few thousand distinct values for
+# short keys, which turns a million-key build into one long probe chain.
+# Memory per entry does not depend on the hash, so the built-in one is used.
+MAPS = {
+    'oa': lambda: hash_map_oa.HashMap(11, hash),
+    'oa-slotted': lambda: hash_map_oa.HashMap(11, hash, slotted=True),
+    'compact': lambda: hash_map_compact.HashMap(11, hash),
+    'robin-hood': lambda: hash_map_robin_hood.HashMap(11, hash),
+    'sc': lambda: hash_map_sc.HashMap(11, hash),
+    'sc-slotted': lambda: hash_map_sc.HashMap(11, hash, slotted=True),
+}
+
+
+def measure(factory, keys: list, values: list) -> (int, int, float):
+    """
+    Input: map factory, keys and values to insert
+    Output: tuple of (bytes still held by the map, peak bytes while building, seconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    m = factory()
+    for idx in range(len(keys)):
+        m.put(keys[idx], values[idx])
+
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # keep the map alive until after the measurement
+    del m
+    return current - base, peak - base, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--maps', nargs='+', choices=sorted(MAPS), default=list(MAPS))
+    args = parser.parse_args()
+
+    print(f"{'map':<12}{'entries':>12}{'bytes':>16}{'bytes/entry':>14}{'peak/entry':>14}{'seconds':>10}")
+    for size in args.sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        values = [i + 1000 for i in range(size)]
+        for name in args.maps:
+            held, peak, elapsed = measure(MAPS[name], keys, values)
+            print(f"{name:<12}{size:>12}{held:>16}{held / size:>14.1f}{peak / size:>14.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
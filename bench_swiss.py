@@ -0,0 +1,89 @@
+"""
+Lookup benchmark: Swiss table engine against the quadratic probing OA map.
+
+Runs hit-heavy (every key present) and miss-heavy (no key present) lookups,
+one get() at a time and through get_many(), and reports lookups per second
+and full key comparisons per lookup.
+
+    python bench_swiss.py
+    python bench_swiss.py --size 200000 --hash hash_function_2
+"""
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_swiss
+from a6_include import hash_function_1, hash_function_2
+
+HASH_FUNCTIONS = {
+    'builtin': hash,
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+}
+
+MAPS = {
+    'oa': hash_map_oa.HashMap,
+    'swiss': hash_map_swiss.HashMap,
+}
+
+
+class CountingKey(str):
+    """
+    str that counts how often it is compared for equality
+    """
+    comparisons = 0
+
+    def __eq__(self, other) -> bool:
+        CountingKey.comparisons += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def run(name: str, function, keys: list, lookups: dict) -> list:
+    """
+    Input: map name, hash function, keys to load, and named lists of keys to look up
+    Output: list of result rows (map, workload, lookups/s, comparisons/lookup)
+    """
+    m = MAPS[name](11, function)
+    m.put_many((key, idx) for idx, key in enumerate(keys))
+
+    rows = []
+    for workload, probe_keys in lookups.items():
+        CountingKey.comparisons = 0
+        start = time.perf_counter()
+        for key in probe_keys:
+            m.get(key)
+        elapsed = time.perf_counter() - start
+        rows.append((name, workload, len(probe_keys) / elapsed, CountingKey.comparisons / len(probe_keys)))
+
+        CountingKey.comparisons = 0
+        start = time.perf_counter()
+        m.get_many(probe_keys)
+        elapsed = time.perf_counter() - start
+        rows.append((name, workload + ' get_many', len(probe_keys) / elapsed,
+                     CountingKey.comparisons / len(probe_keys)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--hash', choices=sorted(HASH_FUNCTIONS), default='builtin')
+    args = parser.parse_args()
+
+    keys = [CountingKey('key' + str(i)) for i in range(args.size)]
+    lookups = {
+        'hit': keys,
+        'miss': [CountingKey('missing' + str(i)) for i in range(args.size)],
+    }
+
+    print(f"numpy: {'yes' if hash_map_swiss.np is not None else 'no'}")
+    print(f"{'map':<8}{'workload':<18}{'lookups/s':>14}{'cmp/lookup':>12}")
+    for name in MAPS:
+        for row in run(name, HASH_FUNCTIONS[args.hash], keys, lookups):
+            print(f"{row[0]:<8}{row[1]:<18}{row[2]:>14.0f}{row[3]:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Multi-threaded stress benchmark for concurrent_map.StripedHashMap.
+
+Runs the same mixed workload (mostly get(), some put() and remove()) on 1, 2,
+4, 8 and 16 threads sharing one map, and reports the total throughput and
+the speed-up over one thread. As a reference, the same workload also runs on
+a plain separate chaining HashMap behind a single global lock.
+
+On a CPython build with the GIL, threads take turns executing bytecode, so
+neither map scales; the numbers then show the cost of the locking. On a
+free-threaded build (python3.13t and later), operations on different stripes
+run in parallel.
+
+    python bench_threads.py
+    python bench_threads.py --threads 1 2 4 --ops 50000 --stripes 32
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+import hash_map_sc
+from concurrent_map import StripedHashMap
+
+
+class GlobalLockMap:
+    """
+    put/get/remove of a separate chaining HashMap, serialized by one lock
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize an empty HashMap and its lock
+        """
+        self._map = hash_map_sc.HashMap(capacity, function)
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: object) -> None:
+        """Add or update key"""
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key: str) -> object:
+        """Return the value of key, or None"""
+        with self._lock:
+            return self._map.get(key)
+
+    def remove(self, key: str) -> None:
+        """Remove key if it is in the map"""
+        with self._lock:
+            self._map.remove(key)
+
+
+def run(factory, threads: int, ops: int, keys: list, write_ratio: float, seed: int) -> float:
+    """
+    Input: map factory, thread count, operations per thread, key space, share of
+    writes (half put, half remove) and random seed
+    Output: seconds taken by all threads together
+    """
+    m = factory()
+    for idx, key in enumerate(keys):
+        m.put(key, idx)
+
+    # every thread gets its own pre-drawn operations, so the timed part is only map calls
+    plans = []
+    for thread in range(threads):
+        rng = random.Random(seed + thread)
+        plans.append([(rng.random(), rng.choice(keys)) for _ in range(ops)])
+
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(plan: list) -> None:
+        barrier.wait()
+        for roll, key in plan:
+            if roll >= write_ratio:
+                m.get(key)
+            elif roll < write_ratio / 2:
+                m.put(key, roll)
+            else:
+                m.remove(key)
+
+    workers = [threading.Thread(target=worker, args=(plan,)) for plan in plans]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--ops', type=int, default=20000, help='operations per thread')
+    parser.add_argument('--keys', type=int, default=10000, help='size of the key space')
+    parser.add_argument('--writes', type=float, default=0.2, help='share of operations that write')
+    parser.add_argument('--stripes', type=int, default=16)
+    parser.add_argument('--hash', default='fnv1a', help='name of a hash function in HASH_FUNCTIONS')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per result; the best is kept')
+    parser.add_argument('--seed', type=int, default=261)
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"{args.ops} ops/thread, {args.writes:.0%} writes, {args.stripes} stripes")
+
+    keys = ['key' + str(i) for i in range(args.keys)]
+    maps = {
+        'striped': lambda: StripedHashMap(11, args.hash, stripes=args.stripes),
+        'global lock': lambda: GlobalLockMap(11, args.hash),
+    }
+
+    print(f"{'threads':>8}" + ''.join(f"{name + ' ops/s':>20}{'speed-up':>10}" for name in maps))
+    single = {}
+    for threads in args.threads:
+        cells = ''
+        for name, factory in maps.items():
+            seconds = min(run(factory, threads, args.ops, keys, args.writes, args.seed)
+                          for _ in range(args.repeat))
+            throughput = threads * args.ops / seconds
+            single.setdefault(name, throughput if threads == 1 else None)
+            base = single[name]
+            cells += f"{throughput:>20.0f}" + (f"{throughput / base:>9.2f}x" if base else f"{'-':>10}")
+        print(f"{threads:>8}" + cells)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
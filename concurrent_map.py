@@ -0,0 +1,372 @@
+import itertools
+import threading
+from contextlib import contextmanager
+
+import hash_map_sc
+from a6_include import DynamicArray, to_list, hash_function_1, hash_function_2
+
+
+class StripedHashMap(hash_map_sc.HashMap):
+    """
+    Thread-safe separate chaining HashMap using lock striping.
+
+    Bucket idx is guarded by lock idx % stripes. An operation hashes its key
+    without any lock, takes the one stripe lock of its bucket, and works on
+    that bucket only, so operations on different stripes can run at the same
+    time (on free-threaded CPython builds they also run in parallel). Entry
+    counts, empty bucket counts and longest chains are kept per stripe for the
+    same reason and summed when asked for. Resizing, clear() and whole-table
+    reads (iteration, the views, get_keys_and_values) take every stripe lock,
+    always in stripe order, so they cannot deadlock with each other.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 stripes: int = 16,
+                 slotted: bool = False,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty StripedHashMap guarded by the given number of stripe locks
+        (function, slotted and sizing are as for hash_map_sc.HashMap)
+        """
+        if stripes < 1:
+            raise ValueError('stripes must be at least 1')
+
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripes = stripes
+        # entries in the buckets of each stripe, only changed under that stripe's lock
+        self._counts = [0] * stripes
+        # operations on different stripes bump the version concurrently, so each takes the
+        # next value of one shared counter instead of doing a read-modify-write of _version
+        self._versions = itertools.count(1)
+        super().__init__(capacity, function, slotted, sizing)
+        self._reset_stripe_stats()
+
+    def _reset_stripe_stats(self) -> None:
+        """
+        Set the per-stripe empty bucket counts and longest chains for a table of empty buckets.
+        Caller holds every stripe lock (or is __init__).
+        """
+        capacity, stripes = self._capacity, self._stripes
+        # stripe s guards buckets s, s + stripes, s + 2 * stripes, ...
+        self._empties = [capacity // stripes + (stripe < capacity % stripes) for stripe in range(stripes)]
+        self._max_chains = [0] * stripes
+
+    @contextmanager
+    def _all_stripes(self):
+        """
+        Hold every stripe lock, taken in stripe order, for the duration of a with block
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def _lock_stripe(self, hash: int) -> int:
+        """
+        Input: full hash of a key
+        Output: stripe of the key's bucket, whose lock is now held by the caller
+        """
+        while True:
+            capacity = self._capacity
+            stripe = hash % capacity % self._stripes
+            lock = self._locks[stripe]
+            lock.acquire()
+            # a resize holds every lock, so an unchanged capacity means the stripe is still right
+            if self._capacity == capacity:
+                return stripe
+            lock.release()
+
+    def _new_buckets(self, capacity: int):
+        """
+        Return a bucket array of capacity empty lists
+        """
+        return self._array_type([self._list_type() for _ in range(capacity)])
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. If key already in hashmap, associate value will be replaced.
+        If not in hashmap, key/value pair will be added. Grows the table once its stripe is over the load limit.
+        """
+        hash = self._hash_function(key)
+        stripe = self._lock_stripe(hash)
+        try:
+            capacity = self._capacity
+            list = self._buckets[hash % capacity]
+            node = list.contains(key, hash)
+            if node is not None:
+                node.value = value
+                return
+            if list.length() == 0:
+                self._empties[stripe] -= 1
+            list.insert(key, value, hash)
+            if list.length() > self._max_chains[stripe]:
+                self._max_chains[stripe] = list.length()
+            self._counts[stripe] += 1
+            self._version = next(self._versions)
+            # the other stripes' counts may be mid-update; an estimate is enough for the load check
+            grow = sum(self._counts) > capacity
+        finally:
+            self._locks[stripe].release()
+
+        if grow:
+            self._grow(capacity)
+
+    def _grow(self, seen_capacity: int) -> None:
+        """
+        Input: capacity the caller saw when it found the table over the load limit
+        Output: None
+        Method doubles the table, unless another thread has already resized it
+        """
+        with self._all_stripes():
+            if self._capacity == seen_capacity:
+                self._resize_locked(seen_capacity * 2)
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        hash = self._hash_function(key)
+        stripe = self._lock_stripe(hash)
+        try:
+            node = self._buckets[hash % self._capacity].contains(key, hash)
+            return None if node is None else node.value
+        finally:
+            self._locks[stripe].release()
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        hash = self._hash_function(key)
+        stripe = self._lock_stripe(hash)
+        try:
+            return self._buckets[hash % self._capacity].contains(key, hash) is not None
+        finally:
+            self._locks[stripe].release()
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        hash = self._hash_function(key)
+        stripe = self._lock_stripe(hash)
+        try:
+            list = self._buckets[hash % self._capacity]
+            if list.remove(key, hash):
+                if list.length() == 0:
+                    self._empties[stripe] += 1
+                self._counts[stripe] -= 1
+                self._version = next(self._versions)
+        finally:
+            self._locks[stripe].release()
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method grows the table once for all of the new keys, then puts every pair in order
+        """
+        pairs = to_list(pairs)
+        with self._all_stripes():
+            needed = sum(self._counts) + len(pairs)
+            if needed - 1 >= self._capacity:
+                self._resize_locked(needed)
+        for key, value in pairs:
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        for key in to_list(keys):
+            return_da.append(self.get(key))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    # ------------------------------------------------------------------ #
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method changes capacity of hash table while holding every stripe lock.
+        All existing key/value pairs will remain in the new map.
+        """
+        with self._all_stripes():
+            self._resize_locked(new_capacity)
+
+    def _resize_locked(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method does resize_table() for a caller that holds every stripe lock
+        """
+        if new_capacity < 1:
+            return
+
+        size = sum(self._counts)
+        new_capacity = self._round_capacity(new_capacity)
+        while size and size - 1 >= new_capacity:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        old_buckets = self._buckets
+        buckets = self._new_buckets(new_capacity)
+
+        # bucket indexes change, and with them the stripe each entry is counted in
+        counts = [0] * self._stripes
+        for idx in range(old_buckets.length()):
+            for node in old_buckets[idx]:
+                new_idx = node.hash % new_capacity
+                buckets[new_idx].insert(node.key, node.value, node.hash)
+                counts[new_idx % self._stripes] += 1
+
+        self._buckets = buckets
+        self._counts = counts
+        self._empties = [0] * self._stripes
+        self._max_chains = [0] * self._stripes
+        for idx in range(new_capacity):
+            stripe, length = idx % self._stripes, buckets[idx].length()
+            if length == 0:
+                self._empties[stripe] += 1
+            elif length > self._max_chains[stripe]:
+                self._max_chains[stripe] = length
+        self._version = next(self._versions)
+        # capacity last: threads waiting on a stripe lock compare it to decide whether to retry
+        self._capacity = new_capacity
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap. Does not change underlying hash table capacity.
+        """
+        with self._all_stripes():
+            self._buckets = self._new_buckets(self._capacity)
+            self._counts = [0] * self._stripes
+            self._reset_stripe_stats()
+            self._version = next(self._versions)
+
+    # ------------------------------------------------------------------ #
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._counts)
+
+    def table_load(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the current hashtable load factor as a float.
+        """
+        return sum(self._counts) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Input: None
+        Output: Int of empty buckets
+        Method sums the per-stripe empty bucket counts (O(stripes))
+        """
+        return sum(self._empties)
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, summed from the per-stripe counters while holding
+        every stripe lock, so they are consistent with each other (O(stripes))
+        """
+        with self._all_stripes():
+            return {
+                'capacity': self._capacity,
+                'live_entries': sum(self._counts),
+                'tombstones': 0,
+                'empty_buckets': sum(self._empties),
+                'table_load': sum(self._counts) / self._capacity,
+                'max_chain_length': max(self._max_chains),
+                'stripes': self._stripes,
+                'stripe_entries': list(self._counts),
+            }
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA of (key, value) tuples, a consistent snapshot taken under every stripe lock
+        """
+        with self._all_stripes():
+            return super().get_keys_and_values()
+
+    def _live_entries(self):
+        """
+        Generator of the nodes of a consistent snapshot of the table, taken under every stripe lock
+        when iteration starts. The locks are not held while the generator is suspended, so the loop
+        body may use the map; a structural change made meanwhile (by any thread) raises RuntimeError
+        at the next step, as for HashMap.
+        """
+        with self._all_stripes():
+            buckets, version = self._buckets, self._version
+            nodes = [node for idx in range(buckets.length()) for node in buckets[idx]]
+        for node in nodes:
+            yield node
+            if self._version != version:
+                raise RuntimeError('map changed during iteration')
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = StripedHashMap(11, hash_function_2, stripes=4)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+
+    print("\n8 threads")
+    print("---------")
+    m = StripedHashMap(11, hash_function_2)
+
+    def worker(thread: int) -> None:
+        for i in range(2000):
+            m.put('t' + str(thread) + '-' + str(i), i)
+        for i in range(0, 2000, 2):
+            m.remove('t' + str(thread) + '-' + str(i))
+
+    threads = [threading.Thread(target=worker, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), m.get('t3-1999'), m.get('t3-1998'), m.stats()['stripe_entries'])
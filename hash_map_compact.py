@@ -0,0 +1,477 @@
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, ItemsView, KeysView, ValuesView,
+                        get_hash_function, hash_many, to_list,
+                        hash_function_1, hash_function_2)
+
+# slot states stored in the control bytearray
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, tombstone_threshold: float = 0.25) -> None:
+        """
+        Initialize new compact HashMap that uses
+        quadratic probing for collision resolution.
+
+        Instead of one HashEntry object per slot, the table is kept in
+        parallel flat arrays indexed by slot: full hashes in an array('q'),
+        slot states in a bytearray, and keys and values in plain lists.
+        remove() compacts the table once tombstones exceed
+        tombstone_threshold * capacity (None turns that off)
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._hashes = array('q', bytes(8 * self._capacity))
+        self._states = bytearray(self._capacity)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+        # bumped by every insert, remove, rebuild and clear; iterators check it after each entry
+        self._version = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                slot = None
+            else:
+                slot = HashEntry(self._keys[i], self._values[i], self._hashes[i])
+                slot.is_tombstone = self._states[i] == TOMBSTONE
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstone slots in map
+        """
+        return self._tombstones
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Input: key and its full hash
+        Output: slot index of the live entry for key, or -1 if key is not in the map
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        capacity = self._capacity
+        attempt_idx = hash % capacity
+        j = 0
+        # an EMPTY slot ends the probe sequence; tombstones are stepped over
+        while states[attempt_idx] != EMPTY:
+            if states[attempt_idx] == LIVE and hashes[attempt_idx] == hash and keys[attempt_idx] == key:
+                return attempt_idx
+            j += 1
+            attempt_idx = (hash + j * j) % capacity
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. If key already in hashmap, associate value will be replaced.
+        If not in hashmap, key/value pair will be added.
+        """
+        # check to see if we need to resize table
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+        # enough tombstones that probe sequences could run out of empty slots: clean them out
+        elif self.occupancy() >= 0.5:
+            self.compact()
+
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the full hash of key
+        Output: None
+        Method does the insert/update part of put() for an already hashed key. No load check.
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        capacity = self._capacity
+        attempt_idx = hash % capacity
+        free_idx = -1
+        j = 0
+
+        # walk the whole probe sequence so an existing key further down is updated, not duplicated,
+        # while remembering the first tombstone we pass so the new entry can reuse it
+        while states[attempt_idx] != EMPTY:
+            if states[attempt_idx] == LIVE:
+                if hashes[attempt_idx] == hash and keys[attempt_idx] == key:
+                    self._values[attempt_idx] = value
+                    return
+            elif free_idx == -1:
+                free_idx = attempt_idx
+            j += 1
+            attempt_idx = (hash + j * j) % capacity
+
+        if free_idx == -1:
+            free_idx = attempt_idx
+        else:
+            self._tombstones -= 1
+
+        states[free_idx] = LIVE
+        hashes[free_idx] = hash
+        keys[free_idx] = key
+        self._values[free_idx] = value
+        self._size += 1
+        self._version += 1
+
+    def table_load(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the current hashtable load factor as a float.
+        """
+        return self._size / self._capacity
+
+    def occupancy(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the fraction of slots that are not empty (live entries plus tombstones).
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Input: None
+        Output: Int of empty buckets
+        Method checks for empty buckets in hashmap (including tombstone values)
+        """
+        # every slot that does not hold a live entry is either EMPTY or a tombstone
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, all kept up to date by the map itself (O(1))
+        """
+        return {
+            'capacity': self._capacity,
+            'live_entries': self._size,
+            'tombstones': self._tombstones,
+            # same definition as empty_buckets(): tombstones count as empty
+            'empty_buckets': self._capacity - self._size,
+            'table_load': self.table_load(),
+            'occupancy': self.occupancy(),
+        }
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method resizes hashtable to new_capacity if new capacity isn't prime, new capacity modified to be prime
+        """
+        if new_capacity < self._size:
+            return
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # grow the target until every live entry fits under the load limit, as re-putting would
+        while self._size and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        self._rebuild(new_capacity)
+
+    def compact(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method rebuilds the table at its current capacity, dropping every tombstone
+        """
+        self._rebuild(self._capacity)
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Input: capacity of the rebuilt table (already prime and big enough)
+        Output: None
+        Method moves the live entries into fresh arrays of new_capacity slots
+        """
+        old_states, old_hashes = self._states, self._hashes
+        old_keys, old_values = self._keys, self._values
+
+        self._capacity = new_capacity
+        self._hashes = hashes = array('q', bytes(8 * new_capacity))
+        self._states = states = bytearray(new_capacity)
+        self._keys = keys = [None] * new_capacity
+        self._values = values = [None] * new_capacity
+        self._tombstones = 0
+        self._version += 1
+
+        # place live entries straight from their stored hashes; the new table has no tombstones
+        for idx in range(len(old_states)):
+            if old_states[idx] != LIVE:
+                continue
+            hash = old_hashes[idx]
+            attempt_idx = hash % new_capacity
+            j = 0
+            while states[attempt_idx] != EMPTY:
+                j += 1
+                attempt_idx = (hash + j * j) % new_capacity
+            states[attempt_idx] = LIVE
+            hashes[attempt_idx] = hash
+            keys[attempt_idx] = old_keys[idx]
+            values[attempt_idx] = old_values[idx]
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        if self._size == 0:
+            return None
+
+        idx = self._find(key, self._hash_function(key))
+        if idx == -1:
+            return None
+        return self._values[idx]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        if self._size == 0:
+            return False
+
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        if self._size == 0:
+            return
+
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash: int) -> None:
+        """
+        Input: key and the full hash of key
+        Output: None
+        """
+        idx = self._find(key, hash)
+        if idx == -1:
+            return
+
+        # the slot becomes a tombstone; drop the references so key/value can be collected
+        self._states[idx] = TOMBSTONE
+        self._keys[idx] = None
+        self._values[idx] = None
+        self._size -= 1
+        self._tombstones += 1
+        self._version += 1
+
+        if self._tombstone_threshold is not None and self._tombstones > self._tombstone_threshold * self._capacity:
+            self.compact()
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap. Does not change underlying hash table capacity.
+        """
+        self._hashes = array('q', bytes(8 * self._capacity))
+        self._states = bytearray(self._capacity)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the map, in order. The table is resized (or compacted) at most
+        once, up front, so the load stays under 0.5 for all of the new keys, and each key is hashed once.
+        """
+        pairs = to_list(pairs)
+
+        # worst case every key is new; size the table so no put would trip the load check
+        needed = self._size + len(pairs)
+        if needed and (needed - 1) / self._capacity >= 0.5:
+            self.resize_table(2 * (needed - 1) + 1)
+        # or the occupancy check, when tombstones are what fills the table
+        elif needed and (needed + self._tombstones - 1) / self._capacity >= 0.5:
+            self.compact()
+
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._put_hashed(pairs[idx][0], pairs[idx][1], hashes[idx])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        values = self._values
+        for idx in range(len(keys)):
+            slot = self._find(keys[idx], hashes[idx]) if self._size else -1
+            return_da.append(None if slot == -1 else values[slot])
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            self._remove_hashed(keys[idx], hashes[idx])
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        return_da = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+        for idx in range(self._capacity):
+            if states[idx] == LIVE:
+                return_da.append((keys[idx], values[idx]))
+        return return_da
+
+    def _live_entries(self):
+        """
+        Generator of a HashEntry view of each live slot, so callers can use item.key / item.value
+        like the object-per-slot map. Raises RuntimeError if the map is structurally changed while
+        the generator is suspended.
+        """
+        states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+        version = self._version
+        for idx in range(len(states)):
+            if states[idx] == LIVE:
+                yield HashEntry(keys[idx], values[idx], hashes[idx])
+                if self._version != version:
+                    raise RuntimeError('map changed during iteration')
+
+    def __iter__(self):
+        """
+        Return a new iterator over the live entries (see _live_entries)
+        """
+        return self._live_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys (nothing is copied)
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values (nothing is copied)
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs (nothing is copied)
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+
+    print("\nresize / get_keys_and_values")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
+
+    print("\niteration")
+    print("---------")
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+
+    print("\nput_many / get_many / remove_many / views")
+    print("-----------------------------------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many(('key' + str(i), i) for i in range(20))
+    m.remove_many('key' + str(i) for i in range(0, 20, 2))
+    print(m.get_many(['key1', 'key2', 'key19']), m.stats())
+    print(sorted(m.keys())[:3], sum(m.values()), len(m.items()))
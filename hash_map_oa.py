@@ -1,24 +1,61 @@
-
-from a6_include import (DynamicArray, HashEntry,
+import hash_map_compact
+import hash_map_robin_hood
+import hash_map_swiss
+from a6_include import (DynamicArray, HashEntry, SIZINGS,
+                        SlottedDynamicArray, SlottedHashEntry,
+                        ItemsView, KeysView, ValuesView,
+                        get_hash_function, hash_many, mixed, power_of_two, table_prime, to_list,
                         hash_function_1, hash_function_2)
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # instrumentation.Instrumentation.attach() sets this on an instance to a callable
+    # (op, probes, comparisons, tombstones); every probe sequence then reports to it
+    _probe_hook = None
+
+    def __init__(self, capacity: int, function, slotted: bool = False,
+                 tombstone_threshold: float = 0.25, sizing: str = 'prime') -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        function is a hash function or the name of one registered in
+        a6_include.HASH_FUNCTIONS (e.g. 'fnv1a', 'murmur3')
+        slotted=True stores entries in the __slots__ variants of
+        HashEntry/DynamicArray, which have no per-instance __dict__
+        remove() compacts the table once tombstones exceed
+        tombstone_threshold * capacity (None turns that off)
+        sizing picks the capacities: 'prime' (next prime, found by trial division),
+        'table' (next prime from a6_include.PRIME_CAPACITIES, no search) or 'pow2'
+        (powers of two; hashes go through mix_hash and probing is triangular,
+        j * (j + 1) / 2, which reaches every slot of a power-of-two table)
         """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        if sizing not in SIZINGS:
+            raise ValueError(f"unknown sizing {sizing!r}, expected one of {', '.join(SIZINGS)}")
+        self._sizing = sizing
+        # distance to the next probe slot grows by this much per step: 2 gives offsets
+        # j * j (quadratic), 1 gives j * (j + 1) / 2 (triangular)
+        self._probe_stride = 1 if sizing == 'pow2' else 2
+
+        self._array_type = SlottedDynamicArray if slotted else DynamicArray
+        self._entry_type = SlottedHashEntry if slotted else HashEntry
+        self._buckets = self._array_type()
+
+        # capacity must be a prime number (or a power of two in pow2 mode)
+        self._capacity = self._round_capacity(capacity)
         for _ in range(self._capacity):
             self._buckets.append(None)
 
-        self._hash_function = function
+        self._hash_function = get_hash_function(function)
+        if sizing == 'pow2':
+            self._hash_function = mixed(self._hash_function)
         self._size = 0
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+
+        # longest probe sequence (slots examined) of any insert since the last resize
+        self._max_probe = 0
+        # bumped by every insert, remove, rebuild and clear; iterators check it after each entry
+        self._version = 0
 
     def __str__(self) -> str:
         """
@@ -60,6 +97,16 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Return the capacity the table uses for a requested capacity, according to its sizing
+        """
+        if self._sizing == 'table':
+            return table_prime(capacity)
+        if self._sizing == 'pow2':
+            return power_of_two(capacity)
+        return capacity if self._is_prime(capacity) else self._next_prime(capacity)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -72,6 +119,12 @@ class HashMap:
         """
         return self._capacity
 
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstone slots in map
+        """
+        return self._tombstones
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
@@ -85,41 +138,62 @@ class HashMap:
         # check to see if we need to resize table
         if self.table_load() >= 0.5:
             self.resize_table(self._capacity * 2)
+        # enough tombstones that probe sequences could run out of empty slots: clean them out
+        elif self.occupancy() >= 0.5:
+            self.compact()
 
-        # create the HashEntry object with key/value given:
-        hash_entry = HashEntry(key, value)
-
-        attempt_idx = self._hash_function(key) % self._buckets.length()
-
-        # if the first attempt index is available to be modified, then place the value there:
-        if self._buckets[attempt_idx] is None or self._buckets[attempt_idx].is_tombstone is True:
-            self._buckets[attempt_idx] = hash_entry
-            self._size += 1
-            return
-
-        # if we just need to update key:
-        if self._buckets[attempt_idx].key == key:
-            self._buckets[attempt_idx] = hash_entry
-            return
+        # hash the key once; the full hash is cached on the entry for later rehashing
+        self._put_hashed(key, value, self._hash_function(key))
 
-        j = 1
-        # if the fist attempts are not removals or empty's we will probe further
-        while self._buckets[attempt_idx]:
-            attempt_idx = (self._hash_function(key) + j ** 2) % self._buckets.length()
-            # If the value is empty or it's a Tombstone flagged we can place the valie there
-            if self._buckets[attempt_idx] is None or self._buckets[attempt_idx].is_tombstone is True:
-                self._buckets[attempt_idx] = hash_entry
-                self._size += 1
-                return
-            # if they key exists, is not tombstone, we need to update it:
-            if self._buckets[attempt_idx].key == key:
-                self._buckets[attempt_idx] = hash_entry
-                return
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the full hash of key
+        Output: None
+        Method does the insert/update part of put() for an already hashed key. No load check.
+        """
+        capacity, stride = self._capacity, self._probe_stride
+        attempt_idx = hash % capacity
+        tombstone_idx = tombstone_j = -1
+        j, step = 0, 1
+        # only counted for the probe hook; both are bumped on rare branches only
+        comparisons = tombstones = 0
+
+        # walk the probe sequence up to an empty slot, so a key further down is updated rather than
+        # duplicated, remembering the first tombstone we pass:
+        entry = self._buckets[attempt_idx]
+        while entry is not None:
+            if entry.is_tombstone is True:
+                tombstones += 1
+                if tombstone_idx == -1:
+                    tombstone_idx, tombstone_j = attempt_idx, j
+            # if they key exists, is not tombstone, we need to update it (hashes compared first):
+            elif entry.hash == hash:
+                comparisons += 1
+                if entry.key == key:
+                    break
             # move onto next item in buckets if we didn't do anything
             j += 1
+            attempt_idx = (attempt_idx + step) % capacity
+            step += stride
+            entry = self._buckets[attempt_idx]
+
+        if self._probe_hook is not None:
+            self._probe_hook('insert', j + 1, comparisons, tombstones)
+        if entry is not None:
+            entry.value = value
+            return
+
+        # new key: reuse the first tombstone we passed, otherwise take the empty slot
+        if tombstone_idx != -1:
+            attempt_idx, j = tombstone_idx, tombstone_j
+            self._tombstones -= 1
 
-        # if nothing happens or is added we will return None:
-        return None
+        # create the HashEntry object with key/value given:
+        self._buckets[attempt_idx] = self._entry_type(key, value, hash)
+        self._size += 1
+        self._version += 1
+        if j >= self._max_probe:
+            self._max_probe = j + 1
 
     def table_load(self) -> float:
         """
@@ -134,21 +208,39 @@ class HashMap:
         # return float value:
         return load_factor
 
+    def occupancy(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the fraction of slots that are not empty (live entries plus tombstones).
+        This is what probe lengths of get/contains_key depend on, unlike table_load().
+        """
+        return (self._size + self._tombstones) / self._capacity
+
     def empty_buckets(self) -> int:
         """
         Input: None
         Output: Int of empty buckets
         Method checks for empty buckets in hashmap (including tombstone values)
         """
+        # every slot that does not hold a live entry is either None or a tombstone
+        return self._capacity - self._size
 
-        return_val = 0
-        # iterate through bucket to count empty or tombstone values:
-        for entry in range(self._buckets.length()):
-            # check if the idx is None or if there is a value in there, tombstone is True:
-            if self._buckets[entry] is None or self._buckets[entry].is_tombstone is True:
-                return_val += 1
-
-        return return_val
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, all kept up to date by the map itself (O(1))
+        """
+        return {
+            'capacity': self._capacity,
+            'live_entries': self._size,
+            'tombstones': self._tombstones,
+            # same definition as empty_buckets(): tombstones count as empty
+            'empty_buckets': self._capacity - self._size,
+            'table_load': self.table_load(),
+            'occupancy': self.occupancy(),
+            'max_probe_length': self._max_probe,
+        }
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -161,10 +253,31 @@ class HashMap:
         if new_capacity < self._size:
             return
 
-        # if the new_cap is not already prime, we will make it prime with _next_prime():
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # if the new_cap is not already prime (or a power of two), we will round it up:
+        new_capacity = self._round_capacity(new_capacity)
+
+        # re-putting every entry would double the table again whenever the load check in put()
+        # trips, so grow the target up front until every entry fits under the load limit:
+        while self._size and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        self._rebuild(new_capacity, 'resize')
 
+    def compact(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method rebuilds the table at its current capacity, dropping every tombstone
+        """
+        self._rebuild(self._capacity, 'compact')
+
+    def _rebuild(self, new_capacity: int, kind: str) -> None:
+        """
+        Input: capacity of the rebuilt table (already prime and big enough), and why the table is
+        rebuilt ('resize' or 'compact', for instrumentation)
+        Output: None
+        Method moves the live entries into a fresh bucket array of new_capacity slots
+        """
         # set new capacity number
         self._capacity = new_capacity
 
@@ -172,21 +285,43 @@ class HashMap:
         copy_da = self._buckets
 
         # initialize a new empty DA to be the new buckets
-        cleared_buckets = DynamicArray()
+        cleared_buckets = self._array_type()
 
         # grow the empty the DA to the size of the existing using empty spaces:
         for idx in range(self._capacity):
             cleared_buckets.append(None)
 
-        # replace the current buckets with the new DA and set size to reflect empty:
+        # replace the current buckets with the new DA (size is unchanged, every live entry moves):
         self._buckets = cleared_buckets
-        self._size = 0
+        self._tombstones = 0
+        self._max_probe = 0
+        self._version += 1
 
-        # populate the new buckets with the data from copy, less Tombstone flagged items
+        # move the live entries into the new buckets using their cached hashes, less Tombstone
+        # flagged items. Keys are unique already, so no duplicate check or hash call is needed.
         for idx in range(copy_da.length()):
-            if copy_da[idx] is not None:
-                if copy_da[idx].is_tombstone is False:
-                    self.put(copy_da[idx].key, copy_da[idx].value)
+            entry = copy_da[idx]
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry)
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Input: HashEntry with its hash already cached
+        Output: None
+        Method puts entry in the first empty slot of its probe sequence. Only valid for a key that is
+        known not to be in the table (used when moving entries between tables). Size is not changed.
+        """
+        capacity, stride = self._capacity, self._probe_stride
+        attempt_idx = entry.hash % capacity
+        j, step = 0, 1
+        while self._buckets[attempt_idx] is not None:
+            j += 1
+            attempt_idx = (attempt_idx + step) % capacity
+            step += stride
+
+        self._buckets[attempt_idx] = entry
+        if j >= self._max_probe:
+            self._max_probe = j + 1
 
     def get(self, key: str) -> object:
         """
@@ -197,24 +332,46 @@ class HashMap:
         # if the size is zero we don't have anything to return:
         if self._size == 0:
             return None
-        # if we check the first possible index it could be in, and it's empty, return None
-        if not self._buckets[self._hash_function(key) % self._buckets.length()]:
-            return None
 
-        attempt_idx = self._hash_function(key) % self._buckets.length()
+        return self._get_hashed(key, self._hash_function(key))
 
-        if self._buckets[attempt_idx].key == key and self._buckets[attempt_idx].is_tombstone is True:
-            return None
+    def _get_hashed(self, key: str, hash: int) -> object:
+        """
+        Input: key and the full hash of key
+        Output: Value of key, or None if key not in hash map
+        """
+        entry = self._find_entry(self._buckets, key, hash)
+        return None if entry is None else entry.value
 
-        j = 1
-        # now we must probe to go further:
-        while self._buckets[attempt_idx] is not None:
-            # if we find a key that matches that is not a tombstone, return the value of that entry
-            if self._buckets[attempt_idx].key == key and self._buckets[attempt_idx].is_tombstone is False:
-                return self._buckets[attempt_idx].value
-            # move onto next searchable index
-            attempt_idx = (self._hash_function(key) + j ** 2) % self._buckets.length()
-            j += 1
+    def _find_entry(self, buckets: DynamicArray, key: str, hash: int) -> HashEntry:
+        """
+        Input: bucket array to probe, key and its full hash
+        Output: live HashEntry for key in buckets, or None
+        """
+        capacity, stride = buckets.length(), self._probe_stride
+        attempt_idx = hash % capacity
+        entry = buckets[attempt_idx]
+        step = 1
+        # only counted for the probe hook; both are bumped on rare branches only
+        comparisons = tombstones = 0
+        # an empty slot ends the probe sequence; tombstones are stepped over
+        while entry is not None:
+            if entry.is_tombstone is True:
+                tombstones += 1
+            # if we find a key that matches that is not a tombstone, that's our entry (hashes compared first)
+            elif entry.hash == hash:
+                comparisons += 1
+                if entry.key == key:
+                    break
+            # otherwise, we need to Quadratic probe further using the formula given in the explorations
+            attempt_idx = (attempt_idx + step) % capacity
+            step += stride
+            entry = buckets[attempt_idx]
+
+        if self._probe_hook is not None:
+            # step grew by stride per slot moved past, so this is the number of slots examined
+            self._probe_hook('lookup', (step - 1) // stride + 1, comparisons, tombstones)
+        return entry
 
     def contains_key(self, key: str) -> bool:
         """
@@ -226,22 +383,7 @@ class HashMap:
         if self._size == 0:
             return False
 
-        j = 1
-        attempt_idx = self._hash_function(key) % self._buckets.length()
-        # check to see if the value exists at the expected hash:
-        if self._buckets[attempt_idx] is not None:
-            # While there is some value in the bucket
-            while self._buckets[attempt_idx] is not None:
-                # if the value exists and tombstone flag is false, we found the Key
-                if self._buckets[attempt_idx].key == key and self._buckets[attempt_idx].is_tombstone is False:
-                    return True
-                # otherwise, we need to Quadratic probe further using the formula given in the explorations
-                else:
-                    attempt_idx = (self._hash_function(key) + j ** 2) % self._buckets.length()
-                    j += 1
-
-        # if nothing matching is found return False:
-        return False
+        return self._find_entry(self._buckets, key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -249,18 +391,79 @@ class HashMap:
         Output: None
         Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
         """
-        # index to start with given key:
-        attempt_idx = self._hash_function(key) % self._buckets.length()
-        j = 1
+        self._remove_hashed(key, self._hash_function(key))
 
-        while self._buckets[attempt_idx] is not None:
-            if self._buckets[attempt_idx].key == key and self._buckets[attempt_idx].is_tombstone is False:
-                self._buckets[attempt_idx].is_tombstone = True
-                self._size -= 1
-                return
+    def _remove_hashed(self, key: str, hash: int) -> None:
+        """
+        Input: key and the full hash of key
+        Output: None
+        Method does the work of remove() for an already hashed key
+        """
+        entry = self._find_entry(self._buckets, key, hash)
+        if entry is not None:
+            self._remove_entry(entry)
 
-            attempt_idx = (self._hash_function(key) + j ** 2) % self._buckets.length()
-            j += 1
+    def _remove_entry(self, entry: HashEntry) -> None:
+        """
+        Input: live HashEntry in the current bucket array
+        Output: None
+        Method turns entry into a tombstone, compacting the table once there are too many of them
+        """
+        entry.is_tombstone = True
+        self._size -= 1
+        self._tombstones += 1
+        self._version += 1
+
+        if self._tombstone_threshold is not None and self._tombstones > self._tombstone_threshold * self._capacity:
+            self.compact()
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the map, in order. The table is resized at most once, up front, to
+        a prime capacity that keeps the load under 0.5 for all of the new keys, and each key is hashed once.
+        """
+        pairs = to_list(pairs)
+
+        # worst case every key is new; size the table so no put would trip the load check
+        needed = self._size + len(pairs)
+        if needed and (needed - 1) / self._capacity >= 0.5:
+            self.resize_table(2 * (needed - 1) + 1)
+        # or the occupancy check, when tombstones are what fills the table
+        elif needed and (needed + self._tombstones - 1) / self._capacity >= 0.5:
+            self.compact()
+
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._put_hashed(pairs[idx][0], pairs[idx][1], hashes[idx])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            if self._size == 0:
+                return_da.append(None)
+            else:
+                return_da.append(self._get_hashed(keys[idx], hashes[idx]))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            self._remove_hashed(keys[idx], hashes[idx])
 
     def clear(self) -> None:
         """
@@ -270,7 +473,7 @@ class HashMap:
         """
 
         # initialize a new empty DA to be the new buckets
-        cleared_buckets = DynamicArray()
+        cleared_buckets = self._array_type()
 
         # grow the empty the DA to the size of the existing using empty spaces:
         for idx in range(self._capacity):
@@ -279,6 +482,9 @@ class HashMap:
         # replace the current buckets with the new DA and set size to reflect empty:
         self._buckets = cleared_buckets
         self._size = 0
+        self._tombstones = 0
+        self._max_probe = 0
+        self._version += 1
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -295,30 +501,335 @@ class HashMap:
                 return_da.append((self._buckets[idx].key, self._buckets[idx].value))
         return return_da
 
+    def _live_entries(self):
+        """
+        Generator of the live HashEntry objects, in slot order. Each call has its own position,
+        so iterations can be nested or interleaved. Raises RuntimeError if the map is structurally
+        changed (key added or removed, table rebuilt or cleared) while the generator is suspended.
+        """
+        buckets, version = self._buckets, self._version
+        for idx in range(buckets.length()):
+            entry = buckets[idx]
+            # skip empty slots and tombstones:
+            if entry is not None and entry.is_tombstone is False:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError('map changed during iteration')
+
     def __iter__(self):
         """
-        Create iterator for the next function to keep track of index we are on
+        Return a new iterator over the live HashEntry objects (see _live_entries)
+        """
+        return self._live_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys (nothing is copied)
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values (nothing is copied)
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs (nothing is copied)
+        """
+        return ItemsView(self)
+
+
+# marks an old-table slot whose entry has been migrated; it is a tombstone so
+# probe sequences through the old table keep going past it
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
+
+
+class IncrementalHashMap(HashMap):
+    """
+    HashMap that grows incrementally instead of in one synchronous resize.
+
+    When put() crosses the load limit a new, larger bucket array is allocated
+    and the old one is kept beside it. Every put/get/contains_key/remove then
+    migrates up to migration_budget old slots into the new array, and lookups
+    consult both arrays until the migration finishes, so no single operation
+    pays for rehashing the whole table.
+    """
+
+    def __init__(self, capacity: int, function, slotted: bool = False,
+                 tombstone_threshold: float = 0.25, migration_budget: int = 8,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new incrementally resized HashMap.
+        migration_budget is the number of old slots moved per operation.
+        """
+        super().__init__(capacity, function, slotted, tombstone_threshold, sizing)
+        self.migration_budget = migration_budget
+        self._old_buckets = None
+        self._migrate_idx = 0
+
+    def is_migrating(self) -> bool:
+        """
+        Return True while entries are still being moved out of the old bucket array
+        """
+        return self._old_buckets is not None
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Input: requested capacity of the new bucket array
+        Output: None
+        Method allocates the new bucket array and keeps the current one as the migration source
+        """
+        # a migration still in progress has to finish before another one starts
+        self._finish_migration()
+
+        new_capacity = self._round_capacity(new_capacity)
+
+        # one C-level list allocation; no per-slot Python work happens up front
+        new_buckets = self._array_type([None] * new_capacity)
+
+        self._old_buckets = self._buckets
+        self._migrate_idx = 0
+        self._buckets = new_buckets
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._max_probe = 0
+        self._version += 1
+
+    def _migrate(self, count: int) -> None:
+        """
+        Input: number of old slots to migrate
+        Output: None
+        Method moves the live entries of the next count old slots into the new bucket array
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return
+
+        idx = self._migrate_idx
+        end = min(idx + count, old_buckets.length())
+        while idx < end:
+            entry = old_buckets[idx]
+            if entry is not None:
+                if entry.is_tombstone is False:
+                    self._place(entry)
+                # leave a tombstone behind so probe sequences through the old array stay intact
+                old_buckets[idx] = _MIGRATED
+            idx += 1
+
+        self._migrate_idx = idx
+        if idx >= old_buckets.length():
+            self._old_buckets = None
+            self._migrate_idx = 0
+
+    def _finish_migration(self) -> None:
+        """
+        Migrate everything left in the old bucket array
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length() - self._migrate_idx)
+
+    def _lookup(self, key: str, hash: int) -> HashEntry:
+        """
+        Input: key and its full hash
+        Output: live HashEntry for key in either bucket array, or None
+        """
+        entry = self._find_entry(self._buckets, key, hash)
+        if entry is None and self._old_buckets is not None:
+            entry = self._find_entry(self._old_buckets, key, hash)
+        return entry
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. Crossing the load limit starts an incremental
+        migration into a table of twice the capacity instead of resizing in place.
+        """
+        self._migrate(self.migration_budget)
+        if self.table_load() >= 0.5:
+            self._start_migration(self._capacity * 2)
+        elif self.occupancy() >= 0.5:
+            self.compact()
+
+        hash = self._hash_function(key)
+
+        # a key that has not been migrated yet is updated where it is
+        if self._old_buckets is not None:
+            entry = self._find_entry(self._old_buckets, key, hash)
+            if entry is not None:
+                entry.value = value
+                return
+
+        self._put_hashed(key, value, hash)
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
         """
-        # current index we are itterating through:
-        self._index = 0
+        self._migrate(self.migration_budget)
+        if self._size == 0:
+            return None
 
-        return self
+        entry = self._lookup(key, self._hash_function(key))
+        return None if entry is None else entry.value
 
-    def __next__(self):
+    def contains_key(self, key: str) -> bool:
         """
-        Obtain next value and advance iterator
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
         """
-        # While we are not at the end of the DA
-        while self._index < self._buckets.length():
-            # grab our value and make increment index:
-            value = self._buckets[self._index]
-            self._index += 1
+        self._migrate(self.migration_budget)
+        if self._size == 0:
+            return False
+
+        return self._lookup(key, self._hash_function(key)) is not None
 
-            # if the value is something other than None and isn't a tombstone we will return that
-            if value and value.is_tombstone is False:
-                return value
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        self._migrate(self.migration_budget)
+        hash = self._hash_function(key)
 
-        raise StopIteration
+        entry = self._find_entry(self._buckets, key, hash)
+        if entry is not None:
+            self._remove_entry(entry)
+            return
+
+        # old-array tombstones are not counted; the whole array is dropped once migrated
+        if self._old_buckets is not None:
+            entry = self._find_entry(self._old_buckets, key, hash)
+            if entry is not None:
+                entry.is_tombstone = True
+                self._size -= 1
+                self._version += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method finishes any migration in progress, then resizes synchronously like HashMap.resize_table
+        """
+        self._finish_migration()
+        super().resize_table(new_capacity)
+
+    def compact(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method finishes any migration in progress, then drops every tombstone like HashMap.compact
+        """
+        self._finish_migration()
+        super().compact()
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method finishes any migration in progress, then bulk loads like HashMap.put_many
+        """
+        self._finish_migration()
+        super().put_many(pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        for key in to_list(keys):
+            return_da.append(self.get(key))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap, dropping any migration in progress.
+        """
+        self._old_buckets = None
+        self._migrate_idx = 0
+        super().clear()
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics like HashMap.stats, plus whether a migration is running.
+        Counts describe the new bucket array; entries still in the old array are included in
+        live_entries (and so excluded from empty_buckets).
+        """
+        stats = super().stats()
+        stats['migrating'] = self._old_buckets is not None
+        return stats
+
+    # whole-table operations are O(capacity) anyway, so they finish the migration first
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        self._finish_migration()
+        return super().__str__()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method finishes any migration in progress, then returns a DA of the key/value pairs
+        """
+        self._finish_migration()
+        return super().get_keys_and_values()
+
+    def _live_entries(self):
+        """
+        Finish any migration in progress (when iteration starts), then iterate like HashMap
+        """
+        self._finish_migration()
+        yield from super()._live_entries()
+
+
+# open addressing engines that new_hash_map() can build, by name
+ENGINES = {
+    'quadratic': HashMap,
+    'incremental': IncrementalHashMap,
+    'compact': hash_map_compact.HashMap,
+    'robin_hood': hash_map_robin_hood.HashMap,
+    'swiss': hash_map_swiss.HashMap,
+}
+
+
+def new_hash_map(capacity: int, function, engine: str = 'quadratic', **options):
+    """
+    Input: capacity, hash function, engine name (a key of ENGINES) and engine specific options
+    Output: new, empty open addressing map
+    Function builds the selected engine. Every engine supports put/get/contains_key/remove,
+    put_many/get_many/remove_many, resize_table/clear, get_size/get_capacity/table_load/
+    empty_buckets, stats, get_keys_and_values, iteration and the keys/values/items views.
+    The keys of the stats() dict, the constructor options and any extra methods (e.g.
+    compact() on 'compact') are engine specific. For example
+    new_hash_map(53, hash_function_2, 'robin_hood', max_load=0.9)
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {', '.join(ENGINES)}")
+    return ENGINES[engine](capacity, function, **options)
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -529,3 +1040,38 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nIncrementalHashMap example 1")
+    print("----------------------------")
+    m = IncrementalHashMap(11, hash_function_2, migration_budget=2)
+    for i in range(60):
+        m.put(str(i), i * 10)
+        if i % 10 == 9:
+            print(m.get_size(), m.get_capacity(), m.is_migrating(),
+                  all(m.get(str(k)) == k * 10 for k in range(i + 1)))
+
+    print("\nnew_hash_map example 1")
+    print("----------------------")
+    for engine in ENGINES:
+        m = new_hash_map(11, hash_function_2, engine)
+        for i in range(100):
+            m.put(str(i), i)
+        for i in range(0, 100, 2):
+            m.remove(str(i))
+        print(engine, m.get_size(), m.get_capacity(), m.get('51'), m.contains_key('50'))
+
+    print("\nkeys() / values() / items() example 1")
+    print("-------------------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(5):
+        m.put(str(i), i * 10)
+    print(m.keys(), m.values(), len(m.items()), '3' in m.keys())
+    # iterations are independent: nested loops over the same map
+    print([(a, b) for a in m.keys() for b in m.keys() if int(a) + int(b) == 4])
+    items = iter(m.items())
+    print(next(items))
+    m.put('5', 50)
+    try:
+        next(items)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
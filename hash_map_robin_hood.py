@@ -0,0 +1,428 @@
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, ItemsView, KeysView, ValuesView,
+                        get_hash_function, hash_many, to_list,
+                        hash_function_2)
+
+# probe distance stored for a slot that holds no entry
+EMPTY = -1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing
+        for collision resolution.
+
+        Every slot records its entry's probe distance (how far it sits from
+        the slot its hash points to). An insert takes the slot of any entry
+        closer to home than itself, so distances stay short and even, lookups
+        can stop as soon as they pass an entry closer to home than the key
+        would be, and removals shift the following entries back instead of
+        leaving tombstones. That allows a much higher max_load than the 0.5
+        used by the quadratic probing map.
+        """
+        self._max_load = max_load
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+        # bumped by every insert, remove, resize and clear; iterators check it after each entry
+        self._version = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replace the slot arrays with empty ones of the given capacity
+        """
+        self._hashes = array('q', bytes(8 * capacity))
+        self._dists = array('i', [EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        # longest probe sequence (slots examined) of any insert since the last resize
+        self._max_probe = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._dists[i] == EMPTY:
+                slot = None
+            else:
+                slot = HashEntry(self._keys[i], self._values[i], self._hashes[i])
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Input: key and its full hash
+        Output: slot index of the entry for key, or -1 if key is not in the map
+        """
+        dists, hashes, keys = self._dists, self._hashes, self._keys
+        capacity = self._capacity
+        idx = hash % capacity
+        dist = 0
+        # once we reach an entry closer to its home than the key would be to its own,
+        # the key cannot be further along (an insert would have taken that slot)
+        while dists[idx] >= dist:
+            if hashes[idx] == hash and keys[idx] == key:
+                return idx
+            dist += 1
+            idx += 1
+            if idx == capacity:
+                idx = 0
+        return -1
+
+    def _insert(self, key: str, value: object, hash: int, check: bool) -> None:
+        """
+        Input: key, value, full hash of key, and whether the key may already be in the map
+        Output: None
+        Method inserts or updates key without a load check
+        """
+        dists, hashes, keys, values = self._dists, self._hashes, self._keys, self._values
+        capacity = self._capacity
+        idx = hash % capacity
+        dist = 0
+
+        while True:
+            slot_dist = dists[idx]
+            if slot_dist == EMPTY:
+                dists[idx], hashes[idx], keys[idx], values[idx] = dist, hash, key, value
+                self._size += 1
+                self._version += 1
+                if dist >= self._max_probe:
+                    self._max_probe = dist + 1
+                return
+
+            if check and slot_dist == dist and hashes[idx] == hash and keys[idx] == key:
+                values[idx] = value
+                return
+
+            # the resident is closer to home than we are: take its slot and carry it on instead.
+            # The carried entry is already in the map, so no more key checks are needed.
+            if slot_dist < dist:
+                if dist >= self._max_probe:
+                    self._max_probe = dist + 1
+                dists[idx], dist = dist, slot_dist
+                hashes[idx], hash = hash, hashes[idx]
+                keys[idx], key = key, keys[idx]
+                values[idx], value = value, values[idx]
+                check = False
+
+            dist += 1
+            idx += 1
+            if idx == capacity:
+                idx = 0
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. If key already in hashmap, associate value will be replaced.
+        If not in hashmap, key/value pair will be added.
+        """
+        # check to see if we need to resize table
+        if self.table_load() >= self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        self._insert(key, value, self._hash_function(key), True)
+
+    def table_load(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the current hashtable load factor as a float.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Input: None
+        Output: Int of empty buckets
+        Method returns the number of slots without an entry (there are no tombstones)
+        """
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, all kept up to date by the map itself (O(1))
+        """
+        return {
+            'capacity': self._capacity,
+            'live_entries': self._size,
+            'tombstones': 0,
+            'empty_buckets': self._capacity - self._size,
+            'table_load': self.table_load(),
+            'max_probe_length': self._max_probe,
+        }
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method resizes hashtable to new_capacity if new capacity isn't prime, new capacity modified to be prime
+        """
+        if new_capacity < self._size:
+            return
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # grow the target until every entry fits under the load limit, as re-putting would
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        old_dists, old_hashes = self._dists, self._hashes
+        old_keys, old_values = self._keys, self._values
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._size = 0
+        self._version += 1
+
+        # reinsert from the stored hashes; keys are unique already, so no key checks
+        for idx in range(len(old_dists)):
+            if old_dists[idx] != EMPTY:
+                self._insert(old_keys[idx], old_values[idx], old_hashes[idx], False)
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        if self._size == 0:
+            return None
+
+        idx = self._find(key, self._hash_function(key))
+        if idx == -1:
+            return None
+        return self._values[idx]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        if self._size == 0:
+            return False
+
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        if self._size == 0:
+            return
+
+        idx = self._find(key, self._hash_function(key))
+        if idx != -1:
+            self._delete(idx)
+
+    def _delete(self, idx: int) -> None:
+        """
+        Input: index of an occupied slot
+        Output: None
+        Method empties the slot with backward-shift deletion: every following entry that is not
+        in its home slot moves back one place, so no tombstone is needed
+        """
+        dists, hashes, keys, values = self._dists, self._hashes, self._keys, self._values
+        capacity = self._capacity
+
+        next_idx = idx + 1
+        if next_idx == capacity:
+            next_idx = 0
+        while dists[next_idx] > 0:
+            dists[idx] = dists[next_idx] - 1
+            hashes[idx] = hashes[next_idx]
+            keys[idx] = keys[next_idx]
+            values[idx] = values[next_idx]
+            idx = next_idx
+            next_idx += 1
+            if next_idx == capacity:
+                next_idx = 0
+
+        dists[idx] = EMPTY
+        keys[idx] = None
+        values[idx] = None
+        self._size -= 1
+        self._version += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the map, in order, resizing at most once up front
+        """
+        pairs = to_list(pairs)
+
+        # worst case every key is new; size the table so no put would trip the load check
+        needed = self._size + len(pairs)
+        if needed and (needed - 1) / self._capacity >= self._max_load:
+            self.resize_table(int((needed - 1) / self._max_load) + 1)
+
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._insert(pairs[idx][0], pairs[idx][1], hashes[idx], True)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        for key in to_list(keys):
+            return_da.append(self.get(key))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap. Does not change underlying hash table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._version += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        return_da = DynamicArray()
+        dists, keys, values = self._dists, self._keys, self._values
+        for idx in range(self._capacity):
+            if dists[idx] != EMPTY:
+                return_da.append((keys[idx], values[idx]))
+        return return_da
+
+    def _live_entries(self):
+        """
+        Generator of a HashEntry view of each occupied slot. Raises RuntimeError if the map is
+        structurally changed while the generator is suspended.
+        """
+        dists, hashes, keys, values = self._dists, self._hashes, self._keys, self._values
+        version = self._version
+        for idx in range(len(dists)):
+            if dists[idx] != EMPTY:
+                yield HashEntry(keys[idx], values[idx], hashes[idx])
+                if self._version != version:
+                    raise RuntimeError('map changed during iteration')
+
+    def __iter__(self):
+        """
+        Return a new iterator over the entries (see _live_entries)
+        """
+        return self._live_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys (nothing is copied)
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values (nothing is copied)
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs (nothing is copied)
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+    print(m.stats())
+
+    print("\nresize / get_keys_and_values")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
@@ -1,25 +1,59 @@
-from a6_include import (DynamicArray, LinkedList,
+import heapq
+from operator import itemgetter
+
+from a6_include import (DynamicArray, ItemsView, KeysView, LinkedList, SIZINGS, ValuesView,
+                        SlottedDynamicArray, SlottedLinkedList,
+                        get_hash_function, hash_many, mixed, power_of_two, table_prime, to_list,
                         hash_function_1, hash_function_2)
 
 
 class HashMap:
+    # instrumentation.Instrumentation.attach() sets this on an instance to a callable
+    # (op, probes, comparisons, tombstones); every chain search then reports to it
+    _probe_hook = None
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 slotted: bool = False,
+                 sizing: str = 'prime') -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
+        function is a hash function or the name of one registered in
+        a6_include.HASH_FUNCTIONS (e.g. 'fnv1a', 'murmur3')
+        slotted=True builds the buckets from the __slots__ variants of
+        LinkedList/SLNode/DynamicArray, which have no per-instance __dict__
+        sizing picks the capacities: 'prime' (next prime, found by trial division),
+        'table' (next prime from a6_include.PRIME_CAPACITIES, no search) or 'pow2'
+        (powers of two, with hashes put through mix_hash so the low bits used
+        for the bucket index depend on the whole key)
         """
-        self._buckets = DynamicArray()
+        if sizing not in SIZINGS:
+            raise ValueError(f"unknown sizing {sizing!r}, expected one of {', '.join(SIZINGS)}")
+        self._sizing = sizing
+
+        self._array_type = SlottedDynamicArray if slotted else DynamicArray
+        self._list_type = SlottedLinkedList if slotted else LinkedList
+        self._buckets = self._array_type()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number (or a power of two in pow2 mode)
+        self._capacity = self._round_capacity(capacity)
         for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+            self._buckets.append(self._list_type())
 
-        self._hash_function = function
+        self._hash_function = get_hash_function(function)
+        if sizing == 'pow2':
+            self._hash_function = mixed(self._hash_function)
         self._size = 0
 
+        # kept up to date by every insert/remove so empty_buckets() and stats() are O(1)
+        self._empty = self._capacity
+        # longest chain seen since the last resize
+        self._max_chain = 0
+        # bumped by every insert, remove, resize and clear; iterators check it after each node
+        self._version = 0
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -60,6 +94,16 @@ class HashMap:
 
         return True
 
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Return the capacity the table uses for a requested capacity, according to its sizing
+        """
+        if self._sizing == 'table':
+            return table_prime(capacity)
+        if self._sizing == 'pow2':
+            return power_of_two(capacity)
+        return capacity if self._is_prime(capacity) else self._next_prime(capacity)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -74,6 +118,17 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    def _probe(self, list: LinkedList, key: str, hash: int, op: str):
+        """
+        Input: bucket, key, full hash of key and the operation ('insert' or 'lookup')
+        Output: node for key in list, or None
+        Method searches like list.contains() and reports the nodes examined and key comparisons
+        to the probe hook. Only used while a hook is set.
+        """
+        _, node, probes, comparisons = list.find(key, hash)
+        self._probe_hook(op, probes, comparisons, 0)
+        return node
+
     def put(self, key: str, value: object) -> None:
         """
         Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
@@ -85,18 +140,49 @@ class HashMap:
         if int(self.table_load()) >= 1:
             self.resize_table(self._capacity * 2)
 
-        list = self._buckets[self._hash_function(key) % self._capacity]
+        # hash the key once; the full hash is cached on the node for later rehashing
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the full hash of key
+        Output: None
+        Method does the insert/update part of put() for an already hashed key. No load check.
+        """
+        list = self._buckets[hash % self._capacity]
 
-        # if the key already exists:
-        if list.contains(key):
-            # using contains key to return that node and modify its value
-            list.contains(key).value = value
+        # if the key already exists, modify that node's value (hashes compared before keys):
+        if self._probe_hook is None:
+            node = list.contains(key, hash)
+        else:
+            node = self._probe(list, key, hash, 'insert')
+        if node is not None:
+            node.value = value
             return
 
         # otherwise add it to map:
 
-        list.insert(key, value)
+        if list.length() == 0:
+            self._empty -= 1
+        list.insert(key, value, hash)
         self._size += 1
+        self._version += 1
+        if list.length() > self._max_chain:
+            self._max_chain = list.length()
+
+    def _move_node(self, node) -> None:
+        """
+        Input: node from another bucket array, with its hash cached
+        Output: None
+        Method inserts the node's key/value into the current buckets without a duplicate check.
+        Size is not changed (used when moving nodes between tables).
+        """
+        list = self._buckets[node.hash % self._capacity]
+        if list.length() == 0:
+            self._empty -= 1
+        list.insert(node.key, node.value, node.hash)
+        if list.length() > self._max_chain:
+            self._max_chain = list.length()
 
     def empty_buckets(self) -> int:
         """
@@ -104,16 +190,22 @@ class HashMap:
         Output: Int of empty buckets
         Method checks for empty buckets in hashmap
         """
-        # initializing return value variable:
-        return_val = 0
-
-        # for index in array, check if that linkedlist in array slot is empty (len == 0):
-        for idx in range(self._buckets.length()):
-            if self._buckets[idx].length() == 0:
-                # if the LL is empty (len == 0), return value is incremented
-                return_val += 1
+        # the count is maintained by put/remove/clear/resize_table:
+        return self._empty
 
-        return return_val
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, all kept up to date by the map itself (O(1))
+        """
+        return {
+            'capacity': self._capacity,
+            'live_entries': self._size,
+            'tombstones': 0,
+            'empty_buckets': self._empty,
+            'table_load': self.table_load(),
+            'max_chain_length': self._max_chain,
+        }
 
     def table_load(self) -> float:
         """
@@ -136,15 +228,18 @@ class HashMap:
         """
 
         # initialize a new empty DA to be the new buckets
-        cleared_buckets = DynamicArray()
+        cleared_buckets = self._array_type()
 
         # grow the empty the DA to the size of the existing using empty spaces:
         for idx in range(self._capacity):
-            cleared_buckets.append(LinkedList())
+            cleared_buckets.append(self._list_type())
 
         # replace the current buckets with the new DA and set size to reflect empty:
         self._buckets = cleared_buckets
         self._size = 0
+        self._empty = self._capacity
+        self._max_chain = 0
+        self._version += 1
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -158,9 +253,13 @@ class HashMap:
         if new_capacity < 1:
             return
 
-        # if the new_cap is not already prime, we will make it prime with _next_prime():
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # if the new_cap is not already prime (or a power of two), we will round it up:
+        new_capacity = self._round_capacity(new_capacity)
+
+        # re-putting every node would double the table again whenever the load check in put()
+        # trips, so grow the target up front until every node fits under the load limit:
+        while self._size and self._size - 1 >= new_capacity:
+            new_capacity = self._round_capacity(new_capacity * 2)
 
         # copy current data and change capacity
         copy_buckets = self._buckets
@@ -168,22 +267,25 @@ class HashMap:
 
         # (essentially same as clear function here)
         # initialize a new empty DA to be the new buckets
-        cleared_buckets = DynamicArray()
+        cleared_buckets = self._array_type()
 
         # grow the empty the DA to the size of the existing using empty spaces:
         for idx in range(self._capacity):
-            cleared_buckets.append(LinkedList())
+            cleared_buckets.append(self._list_type())
 
-        # replace the current buckets with the new DA and set size to reflect empty:
+        # replace the current buckets with the new DA:
         self._buckets = cleared_buckets
-        self._size = 0
+        self._empty = new_capacity
+        self._max_chain = 0
+        self._version += 1
 
-        # go through current buckets and rehash those items into our new DA (future self._buckets):
+        # go through current buckets and move those items into our new DA (future self._buckets)
+        # using their cached hashes. Keys are unique already, so no contains() check is needed.
         for idx in range(copy_buckets.length()):
             if copy_buckets[idx].length() != 0:
                 ll = copy_buckets[idx]
                 for node in ll:
-                    self.put(node.key, node.value)
+                    self._move_node(node)
 
     def get(self, key: str):
         """
@@ -192,10 +294,16 @@ class HashMap:
         Method returns value associated with given key. If key not in hash map, method returns None.
         """
         # if value not in map return None (edge case):
-        if not self._buckets[self._hash_function(key) % self._buckets.length()].contains(key):
+        hash = self._hash_function(key)
+        list = self._buckets[hash % self._capacity]
+        if self._probe_hook is None:
+            node = list.contains(key, hash)
+        else:
+            node = self._probe(list, key, hash, 'lookup')
+        if node is None:
             return None
         else:
-            return self._buckets[self._hash_function(key) % self._buckets.length()].contains(key).value
+            return node.value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -209,11 +317,14 @@ class HashMap:
             return False
 
         # check if the LinkedList at the hash function index contains key:
-        if self._buckets[self._hash_function(key) % self._buckets.length()].contains(key):
-            return True
-        # otherwise if not there, item is key is not in map
+        hash = self._hash_function(key)
+        list = self._buckets[hash % self._capacity]
+        if self._probe_hook is None:
+            node = list.contains(key, hash)
         else:
-            return False
+            node = self._probe(list, key, hash, 'lookup')
+        # otherwise if not there, item is key is not in map
+        return node is not None
 
     def remove(self, key: str) -> None:
         """
@@ -221,12 +332,80 @@ class HashMap:
         Output: None
         Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
         """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Input: key and the full hash of key
+        Output: True if key was removed, False if it was not in the map
+        """
         # if the value exists in the buckets: remove it and decrement the size:
-        if self._buckets[self._hash_function(key) % self._buckets.length()].contains(key):
-            self._buckets[self._hash_function(key) % self._buckets.length()].remove(key)
+        list = self._buckets[hash % self._capacity]
+        if self._probe_hook is None:
+            removed = list.remove(key, hash)
+        else:
+            # the same single walk, counted, then unlink what it found
+            previous, node, probes, comparisons = list.find(key, hash)
+            self._probe_hook('lookup', probes, comparisons, 0)
+            removed = node is not None
+            if removed:
+                list.unlink(previous, node)
+        if removed:
             self._size -= 1
+            self._version += 1
+            if list.length() == 0:
+                self._empty += 1
+            return True
+
+        return False
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the map, in order. The table is resized at most once, up front, to
+        a prime capacity that keeps the load under 1 for all of the new keys, and each key is hashed once.
+        """
+        pairs = to_list(pairs)
+
+        # worst case every key is new; size the table so no put would trip the load check
+        needed = self._size + len(pairs)
+        if needed - 1 >= self._capacity:
+            self.resize_table(needed)
+
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._put_hashed(pairs[idx][0], pairs[idx][1], hashes[idx])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        buckets, capacity = self._buckets, self._capacity
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            list = buckets[hashes[idx] % capacity]
+            if self._probe_hook is None:
+                node = list.contains(keys[idx], hashes[idx])
+            else:
+                node = self._probe(list, keys[idx], hashes[idx], 'lookup')
+            return_da.append(None if node is None else node.value)
+        return return_da
 
-        return
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            self._remove_hashed(keys[idx], hashes[idx])
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -247,42 +426,511 @@ class HashMap:
                     return_da.append((ll_node.key, ll_node.value))
         return return_da
 
+    def _live_entries(self):
+        """
+        Generator of the nodes, bucket by bucket. Each call has its own position, so iterations
+        can be nested or interleaved. Raises RuntimeError if the map is structurally changed
+        (key added or removed, table resized or cleared) while the generator is suspended.
+        """
+        buckets, version = self._buckets, self._version
+        for idx in range(buckets.length()):
+            for node in buckets[idx]:
+                yield node
+                if self._version != version:
+                    raise RuntimeError('map changed during iteration')
+
+    def __iter__(self):
+        """
+        Return a new iterator over the nodes (see _live_entries); each has .key and .value
+        """
+        return self._live_entries()
 
-def find_mode(da: DynamicArray) -> (DynamicArray, int):
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys (nothing is copied)
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values (nothing is copied)
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs (nothing is copied)
+        """
+        return ItemsView(self)
+
+
+class IncrementalHashMap(HashMap):
     """
-    Input: Dynamic Array:
-    Output: Tuple(DA, int) Dynamic array will contain the value(s) of the DA that occur the most
-    Function returns mode value(s) and the occurrence within the DA. uses a Map for calculation.
+    HashMap that grows incrementally instead of in one synchronous resize.
+
+    When put() crosses the load limit a new, larger bucket array is allocated
+    and the old one is kept beside it. Every put/get/contains_key/remove then
+    migrates up to migration_budget old buckets into the new array, and lookups
+    consult both arrays until the migration finishes, so no single operation
+    pays for rehashing the whole table.
     """
-    # init map to hold the frequency of each value in da (val, freq)
-    map = HashMap()
-
-    return_da = DynamicArray()
-    highest_freq = 0
-
-    # iterate through the DA:
-    for idx in range(da.length()):
-        # if map contains an object found in array increment value by 1:
-        if map.contains_key(da[idx]):
-            map.put(da[idx], map.get(da[idx]) + 1)
-        # if not, then add that value to the map:
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 slotted: bool = False,
+                 migration_budget: int = 4,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new incrementally resized HashMap.
+        migration_budget is the number of old buckets moved per operation.
+        """
+        super().__init__(capacity, function, slotted, sizing)
+        self.migration_budget = migration_budget
+        self._old_buckets = None
+        self._migrate_idx = 0
+
+    def is_migrating(self) -> bool:
+        """
+        Return True while nodes are still being moved out of the old bucket array
+        """
+        return self._old_buckets is not None
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Input: requested capacity of the new bucket array
+        Output: None
+        Method allocates the new bucket array and keeps the current one as the migration source
+        """
+        # a migration still in progress has to finish before another one starts
+        self._finish_migration()
+
+        new_capacity = self._round_capacity(new_capacity)
+
+        # the empty lists are the only per-bucket work done up front; nodes move in _migrate()
+        list_type = self._list_type
+        self._begin_migration(self._array_type([list_type() for _ in range(new_capacity)]))
+
+    def _begin_migration(self, new_buckets) -> None:
+        """
+        Input: new, empty bucket array (no migration may be in progress)
+        Output: None
+        Method makes new_buckets the current bucket array and the current one the migration source
+        """
+        new_capacity = new_buckets.length()
+        self._old_buckets = self._buckets
+        self._migrate_idx = 0
+        self._buckets = new_buckets
+        self._capacity = new_capacity
+        self._empty = new_capacity
+        self._max_chain = 0
+        self._version += 1
+
+    def _migrate(self, count: int) -> None:
+        """
+        Input: number of old buckets to migrate
+        Output: None
+        Method moves the nodes of the next count old buckets into the new bucket array
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return
+
+        idx = self._migrate_idx
+        end = min(idx + count, old_buckets.length())
+        while idx < end:
+            ll = old_buckets[idx]
+            if ll.length() != 0:
+                for node in ll:
+                    self._move_node(node)
+                # migrated buckets are never probed again; drop the old nodes
+                old_buckets[idx] = self._list_type()
+            idx += 1
+
+        self._migrate_idx = idx
+        if idx >= old_buckets.length():
+            self._old_buckets = None
+            self._migrate_idx = 0
+
+    def _finish_migration(self) -> None:
+        """
+        Migrate everything left in the old bucket array
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length() - self._migrate_idx)
+
+    def _old_bucket(self, hash: int) -> LinkedList:
+        """
+        Input: full hash of a key
+        Output: the key's bucket in the old array if it has not been migrated yet, otherwise None
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return None
+
+        idx = hash % old_buckets.length()
+        if idx < self._migrate_idx:
+            return None
+        return old_buckets[idx]
+
+    def _lookup(self, key: str, hash: int):
+        """
+        Input: key and its full hash
+        Output: node for key in either bucket array, or None
+        """
+        if self._probe_hook is not None:
+            return self._probe_both(key, hash)
+
+        node = self._buckets[hash % self._capacity].contains(key, hash)
+        if node is None:
+            old_bucket = self._old_bucket(hash)
+            if old_bucket is not None:
+                node = old_bucket.contains(key, hash)
+        return node
+
+    def _probe_both(self, key: str, hash: int):
+        """
+        Input: key and its full hash
+        Output: node for key in either bucket array, or None
+        Method searches like _lookup() and reports both chain walks to the probe hook as one lookup
+        """
+        _, node, probes, comparisons = self._buckets[hash % self._capacity].find(key, hash)
+        old_bucket = self._old_bucket(hash)
+        if node is None and old_bucket is not None:
+            _, node, more_probes, more_comparisons = old_bucket.find(key, hash)
+            probes, comparisons = probes + more_probes, comparisons + more_comparisons
+        self._probe_hook('lookup', probes, comparisons, 0)
+        return node
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. Crossing the load limit starts an incremental
+        migration into a table of twice the capacity instead of resizing in place.
+        """
+        self._migrate(self.migration_budget)
+        if int(self.table_load()) >= 1:
+            self._start_migration(self._capacity * 2)
+
+        hash = self._hash_function(key)
+
+        # a key that has not been migrated yet is updated where it is
+        old_bucket = self._old_bucket(hash)
+        if old_bucket is not None:
+            node = old_bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+                return
+
+        self._put_hashed(key, value, hash)
+
+    def get(self, key: str):
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        self._migrate(self.migration_budget)
+        node = self._lookup(key, self._hash_function(key))
+        return None if node is None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        self._migrate(self.migration_budget)
+        if self._size == 0:
+            return False
+
+        return self._lookup(key, self._hash_function(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        self._migrate(self.migration_budget)
+        hash = self._hash_function(key)
+        if self._remove_hashed(key, hash):
+            return
+
+        old_bucket = self._old_bucket(hash)
+        if old_bucket is not None and old_bucket.remove(key, hash):
+            self._size -= 1
+            self._version += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method finishes any migration in progress, then resizes synchronously like HashMap.resize_table
+        """
+        self._finish_migration()
+        super().resize_table(new_capacity)
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method finishes any migration in progress, then bulk loads like HashMap.put_many
+        """
+        self._finish_migration()
+        super().put_many(pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        for key in to_list(keys):
+            return_da.append(self.get(key))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap, dropping any migration in progress.
+        """
+        self._old_buckets = None
+        self._migrate_idx = 0
+        super().clear()
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics like HashMap.stats, plus whether a migration is running.
+        Counts describe the new bucket array; nodes still in the old array are included in
+        live_entries only.
+        """
+        stats = super().stats()
+        stats['migrating'] = self._old_buckets is not None
+        return stats
+
+    # whole-table operations are O(capacity) anyway, so they finish the migration first
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        self._finish_migration()
+        return super().__str__()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method finishes any migration in progress, then returns a DA of the key/value pairs
+        """
+        self._finish_migration()
+        return super().get_keys_and_values()
+
+    def _live_entries(self):
+        """
+        Finish any migration in progress (when iteration starts), then iterate like HashMap
+        """
+        self._finish_migration()
+        yield from super()._live_entries()
+
+
+class Counter(HashMap):
+    """
+    HashMap of key -> count for frequency counting over a stream.
+
+    increment() hashes the key once and walks its chain once, adding to the
+    count on the node it finds or inserting the key. The highest count and the
+    keys that have it (the modal set, kept in a HashMap of its own) are updated
+    with every change, so mode() needs no pass over the table. Only when a
+    decrement or remove() takes the last key off the highest count does the
+    next mode() call look the mode up again.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 slotted: bool = False,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty Counter (arguments as for HashMap)
+        """
+        super().__init__(capacity, function, slotted, sizing)
+        self._reset_mode()
+
+    def _reset_mode(self) -> None:
+        """
+        Start an empty modal set; None is the highest count of an empty counter
+        """
+        self._max = None
+        self._modal = HashMap()
+        self._stale = False
+
+    def _track(self, key: str, hash: int, count: int) -> None:
+        """
+        Input: key, full hash of key and its new count
+        Output: None
+        Method updates the highest count and modal set for one changed count.
+        The modal map is only ever given the hashes computed here, never hashes keys itself.
+        """
+        if self._stale:
+            return
+
+        modal = self._modal
+        if self._max is None or count > self._max:
+            # new highest count: the key is the only mode (and often already was)
+            self._max = count
+            if modal.get_size() == 1 and modal._buckets[hash % modal._capacity].contains(key, hash):
+                return
+            self._modal = modal = HashMap()
+        elif count < self._max:
+            # the key may have dropped off the highest count
+            if modal._remove_hashed(key, hash) and modal.get_size() == 0:
+                self._stale = True
+            return
+
+        if int(modal.table_load()) >= 1:
+            modal.resize_table(modal.get_capacity() * 2)
+        modal._put_hashed(key, True, hash)
+
+    def _put_hashed(self, key: str, value: int, hash: int) -> None:
+        """
+        Input: key, count and the full hash of key
+        Output: None
+        Method sets the count like HashMap._put_hashed and updates the mode
+        """
+        super()._put_hashed(key, value, hash)
+        self._track(key, hash, value)
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Input: key and the full hash of key
+        Output: True if key was removed, False if it was not in the counter
+        """
+        if not super()._remove_hashed(key, hash):
+            return False
+
+        if not self._stale and self._modal._remove_hashed(key, hash) and self._modal.get_size() == 0:
+            if self._size == 0:
+                self._max = None
+            else:
+                self._stale = True
+        return True
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears every count. Does not change underlying hash table capacity.
+        """
+        super().clear()
+        self._reset_mode()
+
+    # ------------------------------------------------------------------ #
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Input: key and amount to add to its count (may be negative)
+        Output: the new count of key
+        Method adds delta to the count of key, inserting key with count delta if it is new.
+        The key is hashed once and its chain walked once.
+        """
+        hash = self._hash_function(key)
+        list = self._buckets[hash % self._capacity]
+        if self._probe_hook is None:
+            node = list.contains(key, hash)
+        else:
+            node = self._probe(list, key, hash, 'insert')
+
+        if node is not None:
+            node.value += delta
+            count = node.value
         else:
-            map.put(da[idx], 1)
-        # update highest_freq if value in map is higher
-        if map.get(da[idx]) > highest_freq:
-            highest_freq = map.get(da[idx])
-
-    # get the contents of map, and store as variable:
-    content = map.get_keys_and_values()
-
-    # iterate through content
-    for idx in range(content.length()):
-        # if the value of the key value pair is == to highest_freq:
-        if content[idx][1] == highest_freq:
-            # We add that key to the return_da:
+            # only an insert can push the load over the limit
+            if int(self.table_load()) >= 1:
+                self.resize_table(self._capacity * 2)
+                list = self._buckets[hash % self._capacity]
+            if list.length() == 0:
+                self._empty -= 1
+            list.insert(key, delta, hash)
+            self._size += 1
+            self._version += 1
+            if list.length() > self._max_chain:
+                self._max_chain = list.length()
+            count = delta
+
+        self._track(key, hash, count)
+        return count
+
+    def update(self, iterable) -> None:
+        """
+        Input: any iterable of keys (DynamicArray, list, generator, file, ...)
+        Output: None
+        Method increments the count of every key, consuming the iterable as a stream
+        """
+        increment = self.increment
+        # DynamicArray deliberately has no iterator, so it is walked by index
+        if isinstance(iterable, (DynamicArray, SlottedDynamicArray)):
+            for idx in range(iterable.length()):
+                increment(iterable[idx])
+            return
+
+        for key in iterable:
+            increment(key)
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        Input: None
+        Output: Tuple(DA, int) of the key(s) with the highest count, and that count (0 if empty)
+        """
+        if self._stale:
+            # a decrement or removal emptied the modal set: find the highest count again
+            self._reset_mode()
+            for idx in range(self._buckets.length()):
+                for node in self._buckets[idx]:
+                    self._track(node.key, node.hash, node.value)
+
+        return_da = DynamicArray()
+        content = self._modal.get_keys_and_values()
+        for idx in range(content.length()):
             return_da.append(content[idx][0])
+        return return_da, 0 if self._max is None else self._max
+
+    def most_common(self, k: int = None) -> DynamicArray:
+        """
+        Input: number of keys wanted (all keys if None)
+        Output: DynamicArray of (key, count) tuples, highest count first
+        Method keeps a heap of at most k entries while walking the table, so it is O(n log k)
+        """
+        pairs = ((node.key, node.value) for idx in range(self._buckets.length()) for node in self._buckets[idx])
+        if k is None:
+            return DynamicArray(sorted(pairs, key=itemgetter(1), reverse=True))
+        return DynamicArray(heapq.nlargest(k, pairs, key=itemgetter(1)))
 
-    return return_da, highest_freq
+
+def find_mode(da: DynamicArray) -> (DynamicArray, int):
+    """
+    Input: Dynamic Array (or any iterable of keys, consumed as a stream)
+    Output: Tuple(DA, int) Dynamic array will contain the value(s) of the DA that occur the most
+    Function returns mode value(s) and the occurrence within the DA. uses a Counter for calculation.
+    """
+    # count each value; the Counter keeps the highest count and its keys up to date as it goes
+    counter = Counter()
+    counter.update(da)
+    return counter.mode()
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -485,3 +1133,39 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nIncrementalHashMap example 1")
+    print("----------------------------")
+    m = IncrementalHashMap(11, hash_function_2, migration_budget=2)
+    for i in range(60):
+        m.put(str(i), i * 10)
+        if i % 10 == 9:
+            print(m.get_size(), m.get_capacity(), m.is_migrating(),
+                  all(m.get(str(k)) == k * 10 for k in range(i + 1)))
+
+    print("\nCounter example 1")
+    print("-----------------")
+    counter = Counter()
+    counter.update(word for line in ["a b a c", "b a d", "c c"] for word in line.split())
+    mode, frequency = counter.mode()
+    print(f"Mode : {mode}, Frequency: {frequency}, most common: {counter.most_common(2)}")
+    counter.increment('c', -1)
+    counter.remove('a')
+    mode, frequency = counter.mode()
+    print(f"Mode : {mode}, Frequency: {frequency}, e: {counter.increment('e', 5)}, {counter.mode()[1]}")
+
+    print("\nkeys() / values() / items() example 1")
+    print("-------------------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(5):
+        m.put(str(i), i * 10)
+    print(m.keys(), m.values(), len(m.items()), '3' in m.keys())
+    # iterations are independent: nested loops over the same map
+    print([(a, b) for a in m.keys() for b in m.keys() if int(a) + int(b) == 4])
+    items = iter(m.items())
+    print(next(items))
+    m.put('5', 50)
+    try:
+        next(items)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
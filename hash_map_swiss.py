@@ -0,0 +1,450 @@
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, ItemsView, KeysView, ValuesView,
+                        get_hash_function, hash_many, mix_hash, to_list,
+                        hash_function_1)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# control byte values; a full slot holds the low 7 bits of its hash (0-127)
+EMPTY = 0x80
+DELETED = 0xFE
+
+# slots per group; probing moves one group at a time
+GROUP_WIDTH = 16
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.875) -> None:
+        """
+        Initialize new HashMap modelled on SwissTable.
+
+        Slots are split into groups of GROUP_WIDTH. Each slot has a control
+        byte in a bytearray: EMPTY, DELETED, or the low 7 bits of the slot's
+        (mixed) hash. A lookup scans a whole group's control bytes for the
+        key's 7-bit fragment in one C-level bytearray.find(), so full key
+        comparisons only happen for slots whose fragment matches, and it stops
+        at the first group that still has an EMPTY byte. The number of groups
+        is a power of two; groups are probed in triangular order, which
+        visits every group.
+        """
+        self._max_load = max_load
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+        # bumped by every insert, remove, rebuild and clear; iterators check it after each entry
+        self._version = 0
+        self._allocate(self._groups_for(capacity))
+
+    def _groups_for(self, capacity: int) -> int:
+        """
+        Return the smallest power-of-two group count with at least capacity slots
+        """
+        groups = 1
+        while groups * GROUP_WIDTH < capacity:
+            groups *= 2
+        return groups
+
+    def _allocate(self, groups: int) -> None:
+        """
+        Replace the slot arrays with empty ones for the given number of groups
+        """
+        capacity = groups * GROUP_WIDTH
+        self._group_mask = groups - 1
+        self._capacity = capacity
+        self._ctrl = bytearray([EMPTY]) * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._deleted = 0
+        self._version += 1
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._ctrl[i] == EMPTY:
+                slot = None
+            else:
+                slot = HashEntry(self._keys[i], self._values[i], self._hashes[i])
+                slot.is_tombstone = self._ctrl[i] == DELETED
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Input: key and its mixed hash
+        Output: slot index of the entry for key, or -1 if key is not in the map
+        """
+        ctrl, hashes, keys = self._ctrl, self._hashes, self._keys
+        fragment = hash & 0x7F
+        group = (hash >> 7) & self._group_mask
+        step = 0
+
+        while True:
+            start = group * GROUP_WIDTH
+            end = start + GROUP_WIDTH
+
+            # only slots whose control byte matches the fragment get a full comparison
+            pos = ctrl.find(fragment, start, end)
+            while pos != -1:
+                if hashes[pos] == hash and keys[pos] == key:
+                    return pos
+                pos = ctrl.find(fragment, pos + 1, end)
+
+            # an EMPTY slot means no insert ever probed past this group
+            if ctrl.find(EMPTY, start, end) != -1:
+                return -1
+
+            step += 1
+            group = (group + step) & self._group_mask
+
+    def _insert_new(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key known not to be in the map, its value and mixed hash
+        Output: None
+        Method stores the entry in the first EMPTY or DELETED slot along its group probe sequence
+        """
+        ctrl = self._ctrl
+        group = (hash >> 7) & self._group_mask
+        step = 0
+
+        while True:
+            start = group * GROUP_WIDTH
+            end = start + GROUP_WIDTH
+            pos = ctrl.find(EMPTY, start, end)
+            if pos == -1:
+                pos = ctrl.find(DELETED, start, end)
+                if pos != -1:
+                    self._deleted -= 1
+            if pos != -1:
+                break
+            step += 1
+            group = (group + step) & self._group_mask
+
+        ctrl[pos] = hash & 0x7F
+        self._hashes[pos] = hash
+        self._keys[pos] = key
+        self._values[pos] = value
+        self._size += 1
+        self._version += 1
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the mixed hash of key
+        Output: None
+        Method inserts or updates key, growing (or cleaning out DELETED slots) first if needed
+        """
+        pos = self._find(key, hash)
+        if pos != -1:
+            self._values[pos] = value
+            return
+
+        # DELETED slots take up room in probe sequences like live ones do
+        if (self._size + self._deleted + 1) / self._capacity > self._max_load:
+            self._rehash(self._size + 1)
+        self._insert_new(key, value, hash)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. If key already in hashmap, associate value will be replaced.
+        If not in hashmap, key/value pair will be added.
+        """
+        self._put_hashed(key, value, mix_hash(self._hash_function(key)))
+
+    def table_load(self) -> float:
+        """
+        Input: None
+        Return: Float
+        Method returns the current hashtable load factor as a float.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Input: None
+        Output: Int of empty buckets
+        Method returns the number of slots without a live entry (including DELETED slots)
+        """
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics, all kept up to date by the map itself (O(1))
+        """
+        return {
+            'capacity': self._capacity,
+            'groups': self._group_mask + 1,
+            'live_entries': self._size,
+            'tombstones': self._deleted,
+            'empty_buckets': self._capacity - self._size,
+            'table_load': self.table_load(),
+        }
+
+    def _rehash(self, entries: int) -> None:
+        """
+        Input: number of entries the table must hold under max_load
+        Output: None
+        Method rebuilds the table, growing it if entries need more groups, dropping DELETED slots
+        """
+        groups = self._groups_for(int(entries / self._max_load) + 1)
+        self._rebuild(max(groups, self._group_mask + 1))
+
+    def _rebuild(self, groups: int) -> None:
+        """
+        Input: number of groups of the new table
+        Output: None
+        Method moves the live entries into fresh arrays using their stored hashes
+        """
+        old_ctrl, old_hashes = self._ctrl, self._hashes
+        old_keys, old_values = self._keys, self._values
+
+        self._allocate(groups)
+        self._size = 0
+        for idx in range(len(old_ctrl)):
+            if old_ctrl[idx] < EMPTY:
+                self._insert_new(old_keys[idx], old_values[idx], old_hashes[idx])
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method resizes hashtable to at least new_capacity slots (a power-of-two number of groups),
+        more if needed to keep every entry under max_load
+        """
+        if new_capacity < self._size:
+            return
+
+        self._rebuild(self._groups_for(max(new_capacity, int(self._size / self._max_load) + 1)))
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        if self._size == 0:
+            return None
+
+        pos = self._find(key, mix_hash(self._hash_function(key)))
+        if pos == -1:
+            return None
+        return self._values[pos]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        if self._size == 0:
+            return False
+
+        return self._find(key, mix_hash(self._hash_function(key))) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method removes input key and associated value from the map. If key isn't in hashmap, method does nothing
+        """
+        if self._size == 0:
+            return
+
+        pos = self._find(key, mix_hash(self._hash_function(key)))
+        if pos == -1:
+            return
+
+        # if the group still has an EMPTY slot, lookups stop here anyway and the slot can be
+        # EMPTY again; otherwise keys may have probed past this group, so leave a DELETED marker
+        start = pos - pos % GROUP_WIDTH
+        if self._ctrl.find(EMPTY, start, start + GROUP_WIDTH) != -1:
+            self._ctrl[pos] = EMPTY
+        else:
+            self._ctrl[pos] = DELETED
+            self._deleted += 1
+        self._keys[pos] = None
+        self._values[pos] = None
+        self._size -= 1
+        self._version += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the map, in order, resizing at most once up front
+        """
+        pairs = to_list(pairs)
+        needed = self._size + len(pairs)
+        if (needed + self._deleted) / self._capacity > self._max_load:
+            self._rehash(needed)
+
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._put_hashed(pairs[idx][0], pairs[idx][1], mix_hash(hashes[idx]))
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map).
+        With NumPy available the first probe group of every key is matched in one vectorised step.
+        """
+        keys = to_list(keys)
+        hashes = [mix_hash(hash) for hash in hash_many(self._hash_function, keys)]
+
+        if np is not None and self._size and len(keys) >= GROUP_WIDTH:
+            values = self._get_many_numpy(keys, hashes)
+        else:
+            values = []
+            for idx in range(len(keys)):
+                pos = self._find(keys[idx], hashes[idx]) if self._size else -1
+                values.append(None if pos == -1 else self._values[pos])
+
+        return DynamicArray(values)
+
+    def _get_many_numpy(self, keys: list, hashes: list) -> list:
+        """
+        Input: keys and their mixed hashes
+        Output: list of values (None for keys not in the map)
+        Method compares every key's 7-bit fragment against all control bytes of its first probe group
+        at once. Keys whose first group neither matches nor ends the probe fall back to _find().
+        """
+        slot_hashes, slot_keys, slot_values = self._hashes, self._keys, self._values
+        hash_array = np.array(hashes, dtype=np.uint64)
+        fragments = (hash_array & np.uint64(0x7F)).astype(np.uint8)
+        starts = ((hash_array >> np.uint64(7)) & np.uint64(self._group_mask)).astype(np.int64) * GROUP_WIDTH
+
+        # a view of the bytearray, not a copy; nothing resizes it in place while the view lives
+        ctrl = np.frombuffer(self._ctrl, dtype=np.uint8)
+        windows = ctrl[starts[:, None] + np.arange(GROUP_WIDTH)]
+        matches = windows == fragments[:, None]
+        has_empty = (windows == EMPTY).any(axis=1).tolist()
+
+        values = [None] * len(keys)
+        found = bytearray(len(keys))
+        start_list = starts.tolist()
+        rows, cols = np.nonzero(matches)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            if found[row]:
+                continue
+            pos = start_list[row] + col
+            if slot_hashes[pos] == hashes[row] and slot_keys[pos] == keys[row]:
+                values[row] = slot_values[pos]
+                found[row] = 1
+
+        # a miss in the first group is only final if that group has an EMPTY slot
+        for row in range(len(keys)):
+            if not found[row] and not has_empty[row]:
+                pos = self._find(keys[row], hashes[row])
+                if pos != -1:
+                    values[row] = slot_values[pos]
+
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the contents of the hashmap. Does not change underlying hash table capacity.
+        """
+        self._allocate(self._group_mask + 1)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        return_da = DynamicArray()
+        ctrl, keys, values = self._ctrl, self._keys, self._values
+        for idx in range(self._capacity):
+            if ctrl[idx] < EMPTY:
+                return_da.append((keys[idx], values[idx]))
+        return return_da
+
+    def _live_entries(self):
+        """
+        Generator of a HashEntry view of each live slot. Raises RuntimeError if the map is
+        structurally changed while the generator is suspended.
+        """
+        ctrl, hashes, keys, values = self._ctrl, self._hashes, self._keys, self._values
+        version = self._version
+        for idx in range(len(ctrl)):
+            if ctrl[idx] < EMPTY:
+                yield HashEntry(keys[idx], values[idx], hashes[idx])
+                if self._version != version:
+                    raise RuntimeError('map changed during iteration')
+
+    def __iter__(self):
+        """
+        Return a new iterator over the live entries (see _live_entries)
+        """
+        return self._live_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Return a lazy view of the keys (nothing is copied)
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Return a lazy view of the values (nothing is copied)
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Return a lazy view of the (key, value) pairs (nothing is copied)
+        """
+        return ItemsView(self)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(16, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+    print(m.get_many(['str1', 'str42', 'str149']))
+    print(m.stats())
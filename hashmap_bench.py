@@ -0,0 +1,306 @@
+"""
+Benchmark suite: OA and SC HashMaps against the built-in dict.
+
+Runs every workload (insert, read, miss, churn, resize_storm, find_mode) for
+every map, hash function and size, keeps the best of --repeat runs, and
+prints a comparison table in operations per second. Keys and operation
+orders come from a seeded random generator, so runs are reproducible.
+
+    python -m hashmap_bench
+    python -m hashmap_bench --sizes 1000 20000 --hashes hash_function_2 fnv1a
+    python -m hashmap_bench --json results.json
+    python -m hashmap_bench --baseline results.json --threshold 0.25
+
+With --baseline, any result more than --threshold slower than the same
+result in the baseline file (a previous --json output) is flagged, and the
+exit status is 1.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import HASH_FUNCTIONS
+
+
+class DictMap:
+    """
+    The HashMap methods used by the workloads, backed by a built-in dict
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Capacity and hash function are ignored; dict manages both itself
+        """
+        self._data = {}
+
+    def put(self, key: str, value: object) -> None:
+        """Add or update key"""
+        self._data[key] = value
+
+    def get(self, key: str) -> object:
+        """Return the value of key, or None"""
+        return self._data.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """Return True if key is in the map"""
+        return key in self._data
+
+    def remove(self, key: str) -> None:
+        """Remove key if it is in the map"""
+        self._data.pop(key, None)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """Copy the dict, the closest equivalent of a rehash"""
+        self._data = dict(self._data)
+
+    def get_size(self) -> int:
+        """Return size of map"""
+        return len(self._data)
+
+
+MAPS = {
+    'oa': hash_map_oa.HashMap,
+    'sc': hash_map_sc.HashMap,
+    'dict': DictMap,
+}
+
+
+# ------------------------------ workloads ------------------------------ #
+# Each workload takes (map factory, size, random generator), does its set-up,
+# and returns (operation count, function running the timed part).
+
+def insert(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    put() size new keys into an empty map, growing it from capacity 11
+    """
+    keys = ['key' + str(i) for i in range(size)]
+    rng.shuffle(keys)
+
+    def run():
+        m = factory()
+        for key in keys:
+            m.put(key, 0)
+
+    return size, run
+
+
+def _filled(factory, size: int, rng: random.Random) -> (object, list):
+    """
+    Return a map holding size keys (value = index) and those keys in random order
+    """
+    keys = ['key' + str(i) for i in range(size)]
+    m = factory()
+    for idx, key in enumerate(keys):
+        m.put(key, idx)
+    rng.shuffle(keys)
+    return m, keys
+
+
+def read(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    get() every key of a full map once, in random order
+    """
+    m, keys = _filled(factory, size, rng)
+
+    def run():
+        for key in keys:
+            m.get(key)
+
+    return size, run
+
+
+def miss(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    get() size keys that are not in a full map
+    """
+    m, _ = _filled(factory, size, rng)
+    missing = ['missing' + str(i) for i in range(size)]
+
+    def run():
+        for key in missing:
+            m.get(key)
+
+    return size, run
+
+
+def churn(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    2 * size operations alternating remove() of a present key and put() of a new one,
+    so the map stays the same size while its slots turn over
+    """
+    m, keys = _filled(factory, size, rng)
+    removed = keys[:]
+    added = ['new' + str(i) for i in range(size)]
+
+    def run():
+        for idx in range(size):
+            m.remove(removed[idx])
+            m.put(added[idx], idx)
+
+    return 2 * size, run
+
+
+def resize_storm(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    10 resize_table() calls on a full map, alternating between 4 * size and 2 * size
+    """
+    m, _ = _filled(factory, size, rng)
+
+    def run():
+        for idx in range(10):
+            m.resize_table(size * (4 if idx % 2 == 0 else 2))
+
+    return 10, run
+
+
+def find_mode(factory, size: int, rng: random.Random) -> (int, callable):
+    """
+    The find_mode() algorithm (count with contains_key/get/put, then take the
+    largest count) over size values drawn from size // 10 distinct strings
+    """
+    values = [str(rng.randrange(max(1, size // 10))) for _ in range(size)]
+
+    def run():
+        m = factory()
+        highest = 0
+        for value in values:
+            count = m.get(value) + 1 if m.contains_key(value) else 1
+            m.put(value, count)
+            if count > highest:
+                highest = count
+
+    return size, run
+
+
+WORKLOADS = {
+    'insert': insert,
+    'read': read,
+    'miss': miss,
+    'churn': churn,
+    'resize_storm': resize_storm,
+    'find_mode': find_mode,
+}
+
+
+# ------------------------------ running ------------------------------ #
+
+def measure(workload: str, map_name: str, hash_name: str, size: int, repeat: int, seed: int) -> dict:
+    """
+    Input: workload, map and hash function names, size, number of runs and random seed
+    Output: result dict (best time of the runs)
+    """
+    map_type, function = MAPS[map_name], HASH_FUNCTIONS[hash_name]
+
+    def factory():
+        return map_type(11, function)
+
+    best = None
+    for _ in range(repeat):
+        # a fresh generator per run gives every run, and every map, the same keys and order
+        ops, run = WORKLOADS[workload](factory, size, random.Random(seed))
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return {
+        'workload': workload,
+        'map': map_name,
+        'hash': hash_name,
+        'size': size,
+        'ops': ops,
+        'seconds': best,
+        'ops_per_sec': ops / best if best else float('inf'),
+    }
+
+
+def result_key(result: dict) -> tuple:
+    """
+    Return the fields that identify a result across runs
+    """
+    return result['workload'], result['map'], result['hash'], result['size']
+
+
+def print_table(results: list, map_names: list) -> None:
+    """
+    Print one row per (workload, hash, size) with the ops/s of every map side by side
+    """
+    rows = {}
+    for result in results:
+        row = rows.setdefault((result['workload'], result['hash'], result['size']), {})
+        row[result['map']] = result['ops_per_sec']
+
+    print(f"{'workload':<14}{'hash':<17}{'size':>8}" + ''.join(f"{name + ' ops/s':>14}" for name in map_names))
+    for (workload, hash_name, size), row in rows.items():
+        cells = ''.join(f"{row[name]:>14.0f}" if name in row else f"{'-':>14}" for name in map_names)
+        print(f"{workload:<14}{hash_name:<17}{size:>8}" + cells)
+
+
+def regressions(results: list, baseline: dict, threshold: float) -> list:
+    """
+    Input: results, baseline results keyed by result_key(), allowed slowdown (0.2 = 20%)
+    Output: list of (result, baseline result) pairs that got slower than allowed
+    """
+    flagged = []
+    for result in results:
+        old = baseline.get(result_key(result))
+        if old is not None and result['seconds'] > old['seconds'] * (1 + threshold):
+            flagged.append((result, old))
+    return flagged
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--hashes', nargs='+', choices=list(HASH_FUNCTIONS),
+                        default=['hash_function_1', 'hash_function_2'])
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS), default=list(MAPS))
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=3, help='runs per result; the best is kept')
+    parser.add_argument('--seed', type=int, default=261)
+    parser.add_argument('--json', metavar='PATH', help='write the results to PATH as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown flagged as a regression')
+    args = parser.parse_args()
+
+    results = []
+    for workload in args.workloads:
+        for hash_name in args.hashes:
+            for size in args.sizes:
+                for map_name in args.maps:
+                    results.append(measure(workload, map_name, hash_name, size, args.repeat, args.seed))
+
+    print_table(results, args.maps)
+
+    if args.json:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'results': results,
+        }
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = {result_key(result): result for result in json.load(file)['results']}
+        flagged = regressions(results, baseline, args.threshold)
+        print(f"\n{len(flagged)} regression(s) against {args.baseline} (threshold {args.threshold:.0%})")
+        for result, old in flagged:
+            print(f"  {result['workload']:<14}{result['map']:<6}{result['hash']:<17}{result['size']:>8}"
+                  f"  {old['seconds']:.4f}s -> {result['seconds']:.4f}s"
+                  f"  ({result['seconds'] / old['seconds'] - 1:+.0%})")
+        if flagged:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Opt-in instrumentation for the OA and SC HashMaps (and their
+IncrementalHashMap subclasses).
+
+    stats = Instrumentation()
+    stats.attach(m)
+    ...
+    stats.snapshot()
+
+attach() sets the map's probe hook to this recorder and replaces its resizing
+methods and hash function, on that one map instance, with recording wrappers;
+detach() removes them again. While no hook is set a map pays one attribute
+check per search, nothing more.
+
+The maps count their own work inside the probe loop (OA) or chain walk (SC)
+of every insert or lookup and report it to the hook once the search is done:
+the slots or nodes examined, the full key comparisons (entries whose cached
+hash matches) and the tombstones passed. Removes are counted as lookups,
+since that is the search they do, and Counter.increment() as an insert.
+"""
+import time
+
+from a6_include import hash_function_1, hash_function_2
+
+
+class Instrumentation:
+    """
+    Collects histograms of per-operation probe counts, key comparisons and
+    tombstone hits, a count of hash function calls, and a log of resizes
+    """
+
+    # attributes attach() may set on a map instance
+    _WRAPPED = ('_probe_hook', '_rebuild', 'resize_table', '_start_migration')
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty recorder with no subscribers
+        """
+        self._callbacks = []
+        self._attached = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear everything recorded so far (subscribers and attached maps are kept)
+        """
+        # histograms: operation -> {value: number of operations with that value}
+        self.probes = {}
+        self.comparisons = {}
+        self.tombstone_hits = {}
+        self.operations = {}
+        self.hash_calls = 0
+        self.resizes = []
+
+    def subscribe(self, callback) -> None:
+        """
+        Input: callable taking one event dict
+        Output: None
+        Method registers callback to receive every probe and resize event as it is recorded
+        """
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Remove a callback registered with subscribe()
+        """
+        self._callbacks.remove(callback)
+
+    def snapshot(self) -> dict:
+        """
+        Input: None
+        Output: dict holding a copy of everything recorded so far
+        """
+        return {
+            'operations': dict(self.operations),
+            'hash_calls': self.hash_calls,
+            'probes': {op: dict(counts) for op, counts in self.probes.items()},
+            'comparisons': {op: dict(counts) for op, counts in self.comparisons.items()},
+            'tombstone_hits': {op: dict(counts) for op, counts in self.tombstone_hits.items()},
+            'resizes': [dict(event) for event in self.resizes],
+        }
+
+    # ------------------------------------------------------------------ #
+
+    def record_probe(self, op: str, probes: int, comparisons: int, tombstones: int) -> None:
+        """
+        Input: operation name ('insert' or 'lookup'), slots or nodes examined,
+        full key comparisons and tombstones passed
+        Output: None
+        """
+        self.operations[op] = self.operations.get(op, 0) + 1
+        for histograms, value in ((self.probes, probes), (self.comparisons, comparisons),
+                                  (self.tombstone_hits, tombstones)):
+            counts = histograms.setdefault(op, {})
+            counts[value] = counts.get(value, 0) + 1
+
+        if self._callbacks:
+            event = {'event': 'probe', 'op': op, 'probes': probes,
+                     'comparisons': comparisons, 'tombstones': tombstones}
+            for callback in self._callbacks:
+                callback(event)
+
+    def record_resize(self, kind: str, old_capacity: int, new_capacity: int, size: int,
+                      seconds: float) -> None:
+        """
+        Input: kind ('resize', 'compact' or 'migration'), capacities before and after,
+        number of entries and time taken
+        Output: None
+        """
+        event = {'event': 'resize', 'kind': kind, 'old_capacity': old_capacity,
+                 'new_capacity': new_capacity, 'size': size, 'seconds': seconds}
+        self.resizes.append(event)
+        for callback in self._callbacks:
+            callback(event)
+
+    # ------------------------------------------------------------------ #
+
+    def attach(self, m) -> object:
+        """
+        Input: OA or SC HashMap (or IncrementalHashMap, or Counter)
+        Output: the same map
+        Method starts recording m's operations. A map can be attached to one recorder at a time.
+        """
+        if '_instrumented_by' in vars(m):
+            raise ValueError('map is already instrumented')
+
+        original_hash = m._hash_function
+        wrappers = {'_hash_function': self._counting(original_hash), '_probe_hook': self.record_probe}
+        if hasattr(m, '_probe_stride'):
+            wrappers.update(self._oa_wrappers(m))
+        else:
+            wrappers.update(self._sc_wrappers(m))
+
+        vars(m).update(wrappers)
+        m._instrumented_by = self
+        self._attached[id(m)] = original_hash
+        return m
+
+    def detach(self, m) -> None:
+        """
+        Input: map previously passed to attach()
+        Output: None
+        Method stops recording and puts back m's own methods and hash function
+        """
+        if vars(m).get('_instrumented_by') is not self:
+            raise ValueError('map is not instrumented by this recorder')
+
+        for name in self._WRAPPED + ('_instrumented_by',):
+            vars(m).pop(name, None)
+        m._hash_function = self._attached.pop(id(m))
+
+    def _counting(self, function):
+        """
+        Return a wrapper of hash function that counts its calls
+        """
+        def hash_function(key: str) -> int:
+            self.hash_calls += 1
+            return function(key)
+
+        return hash_function
+
+    def _timed_resize(self, m, method, kind: str = None):
+        """
+        Return a wrapper of a resizing method of m that records a resize event.
+        With no kind, the kind is the method's second argument (OA _rebuild() is
+        told by resize_table() or compact() which of the two it is doing).
+        """
+        def resize(new_capacity: int, *args) -> None:
+            old_capacity = m._capacity
+            start = time.perf_counter()
+            method(new_capacity, *args)
+            seconds = time.perf_counter() - start
+            self.record_resize(kind or args[0], old_capacity, m._capacity, m._size, seconds)
+
+        return resize
+
+    def _oa_wrappers(self, m) -> dict:
+        """
+        Return the resize recording wrappers for an open addressing map
+        """
+        wrappers = {'_rebuild': self._timed_resize(m, m._rebuild)}
+        if hasattr(m, '_start_migration'):
+            wrappers['_start_migration'] = self._timed_resize(m, m._start_migration, 'migration')
+        return wrappers
+
+    def _sc_wrappers(self, m) -> dict:
+        """
+        Return the resize recording wrappers for a separate chaining map
+        """
+        wrappers = {'resize_table': self._timed_resize(m, m.resize_table, 'resize')}
+        if hasattr(m, '_start_migration'):
+            wrappers['_start_migration'] = self._timed_resize(m, m._start_migration, 'migration')
+        return wrappers
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import hash_map_oa
+    import hash_map_sc
+
+    print("\nOA map, hash_function_1")
+    print("-----------------------")
+    stats = Instrumentation()
+    m = stats.attach(hash_map_oa.HashMap(11, hash_function_1))
+    for i in range(200):
+        m.put('key' + str(i), i)
+    for i in range(0, 200, 2):
+        m.remove('key' + str(i))
+    for i in range(300):
+        m.get('key' + str(i))
+    snapshot = stats.snapshot()
+    print(snapshot['operations'], 'hash calls:', snapshot['hash_calls'])
+    print('lookup probes:', sorted(snapshot['probes']['lookup'].items()))
+    print('lookup tombstone hits:', sorted(snapshot['tombstone_hits']['lookup'].items()))
+    for event in snapshot['resizes']:
+        print(event['kind'], event['old_capacity'], '->', event['new_capacity'])
+
+    print("\nSC map, hash_function_2, with a callback")
+    print("----------------------------------------")
+    stats = Instrumentation()
+    stats.subscribe(lambda event: event['event'] == 'resize' and print(event['old_capacity'], '->',
+                                                                       event['new_capacity']))
+    m = stats.attach(hash_map_sc.HashMap(11, hash_function_2))
+    for i in range(100):
+        m.put('key' + str(i), i)
+    print(m.get('key7'), m.contains_key('nope'))
+    print('insert chain lengths walked:', sorted(stats.snapshot()['probes']['insert'].items()))
+    stats.detach(m)
+    m.put('untracked', 1)
+    print(stats.snapshot()['operations'])
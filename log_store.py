@@ -0,0 +1,447 @@
+"""
+Bitcask-style key-value store: values in append-only segment files, an OA or
+SC HashMap in memory holding only where each key's latest value is.
+
+    with LogStore('audit-cache', map_type='oa') as store:
+        store.put('key', {'any': 'picklable value'})
+        store.get('key')
+        store.remove('key')
+        store.merge()
+
+A directory holds numbered segments, NNNNNNNN.data. Only the newest is
+written to; once it reaches max_segment_bytes it is closed and a new one
+started. Every put() is one sequential append plus one index put(); every
+get() is one index lookup plus one os.pread() of the value. remove()
+appends a tombstone record (the log's version of HashEntry.is_tombstone)
+and removes the key from the index.
+
+Data record:  crc32 | key length | value length | flags | key | value
+              (uint32, uint32, uint32, uint8, UTF-8 key with lone surrogates
+              kept as the hash functions encode them, pickled value; the CRC
+              covers everything after itself; flags 1 = tombstone)
+Hint record:  key length | value offset | value length | flags | key
+
+Each closed segment gets a hint file, NNNNNNNN.hint, listing its records
+without their values, so opening a store reads the hints rather than the
+segments; only a segment without hint (the one that was being written) is
+scanned, and a torn record at its end is cut off.
+
+merge() rewrites all closed segments as one segment holding only the
+records the index still points to, under the number of the newest of them,
+then deletes the others. It runs alongside put/get/remove (start_merge()
+runs it in a thread); the index is only switched to the merged segment for
+keys that were not written again meanwhile. A tombstone is kept in the
+merged segment only when an older merged segment had a record for its key,
+so a crash before the old segments are deleted cannot bring the key back;
+the next merge drops it.
+"""
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray
+
+MAP_TYPES = {
+    'oa': hash_map_oa.HashMap,
+    'sc': hash_map_sc.HashMap,
+}
+
+RECORD = struct.Struct('<IIIB')
+HINT = struct.Struct('<IQIB')
+TOMBSTONE = 1
+
+
+class LogStore:
+    """
+    Embedded append-only key-value store indexed by a HashMap of key -> (segment, offset, length)
+    """
+
+    def __init__(self,
+                 directory: str,
+                 map_type: str = 'oa',
+                 function='fnv1a',
+                 max_segment_bytes: int = 64 * 1024 * 1024,
+                 sync: bool = False) -> None:
+        """
+        Open the store in directory, creating it if needed, and rebuild the index from its
+        hint files (and the segment that has none). map_type ('oa' or 'sc') and function pick
+        the index map and its hash function. sync=True fsyncs the segment after every write.
+        """
+        if map_type not in MAP_TYPES:
+            raise ValueError(f"unknown map type {map_type!r}, expected one of {', '.join(MAP_TYPES)}")
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._map_type = MAP_TYPES[map_type]
+        self._function = function
+        self._max_segment_bytes = max_segment_bytes
+        self._sync = sync
+        # put/get/remove and the switch-over at the end of a merge hold this lock
+        self._lock = threading.Lock()
+        self._merging = threading.Lock()
+
+        self._index = self._map_type(11, function)
+        self._fds = {}
+        segments = sorted(int(name[:-5]) for name in os.listdir(directory) if name.endswith('.data'))
+        hints = None
+        for segment in segments:
+            # O_APPEND as in _open_segment: the last segment may become the active one again
+            self._fds[segment] = os.open(self._path(segment, '.data'), os.O_RDWR | os.O_APPEND)
+            if os.path.exists(self._path(segment, '.hint')):
+                self._load_hint(segment)
+                hints = None
+            else:
+                hints = self._scan(segment)
+
+        # appending continues in the last segment, unless it already has a hint (is closed)
+        if hints is not None:
+            self._active = segments[-1]
+            self._active_size = os.fstat(self._fds[self._active]).st_size
+            self._hints = hints
+        else:
+            self._open_segment(segments[-1] + 1 if segments else 1)
+
+    @staticmethod
+    def _encode(key: str) -> bytes:
+        """
+        Return the UTF-8 bytes of key, lone surrogates included (as the hash functions encode it)
+        """
+        return key.encode('utf-8', 'surrogatepass')
+
+    @staticmethod
+    def _decode(key_bytes: bytes) -> str:
+        """
+        Return the key stored as key_bytes by _encode()
+        """
+        return key_bytes.decode('utf-8', 'surrogatepass')
+
+    def _path(self, segment: int, suffix: str) -> str:
+        """
+        Return the path of a segment's data or hint file
+        """
+        return os.path.join(self._directory, f'{segment:08d}{suffix}')
+
+    def _open_segment(self, segment: int) -> None:
+        """
+        Start writing to a new, empty segment
+        """
+        self._fds[segment] = os.open(self._path(segment, '.data'), os.O_RDWR | os.O_CREAT | os.O_APPEND)
+        self._active = segment
+        self._active_size = 0
+        # (key, value offset, value length, flags) of every record in the active segment
+        self._hints = []
+
+    # ------------------------------------------------------------------ #
+
+    def _records(self, segment: int, with_values: bool = True):
+        """
+        Yield (key, value offset, value length, flags[, value bytes]) for each intact record of
+        a segment, in order. A torn or corrupt record ends the segment: it and anything after it
+        are cut off.
+        """
+        fd = self._fds[segment]
+        size = os.fstat(fd).st_size
+        offset = 0
+        while offset + RECORD.size <= size:
+            crc, key_length, value_length, flags = RECORD.unpack(os.pread(fd, RECORD.size, offset))
+            end = offset + RECORD.size + key_length + value_length
+            data = os.pread(fd, key_length + value_length, offset + RECORD.size)
+            if end > size or zlib.crc32(RECORD.pack(0, key_length, value_length, flags)[4:] + data) != crc:
+                break
+            value_offset = offset + RECORD.size + key_length
+            record = (self._decode(data[:key_length]), value_offset, value_length, flags)
+            yield record + (data[key_length:],) if with_values else record
+            offset = end
+        if offset < size:
+            os.ftruncate(fd, offset)
+
+    def _scan(self, segment: int) -> list:
+        """
+        Apply every record of a segment (without hint file) to the index and return the
+        records as hints, so the segment is read once even when it becomes the active one
+        """
+        hints = list(self._records(segment, with_values=False))
+        for key, value_offset, value_length, flags in hints:
+            self._apply(key, segment, value_offset, value_length, flags)
+        return hints
+
+    def _load_hint(self, segment: int) -> None:
+        """
+        Apply every record listed in a segment's hint file to the index
+        """
+        with open(self._path(segment, '.hint'), 'rb') as file:
+            data = file.read()
+        offset = 0
+        while offset < len(data):
+            key_length, value_offset, value_length, flags = HINT.unpack_from(data, offset)
+            offset += HINT.size
+            key = self._decode(data[offset:offset + key_length])
+            offset += key_length
+            self._apply(key, segment, value_offset, value_length, flags)
+
+    def _apply(self, key: str, segment: int, value_offset: int, value_length: int, flags: int) -> None:
+        """
+        Update the index for one record replayed at startup
+        """
+        if flags & TOMBSTONE:
+            self._index.remove(key)
+        else:
+            self._index.put(key, (segment, value_offset, value_length))
+
+    def _write_hint(self, segment: int, hints: list) -> None:
+        """
+        Write a segment's hint file from its (key, value offset, value length, flags) records
+        """
+        parts = []
+        for key, value_offset, value_length, flags in hints:
+            key_bytes = self._encode(key)
+            parts.append(HINT.pack(len(key_bytes), value_offset, value_length, flags))
+            parts.append(key_bytes)
+        temporary = self._path(segment, '.hint.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(b''.join(parts))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path(segment, '.hint'))
+
+    def _sync_directory(self) -> None:
+        """
+        fsync the store's directory, so the renames and removals made in it so far are durable
+        """
+        fd = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _append(self, key: str, value: bytes, flags: int) -> (int, int):
+        """
+        Input: key, value bytes and record flags
+        Output: (segment, value offset) of the appended record
+        Method appends one record to the active segment, closing it first if it is full. Caller holds the lock.
+        """
+        if self._active_size >= self._max_segment_bytes:
+            self._rotate()
+
+        key_bytes = self._encode(key)
+        header = RECORD.pack(0, len(key_bytes), len(value), flags)[4:]
+        crc = zlib.crc32(header + key_bytes + value)
+        os.write(self._fds[self._active], struct.pack('<I', crc) + header + key_bytes + value)
+        if self._sync:
+            os.fsync(self._fds[self._active])
+
+        value_offset = self._active_size + RECORD.size + len(key_bytes)
+        self._active_size = value_offset + len(value)
+        self._hints.append((key, value_offset, len(value), flags))
+        return self._active, value_offset
+
+    def _rotate(self) -> None:
+        """
+        Close the active segment (fsync it and write its hint file) and start the next one
+        """
+        os.fsync(self._fds[self._active])
+        self._write_hint(self._active, self._hints)
+        self._open_segment(self._active + 1)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) and value (any picklable object)
+        Output: None
+        Method appends the key/value record and points the index at it
+        """
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            segment, value_offset = self._append(key, value, 0)
+            self._index.put(key, (segment, value_offset, len(value)))
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key, or None if key is not in the store
+        """
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            segment, value_offset, value_length = location
+            data = os.pread(self._fds[segment], value_length, value_offset)
+        return pickle.loads(data)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Return True if key is in the store (no file access)
+        """
+        with self._lock:
+            return self._index.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to remove (string)
+        Output: None
+        Method appends a tombstone record for key and removes it from the index. If key isn't in the
+        store, method does nothing.
+        """
+        with self._lock:
+            if self._index.contains_key(key):
+                self._append(key, b'', TOMBSTONE)
+                self._index.remove(key)
+
+    def get_size(self) -> int:
+        """
+        Return number of keys in the store
+        """
+        with self._lock:
+            return self._index.get_size()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Return a DA of every key in the store (from the index; no file access)
+        """
+        return_da = DynamicArray()
+        with self._lock:
+            for key in self._index.keys():
+                return_da.append(key)
+        return return_da
+
+    def segments(self) -> list:
+        """
+        Return the segment numbers, oldest first; the last is the one being written
+        """
+        with self._lock:
+            return sorted(self._fds)
+
+    # ------------------------------------------------------------------ #
+
+    def merge(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method closes the active segment and rewrites every closed segment as one, keeping only
+        the records the index still points to (see the module docstring). One merge runs at a time.
+        """
+        with self._merging:
+            with self._lock:
+                if self._active_size:
+                    self._rotate()
+                merged = sorted(segment for segment in self._fds if segment != self._active)
+            if not merged:
+                return
+
+            target = merged[-1]
+            temporary = self._path(target, '.data.tmp')
+            fd = os.open(temporary, os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_APPEND)
+            size = 0
+            hints, moved = [], []
+            seen = hash_map_sc.HashMap(11, self._function)
+            for segment in merged:
+                for key, value_offset, value_length, flags, value in self._records(segment):
+                    with self._lock:
+                        if flags & TOMBSTONE:
+                            # only needed while an older merged segment could still be replayed
+                            keep = seen.contains_key(key) and not self._index.contains_key(key)
+                        else:
+                            keep = self._index.get(key) == (segment, value_offset, value_length)
+                    seen.put(key, True)
+                    if not keep:
+                        continue
+
+                    key_bytes = self._encode(key)
+                    header = RECORD.pack(0, len(key_bytes), len(value), flags)[4:]
+                    os.write(fd, struct.pack('<I', zlib.crc32(header + key_bytes + value))
+                             + header + key_bytes + value)
+                    new_offset = size + RECORD.size + len(key_bytes)
+                    size = new_offset + len(value)
+                    hints.append((key, new_offset, value_length, flags))
+                    if not flags & TOMBSTONE:
+                        moved.append((key, (segment, value_offset, value_length), (target, new_offset, value_length)))
+            os.fsync(fd)
+
+            with self._lock:
+                # keys written or removed during the merge keep their newer location
+                for key, old, new in moved:
+                    if self._index.get(key) == old:
+                        self._index.put(key, new)
+                # the target's old hint goes first: a crash before the new one is written leaves a
+                # segment without hint, which is scanned (and CRC checked) on the next open, never
+                # a hint listing offsets of the other data file
+                if os.path.exists(self._path(target, '.hint')):
+                    os.remove(self._path(target, '.hint'))
+                    self._sync_directory()
+                os.replace(temporary, self._path(target, '.data'))
+                self._write_hint(target, hints)
+                for segment in merged:
+                    os.close(self._fds.pop(segment))
+                self._fds[target] = fd
+                # the merged segment is durable before the segments it replaces are removed
+                self._sync_directory()
+                for segment in merged[:-1]:
+                    os.remove(self._path(segment, '.data'))
+                    os.remove(self._path(segment, '.hint'))
+
+    def start_merge(self) -> threading.Thread:
+        """
+        Run merge() in a background thread and return the thread
+        """
+        thread = threading.Thread(target=self.merge, daemon=True)
+        thread.start()
+        return thread
+
+    def sync(self) -> None:
+        """
+        fsync the active segment
+        """
+        with self._lock:
+            os.fsync(self._fds[self._active])
+
+    def close(self) -> None:
+        """
+        Close every segment. The active one stays without a hint file and is scanned on the next open.
+        """
+        with self._merging, self._lock:
+            if not self._fds:
+                return
+            os.fsync(self._fds[self._active])
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds = {}
+
+    def __enter__(self) -> 'LogStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+
+    print("\nwrite, overwrite, remove")
+    print("------------------------")
+    with LogStore(directory, 'oa', max_segment_bytes=1024) as store:
+        for i in range(100):
+            store.put('key' + str(i), {'n': i})
+        for i in range(0, 100, 2):
+            store.put('key' + str(i), {'n': -i})
+        for i in range(0, 100, 5):
+            store.remove('key' + str(i))
+        print(store.get_size(), store.get('key3'), store.get('key4'), store.get('key5'), len(store.segments()))
+
+    print("\nreopen from hints")
+    print("-----------------")
+    with LogStore(directory, 'sc') as store:
+        print(store.get_size(), store.get('key3'), store.get('key4'), store.get('key5'), len(store.segments()))
+        store.merge()
+        print(store.get_size(), store.get('key3'), store.get('key4'), store.segments())
+        print(sorted(os.listdir(directory)))
+
+    with LogStore(directory) as store:
+        print(store.get_size(), store.get('key98'), store.contains_key('key95'))
@@ -0,0 +1,355 @@
+import sys
+
+import hash_map_sc
+from a6_include import (DynamicArray, LinkedList, SLNode, hash_many, to_list,
+                        hash_function_1, hash_function_2)
+
+
+class LRUNode(SLNode):
+    """
+    SLNode that is also a link in the cache's recency list
+    """
+
+    def __init__(self, key: str, value: object, next: SLNode = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        newer/older link the node to its neighbours in recency order;
+        weight is what the cache's weigher charged for the entry.
+        """
+        super().__init__(key, value, next, hash)
+        self.newer = None
+        self.older = None
+        self.weight = 0
+
+
+class LRUChain(LinkedList):
+    """
+    Bucket list of an LRUCache: a LinkedList of LRUNodes whose insert returns the new node
+    """
+    _node_type = LRUNode
+
+    def insert(self, key: str, value: object, hash: int = None) -> LRUNode:
+        """Insert new node at front of the list and return it."""
+        super().insert(key, value, hash)
+        return self._head
+
+
+def default_weigher(key: str, value: object) -> int:
+    """
+    Weigher used when a byte budget is given without one: the shallow sizes of key and value
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class LRUCache(hash_map_sc.HashMap):
+    """
+    Bounded cache on the separate chaining HashMap.
+
+    The buckets hold LRUNodes, which are threaded into one doubly linked
+    recency list from newest to oldest. A get() hit moves its node to the
+    newest end, put() adds at the newest end, and eviction takes the oldest
+    node, all without searching. The table is sized for max_entries up
+    front, so it never resizes while in use.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 function: callable = hash_function_1,
+                 max_weight: int = None,
+                 weigher: callable = None,
+                 on_evict: callable = None,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty LRUCache holding at most max_entries entries.
+        With max_weight, the entries' total weigher(key, value) is also kept
+        at or under max_weight (weigher defaults to the shallow byte size of
+        key and value). on_evict(key, value) is called for every entry
+        evicted to make room; remove() and clear() do not call it.
+        """
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+
+        # one more bucket than entries keeps the load under the resize limit of put()
+        super().__init__(max_entries + 1, function, sizing=sizing)
+        self._list_type = LRUChain
+        self._max_entries = max_entries
+        self._max_weight = max_weight
+        self._weigher = weigher if weigher is not None or max_weight is None else default_weigher
+        self._on_evict = on_evict
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # rebuilds the buckets from LRUChains and empties the recency list
+        self.clear()
+
+    # ------------------------------------------------------------------ #
+
+    def _link_newest(self, node: LRUNode) -> None:
+        """
+        Input: node that is not in the recency list
+        Output: None
+        Method makes node the newest entry
+        """
+        node.older = self._newest
+        node.newer = None
+        if self._newest is None:
+            self._oldest = node
+        else:
+            self._newest.newer = node
+        self._newest = node
+
+    def _unlink(self, node: LRUNode) -> None:
+        """
+        Input: node in the recency list
+        Output: None
+        Method takes node out of the recency list
+        """
+        if node.newer is None:
+            self._newest = node.older
+        else:
+            node.newer.older = node.older
+        if node.older is None:
+            self._oldest = node.newer
+        else:
+            node.older.newer = node.newer
+        node.newer = node.older = None
+
+    def _touch(self, node: LRUNode) -> None:
+        """
+        Input: node in the recency list
+        Output: None
+        Method makes node the newest entry
+        """
+        if node is not self._newest:
+            self._unlink(node)
+            self._link_newest(node)
+
+    def _evict(self) -> None:
+        """
+        Evict oldest entries until the cache is within both of its limits
+        """
+        while self._size > self._max_entries or \
+                (self._max_weight is not None and self._weight > self._max_weight):
+            node = self._oldest
+            self._unlink(node)
+            self._remove_node(node)
+            self.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(node.key, node.value)
+
+    def _remove_node(self, node: LRUNode) -> None:
+        """
+        Input: node that has already been unlinked from the recency list
+        Output: None
+        Method removes node from its bucket and from the size and weight totals
+        """
+        list = self._buckets[node.hash % self._capacity]
+        list.remove(node.key, node.hash)
+        self._size -= 1
+        self._version += 1
+        self._weight -= node.weight
+        if list.length() == 0:
+            self._empty += 1
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the full hash of key
+        Output: None
+        Method adds or updates key as the newest entry, then evicts down to the limits
+        """
+        list = self._buckets[hash % self._capacity]
+        node = list.contains(key, hash)
+        if node is not None:
+            node.value = value
+            self._touch(node)
+        else:
+            if list.length() == 0:
+                self._empty -= 1
+            node = list.insert(key, value, hash)
+            self._size += 1
+            self._version += 1
+            if list.length() > self._max_chain:
+                self._max_chain = list.length()
+            self._link_newest(node)
+
+        if self._weigher is not None:
+            self._weight -= node.weight
+            node.weight = self._weigher(key, value)
+            self._weight += node.weight
+        self._evict()
+
+    def _move_node(self, node: LRUNode) -> None:
+        """
+        Input: node from another bucket array, with its hash cached
+        Output: None
+        Method moves the node's entry into the current buckets, keeping its place in the recency list
+        """
+        list = self._buckets[node.hash % self._capacity]
+        if list.length() == 0:
+            self._empty -= 1
+        moved = list.insert(node.key, node.value, node.hash)
+        if list.length() > self._max_chain:
+            self._max_chain = list.length()
+
+        # the new node takes the old one's place between the same neighbours
+        moved.weight = node.weight
+        moved.newer, moved.older = node.newer, node.older
+        if node.newer is None:
+            self._newest = moved
+        else:
+            node.newer.older = moved
+        if node.older is None:
+            self._oldest = moved
+        else:
+            node.older.newer = moved
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key and makes it the newest entry.
+        If key not in the cache, method returns None.
+        """
+        return self._get_hashed(key, self._hash_function(key))
+
+    def _get_hashed(self, key: str, hash: int) -> object:
+        """
+        Input: key and the full hash of key
+        Output: Value of key, or None (counted as a hit or a miss)
+        """
+        node = self._buckets[hash % self._capacity].contains(key, hash)
+        if node is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touch(node)
+        return node.value
+
+    def peek(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key, or None
+        Method returns the value of key without counting a hit or miss or changing recency
+        """
+        return hash_map_sc.HashMap.get(self, key)
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Input: key and the full hash of key
+        Output: True if key was removed, False if it was not in the cache
+        """
+        node = self._buckets[hash % self._capacity].contains(key, hash)
+        if node is None:
+            return False
+
+        self._unlink(node)
+        self._remove_node(node)
+        return True
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into the cache, in order, evicting as it goes
+        """
+        pairs = to_list(pairs)
+        hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+        for idx in range(len(pairs)):
+            self._put_hashed(pairs[idx][0], pairs[idx][1], hashes[idx])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the cache)
+        """
+        return_da = DynamicArray()
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            return_da.append(self._get_hashed(keys[idx], hashes[idx]))
+        return return_da
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method empties the cache. Counters are kept.
+        """
+        super().clear()
+        self._newest = None
+        self._oldest = None
+        self._weight = 0
+
+    def get_weight(self) -> int:
+        """
+        Return the total weight of the entries (0 without a weigher)
+        """
+        return self._weight
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics plus the cache counters
+        """
+        stats = super().stats()
+        stats.update({
+            'max_entries': self._max_entries,
+            'weight': self._weight,
+            'max_weight': self._max_weight,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        })
+        return stats
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA of (key, value) tuples from the newest entry to the oldest
+        """
+        return_da = DynamicArray()
+        node = self._newest
+        while node is not None:
+            return_da.append((node.key, node.value))
+            node = node.older
+        return return_da
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nmax_entries")
+    print("-----------")
+    evicted = []
+    cache = LRUCache(3, hash_function_2, on_evict=lambda key, value: evicted.append(key))
+    for key in ['a', 'b', 'c']:
+        cache.put(key, key.upper())
+    cache.get('a')
+    cache.put('d', 'D')
+    print(cache.get_keys_and_values(), evicted)
+    print(cache.get('b'), cache.get('c'), cache.hits, cache.misses, cache.evictions)
+
+    print("\nbyte budget")
+    print("-----------")
+    cache = LRUCache(100, hash_function_2, max_weight=10, weigher=lambda key, value: len(value))
+    for idx in range(6):
+        cache.put('k' + str(idx), 'x' * 3)
+    print(cache.get_keys_and_values(), cache.get_weight(), cache.evictions)
+
+    print("\nresize keeps recency")
+    print("--------------------")
+    cache = LRUCache(5, hash_function_1)
+    for idx in range(5):
+        cache.put(str(idx), idx)
+    cache.get('0')
+    cache.resize_table(53)
+    cache.put('5', 5)
+    print(cache.get_keys_and_values(), cache.get_capacity())
@@ -0,0 +1,527 @@
+"""
+Persistent open addressing HashMap whose slot array lives in a memory-mapped file.
+
+A map is two files:
+
+    path        index: a 64 byte header, then capacity fixed-width slots
+    path.heap   heap: append-only key and value bytes
+
+Each 32 byte slot holds the key's full hash, the heap offset of its record,
+the key and value lengths, and a state (empty, live or tombstone). A record
+is the UTF-8 key followed by the pickled value. Updating a key appends a new
+record and repoints its slot; the old record stays behind as garbage.
+
+Slots are probed exactly like hash_map_oa.HashMap (quadratic, or triangular
+in pow2 sizing), with the same load and tombstone rules. Opening an existing
+map only maps the index file, so it is O(1), and get/contains_key read only
+the slots they probe plus the record of a slot whose hash matches. Growing
+or compacting writes a new index file next to the old one from the stored
+hashes, without reading any key, and swaps it in with os.replace(); the heap
+is kept as it is.
+
+The hash function is stored in the header by name, so it must be one of
+a6_include.STABLE_HASH_FUNCTIONS, the registered functions that give the
+same hashes in every process ('builtin' is salted per process and is
+refused). Keys must be strings; values can be anything pickle can store.
+"""
+import mmap
+import os
+import pickle
+import struct
+
+import hash_map_oa
+from a6_include import (DynamicArray, HASH_FUNCTIONS, MASK_64, SIZINGS, STABLE_HASH_FUNCTIONS,
+                        get_hash_function, mixed, power_of_two, table_prime, to_list)
+
+MAGIC = b'A6OAMAP\x00'
+VERSION = 1
+
+# magic, version, sizing, capacity, size, tombstones, hash function name
+HEADER = struct.Struct('<8sHB5xQQQ24s')
+# hash, heap offset, key length, value length, state
+SLOT = struct.Struct('<QQIIB7x')
+# offset of the state byte within a slot
+STATE = 24
+
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+
+class MappedHashMap:
+    """
+    Open addressing HashMap stored in a memory-mapped index file and an append-only heap file
+    """
+
+    def __init__(self,
+                 path: str,
+                 capacity: int = 11,
+                 function: str = None,
+                 sizing: str = None,
+                 tombstone_threshold: float = 0.25) -> None:
+        """
+        Open the map stored at path, or create an empty one there.
+        For a new map, function (name in HASH_FUNCTIONS, default 'hash_function_1') and
+        sizing ('prime', 'table' or 'pow2', default 'prime') are as for hash_map_oa.HashMap.
+        An existing map keeps its own capacity, hash function and sizing; passing a different
+        function or sizing raises ValueError.
+        """
+        self._path = path
+        self._tombstone_threshold = tombstone_threshold
+
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                header = file.read(HEADER.size)
+            if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f'{path} is not a mapped hash map')
+            _, version, sizing_code, capacity, size, tombstones, name = HEADER.unpack(header)
+            if version != VERSION:
+                raise ValueError(f'{path} has format version {version}, expected {VERSION}')
+            name = name.rstrip(b'\x00').decode()
+            if name not in STABLE_HASH_FUNCTIONS:
+                raise ValueError(f'{path} uses hash function {name!r}, whose hashes differ between processes')
+            if function is not None and self._name_of(function) != name:
+                raise ValueError(f'{path} uses hash function {name!r}, not {function!r}')
+            if sizing is not None and sizing != SIZINGS[sizing_code]:
+                raise ValueError(f'{path} uses sizing {SIZINGS[sizing_code]!r}, not {sizing!r}')
+            self._setup(name, SIZINGS[sizing_code])
+            self._capacity, self._size, self._tombstones = capacity, size, tombstones
+        else:
+            self._setup(self._name_of(function or 'hash_function_1'), sizing or 'prime')
+            self._capacity = self._round_capacity(capacity)
+            self._size = self._tombstones = 0
+            self._create_index(path, self._capacity)
+
+        self._open_index()
+        self._heap = open(path + '.heap', 'r+b' if os.path.exists(path + '.heap') else 'w+b', buffering=0)
+
+    @staticmethod
+    def _name_of(function) -> str:
+        """
+        Return the STABLE_HASH_FUNCTIONS name of a hash function given by name or as a function
+        """
+        if not callable(function):
+            get_hash_function(function)
+            name = function
+        else:
+            name = None
+            for registered_name, registered in HASH_FUNCTIONS.items():
+                if registered is function:
+                    name = registered_name
+        if name not in STABLE_HASH_FUNCTIONS:
+            raise ValueError('a mapped hash map needs a hash function in STABLE_HASH_FUNCTIONS, '
+                             'whose hashes are the same in every process')
+        return name
+
+    @staticmethod
+    def _encode(key: str) -> bytes:
+        """
+        Return the UTF-8 bytes of key, lone surrogates included (as the hash functions encode it)
+        """
+        return key.encode('utf-8', 'surrogatepass')
+
+    def _setup(self, name: str, sizing: str) -> None:
+        """
+        Set the hash function and sizing fields
+        """
+        if sizing not in SIZINGS:
+            raise ValueError(f"unknown sizing {sizing!r}, expected one of {', '.join(SIZINGS)}")
+        self._hash_name = name
+        self._sizing = sizing
+        self._probe_stride = 1 if sizing == 'pow2' else 2
+        self._hash_function = get_hash_function(name)
+        if sizing == 'pow2':
+            self._hash_function = mixed(self._hash_function)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Return the capacity the table uses for a requested capacity, according to its sizing
+        """
+        if self._sizing == 'table':
+            return table_prime(capacity)
+        if self._sizing == 'pow2':
+            return power_of_two(capacity)
+        if capacity % 2 == 0 and capacity != 2:
+            capacity += 1
+        while not hash_map_oa.HashMap._is_prime(capacity):
+            capacity += 2
+        return capacity
+
+    def _hash(self, key: str) -> int:
+        """
+        Return the hash of key as stored in a slot (64 bits)
+        """
+        return self._hash_function(key) & MASK_64
+
+    # ------------------------------------------------------------------ #
+
+    def _create_index(self, path: str, capacity: int) -> None:
+        """
+        Write an index file of capacity empty slots (a sparse file: all zero bytes)
+        """
+        with open(path, 'wb') as file:
+            file.truncate(HEADER.size + capacity * SLOT.size)
+
+    def _open_index(self) -> None:
+        """
+        Map the index file and write the current header into it
+        """
+        self._file = open(self._path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._write_header()
+
+    def _close_index(self) -> None:
+        """
+        Unmap and close the index file
+        """
+        self._mm.close()
+        self._file.close()
+
+    def _write_header(self) -> None:
+        """
+        Store capacity, size and tombstone count in the header
+        """
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, SIZINGS.index(self._sizing), self._capacity,
+                         self._size, self._tombstones, self._hash_name.encode())
+
+    def _read(self, offset: int, length: int) -> bytes:
+        """
+        Return length bytes of the heap starting at offset
+        """
+        self._heap.seek(offset)
+        return self._heap.read(length)
+
+    def _append(self, key: bytes, value: bytes) -> int:
+        """
+        Append a record to the heap and return its offset
+        """
+        offset = self._heap.seek(0, os.SEEK_END)
+        self._heap.write(key + value)
+        return offset
+
+    def _probe(self, key: bytes, hash: int) -> (int, int):
+        """
+        Input: encoded key and its hash
+        Output: (slot of key or -1, slot a new entry for key would take)
+        Method walks the probe sequence up to key or an empty slot, like HashMap._put_hashed.
+        The new entry slot is the first tombstone passed, otherwise the empty slot.
+        """
+        mm, unpack_from, base, size = self._mm, SLOT.unpack_from, HEADER.size, SLOT.size
+        capacity, stride = self._capacity, self._probe_stride
+        attempt_idx = hash % capacity
+        tombstone_idx = -1
+        step = 1
+        while True:
+            slot_hash, offset, key_length, _, state = unpack_from(mm, base + attempt_idx * size)
+            if state == EMPTY:
+                return -1, (attempt_idx if tombstone_idx == -1 else tombstone_idx)
+            if state == TOMBSTONE:
+                if tombstone_idx == -1:
+                    tombstone_idx = attempt_idx
+            # hashes and lengths are compared before the key is read from the heap
+            elif slot_hash == hash and key_length == len(key) and self._read(offset, key_length) == key:
+                return attempt_idx, attempt_idx
+            attempt_idx = (attempt_idx + step) % capacity
+            step += stride
+
+    # ------------------------------------------------------------------ #
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstone slots in map
+        """
+        return self._tombstones
+
+    def table_load(self) -> float:
+        """
+        Return the current hashtable load factor as a float
+        """
+        return self._size / self._capacity
+
+    def occupancy(self) -> float:
+        """
+        Return the fraction of slots that are not empty (live entries plus tombstones)
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Return number of slots without a live entry (tombstones count as empty)
+        """
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics plus the file sizes
+        """
+        return {
+            'capacity': self._capacity,
+            'live_entries': self._size,
+            'tombstones': self._tombstones,
+            'empty_buckets': self._capacity - self._size,
+            'table_load': self.table_load(),
+            'occupancy': self.occupancy(),
+            'index_bytes': len(self._mm),
+            'heap_bytes': self._heap.seek(0, os.SEEK_END),
+        }
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Input: Key (string) to be the "key" of our hashmap item, and value (object) to be the value
+        Output: None
+        Method updates the key/value pair in hashmap. If key already in hashmap, associate value will be replaced.
+        If not in hashmap, key/value pair will be added.
+        """
+        # the same load and tombstone rules as HashMap.put
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+        elif self.occupancy() >= 0.5:
+            self.compact()
+
+        hash = self._hash(key)
+        key_bytes = self._encode(key)
+        value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        found_idx, attempt_idx = self._probe(key_bytes, hash)
+
+        # the record is in the heap before any slot points at it
+        offset = self._append(key_bytes, value_bytes)
+        if found_idx == -1:
+            if SLOT.unpack_from(self._mm, HEADER.size + attempt_idx * SLOT.size)[4] == TOMBSTONE:
+                self._tombstones -= 1
+            self._size += 1
+        SLOT.pack_into(self._mm, HEADER.size + attempt_idx * SLOT.size,
+                       hash, offset, len(key_bytes), len(value_bytes), LIVE)
+        self._write_header()
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key
+        Method returns value associated with given key. If key not in hash map, method returns None.
+        """
+        if self._size == 0:
+            return None
+
+        key_bytes = self._encode(key)
+        found_idx, _ = self._probe(key_bytes, self._hash(key))
+        if found_idx == -1:
+            return None
+        _, offset, key_length, value_length, _ = SLOT.unpack_from(self._mm, HEADER.size + found_idx * SLOT.size)
+        return pickle.loads(self._read(offset + key_length, value_length))
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool (True/False if value exists)
+        Method returns True if given key is in the hashmap. Otherwise, returns false.
+        """
+        if self._size == 0:
+            return False
+
+        return self._probe(self._encode(key), self._hash(key))[0] != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        Method turns the key's slot into a tombstone, compacting the index once there are too many.
+        If key isn't in hashmap, method does nothing. The key's record stays in the heap.
+        """
+        found_idx, _ = self._probe(self._encode(key), self._hash(key))
+        if found_idx == -1:
+            return
+
+        # only the state byte changes
+        self._mm[HEADER.size + found_idx * SLOT.size + STATE] = TOMBSTONE
+        self._size -= 1
+        self._tombstones += 1
+        self._write_header()
+
+        if self._tombstone_threshold is not None and self._tombstones > self._tombstone_threshold * self._capacity:
+            self.compact()
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method grows the index once for all of the new keys, then puts every pair in order
+        """
+        pairs = to_list(pairs)
+        needed = self._size + len(pairs)
+        if needed and (needed - 1) / self._capacity >= 0.5:
+            self.resize_table(2 * (needed - 1) + 1)
+        for key, value in pairs:
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        return_da = DynamicArray()
+        for key in to_list(keys):
+            return_da.append(self.get(key))
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from the map. Keys not in the map are ignored.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    # ------------------------------------------------------------------ #
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Input: integer for new capacity
+        Output: None
+        Method rebuilds the index with new_capacity slots (rounded like HashMap.resize_table)
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        self._rebuild(new_capacity)
+
+    def compact(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method rebuilds the index at its current capacity, dropping every tombstone
+        """
+        self._rebuild(self._capacity)
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Input: capacity of the new index (already rounded and big enough)
+        Output: None
+        Method writes a new index file holding the live slots, placed by their stored hashes,
+        then swaps it in for the current one
+        """
+        new_path = self._path + '.tmp'
+        self._create_index(new_path, new_capacity)
+
+        mm, base, size, stride = self._mm, HEADER.size, SLOT.size, self._probe_stride
+        with open(new_path, 'r+b') as file, mmap.mmap(file.fileno(), 0) as new_mm:
+            for idx in range(self._capacity):
+                record = mm[base + idx * size:base + (idx + 1) * size]
+                if record[STATE] != LIVE:
+                    continue
+                # the first empty slot of the probe sequence, as in HashMap._place
+                attempt_idx = SLOT.unpack(record)[0] % new_capacity
+                step = 1
+                while new_mm[base + attempt_idx * size + STATE] != EMPTY:
+                    attempt_idx = (attempt_idx + step) % new_capacity
+                    step += stride
+                new_mm[base + attempt_idx * size:base + (attempt_idx + 1) * size] = record
+
+            self._capacity, self._tombstones = new_capacity, 0
+            HEADER.pack_into(new_mm, 0, MAGIC, VERSION, SIZINGS.index(self._sizing), self._capacity,
+                             self._size, self._tombstones, self._hash_name.encode())
+            new_mm.flush()
+
+        self._close_index()
+        os.replace(new_path, self._path)
+        self._open_index()
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method empties the index and the heap. Does not change the capacity.
+        """
+        self._close_index()
+        self._size = self._tombstones = 0
+        self._create_index(self._path, self._capacity)
+        self._heap.truncate(0)
+        self._open_index()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA of (key, value) tuples, in slot order
+        """
+        return_da = DynamicArray()
+        for idx in range(self._capacity):
+            _, offset, key_length, value_length, state = SLOT.unpack_from(self._mm, HEADER.size + idx * SLOT.size)
+            if state == LIVE:
+                record = self._read(offset, key_length + value_length)
+                key = record[:key_length].decode('utf-8', 'surrogatepass')
+                return_da.append((key, pickle.loads(record[key_length:])))
+        return return_da
+
+    # ------------------------------------------------------------------ #
+
+    def flush(self) -> None:
+        """
+        Write the index and heap through to disk
+        """
+        self._mm.flush()
+        os.fsync(self._heap.fileno())
+
+    def close(self) -> None:
+        """
+        Flush and close both files. The map can be opened again from its path.
+        """
+        if self._heap.closed:
+            return
+        self.flush()
+        self._close_index()
+        self._heap.close()
+
+    def __enter__(self) -> 'MappedHashMap':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'example.map')
+
+    print("\ncreate, fill and close")
+    print("----------------------")
+    with MappedHashMap(path, 11, 'hash_function_2') as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+            if i % 25 == 24:
+                print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+        m.put('str7', {'updated': True})
+        m.remove('str8')
+
+    print("\nreopen")
+    print("------")
+    with MappedHashMap(path) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str7'), m.get('str8'), m.contains_key('str149'))
+        for i in range(0, 150, 2):
+            m.remove('str' + str(i))
+        print(m.get_size(), m.get_tombstones(), m.get_capacity(), m.get('str149'))
+        print(m.stats())
+        m.clear()
+        print(m.get_size(), m.get('str149'), m.stats()['heap_bytes'])
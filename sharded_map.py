@@ -0,0 +1,316 @@
+"""
+Process-sharded HashMap for bulk ingestion on several cores.
+
+ShardedHashMap starts K worker processes, each owning one OA or SC HashMap
+shard, and routes every key to shard hash(key) % K. The bulk methods split
+a batch by shard, send each shard its part over a pipe, and only then wait
+for the replies, so the shards do their puts and gets in parallel while the
+parent does nothing but partition and pickle.
+
+    with ShardedHashMap(shards=8, map_type='oa', function='fnv1a') as sharded:
+        for batch in batches:
+            sharded.put_many(batch)
+        m = sharded.merge()
+
+merge() gathers every shard back into a single in-process map. The shards
+send their entries with the full hashes they already computed, and merging
+reuses them when they are the hashes this process would compute: the hash
+function is in a6_include.STABLE_HASH_FUNCTIONS, or the workers were forked
+from this process. Otherwise (e.g. 'builtin', salted per process, with the
+spawn or forkserver start method) merge() hashes every key again. Pass the
+hash function by name (or as a module-level function) so it can be sent to
+the workers however they are started.
+"""
+import multiprocessing
+import os
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, is_stable_hash_function, to_list, hash_function_1
+
+MAP_TYPES = {
+    'oa': hash_map_oa.HashMap,
+    'sc': hash_map_sc.HashMap,
+}
+
+
+def _serve(conn, map_type: str, capacity: int, function, sizing: str) -> None:
+    """
+    Worker process: own one shard and answer (command, payload) requests on conn
+    until 'close'. Each reply is ('ok', result) or ('error', exception).
+    """
+    m = MAP_TYPES[map_type](capacity, function, sizing=sizing)
+    while True:
+        command, payload = conn.recv()
+        try:
+            if command == 'close':
+                conn.send(('ok', None))
+                break
+            if command == 'put_many':
+                m.put_many(payload)
+                result = None
+            elif command == 'get_many':
+                result = to_list(m.get_many(payload))
+            elif command == 'remove_many':
+                m.remove_many(payload)
+                result = None
+            elif command == 'size':
+                result = m.get_size()
+            elif command == 'entries':
+                result = _entries(m)
+            elif command == 'clear':
+                m.clear()
+                result = None
+            else:
+                raise ValueError(f'unknown command {command!r}')
+        except Exception as error:
+            conn.send(('error', error))
+        else:
+            conn.send(('ok', result))
+    conn.close()
+
+
+def _entries(m) -> list:
+    """
+    Return the (key, value, hash) of every entry of an OA or SC map, in table order
+    """
+    return [(entry.key, entry.value, entry.hash) for entry in m._live_entries()]
+
+
+class ShardedHashMap:
+    """
+    HashMap facade partitioning its keys across worker processes
+    """
+
+    def __init__(self,
+                 shards: int = None,
+                 map_type: str = 'oa',
+                 function=hash_function_1,
+                 capacity: int = 11,
+                 sizing: str = 'prime',
+                 start_method: str = None) -> None:
+        """
+        Start shards worker processes (default: one per CPU), each owning an empty
+        map_type ('oa' or 'sc') HashMap(capacity, function, sizing=sizing).
+        start_method picks the multiprocessing start method (default: the platform's).
+        """
+        if map_type not in MAP_TYPES:
+            raise ValueError(f"unknown map type {map_type!r}, expected one of {', '.join(MAP_TYPES)}")
+        shards = shards or os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+
+        self._map_type = map_type
+        self._function = function
+        self._sizing = sizing
+        self._capacity = capacity
+        self._shards = shards
+
+        context = multiprocessing.get_context(start_method)
+        # forked workers share this process's hash salt, so even 'builtin' hashes match
+        self._same_hashes = is_stable_hash_function(function) or context.get_start_method() == 'fork'
+        self._conns = []
+        self._processes = []
+        for _ in range(shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_serve, daemon=True,
+                                      args=(child_conn, map_type, capacity, function, sizing))
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self) -> 'ShardedHashMap':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _shard(self, key: str) -> int:
+        """
+        Return the shard that owns key
+        """
+        # routing only happens in this process, so the built-in (per-process salted) hash is fine
+        return hash(key) % self._shards
+
+    def _ask(self, requests: dict) -> dict:
+        """
+        Input: dict of shard -> (command, payload)
+        Output: dict of shard -> result
+        Method sends every request before waiting for any reply, so the shards work in parallel.
+        The first error reported by a shard is raised once all replies are in.
+        """
+        if not self._conns:
+            raise ValueError('sharded map is closed')
+        for shard, request in requests.items():
+            self._conns[shard].send(request)
+
+        results, error = {}, None
+        for shard in requests:
+            status, result = self._conns[shard].recv()
+            if status == 'error':
+                error = error or result
+            results[shard] = result
+        if error is not None:
+            raise error
+        return results
+
+    def _ask_all(self, command: str) -> list:
+        """
+        Send command (with no payload) to every shard; return the results in shard order
+        """
+        results = self._ask({shard: (command, None) for shard in range(self._shards)})
+        return [results[shard] for shard in range(self._shards)]
+
+    # ------------------------------------------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs
+        Output: None
+        Method puts every pair into its shard. Pairs for the same key keep their order, so
+        the last value wins. Feed very large inputs in batches (e.g. 100k pairs) to bound memory.
+        """
+        parts = [[] for _ in range(self._shards)]
+        for pair in to_list(pairs):
+            parts[self._shard(pair[0])].append(pair)
+        self._ask({shard: ('put_many', part) for shard, part in enumerate(parts) if part})
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for keys not in the map)
+        """
+        keys = to_list(keys)
+        parts = [[] for _ in range(self._shards)]
+        positions = [[] for _ in range(self._shards)]
+        for idx, key in enumerate(keys):
+            shard = self._shard(key)
+            parts[shard].append(key)
+            positions[shard].append(idx)
+
+        values = [None] * len(keys)
+        results = self._ask({shard: ('get_many', part) for shard, part in enumerate(parts) if part})
+        for shard, result in results.items():
+            for idx, value in zip(positions[shard], result):
+                values[idx] = value
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        Method removes every given key from its shard. Keys not in the map are ignored.
+        """
+        parts = [[] for _ in range(self._shards)]
+        for key in to_list(keys):
+            parts[self._shard(key)].append(key)
+        self._ask({shard: ('remove_many', part) for shard, part in enumerate(parts) if part})
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Add or update key (one round trip; use put_many for anything in bulk)
+        """
+        self._ask({self._shard(key): ('put_many', [(key, value)])})
+
+    def get(self, key: str) -> object:
+        """
+        Return the value of key, or None (one round trip; use get_many for anything in bulk)
+        """
+        shard = self._shard(key)
+        return self._ask({shard: ('get_many', [key])})[shard][0]
+
+    def remove(self, key: str) -> None:
+        """
+        Remove key if it is in the map
+        """
+        self._ask({self._shard(key): ('remove_many', [key])})
+
+    def get_size(self) -> int:
+        """
+        Return the number of entries over all shards
+        """
+        return sum(self._ask_all('size'))
+
+    def shard_sizes(self) -> list:
+        """
+        Return the number of entries in each shard
+        """
+        return self._ask_all('size')
+
+    def clear(self) -> None:
+        """
+        Empty every shard
+        """
+        self._ask_all('clear')
+
+    # ------------------------------------------------------------------ #
+
+    def merge(self, map_type: str = None):
+        """
+        Input: map type of the result ('oa' or 'sc', default: the shards' type)
+        Output: new in-process HashMap holding every entry of every shard
+        Method sizes the result once for all entries and inserts them with the hashes
+        the shards computed, so no key is hashed again, unless those hashes can differ
+        from this process's (see the module docstring). The shards keep their entries.
+        """
+        map_type = map_type or self._map_type
+        m = MAP_TYPES[map_type](self._capacity, self._function, sizing=self._sizing)
+        parts = self._ask_all('entries')
+        total = sum(len(part) for part in parts)
+
+        # the same capacity put_many would pick, so no _put_hashed call trips a resize
+        if total:
+            m.resize_table(2 * total if map_type == 'oa' else total + 1)
+        hash_function = m._hash_function
+        for part in parts:
+            for key, value, hash in part:
+                m._put_hashed(key, value, hash if self._same_hashes else hash_function(key))
+        return m
+
+    def close(self) -> None:
+        """
+        Stop the worker processes. The shards' entries are lost; merge() first to keep them.
+        """
+        if not self._conns:
+            return
+        try:
+            self._ask_all('close')
+        finally:
+            for conn in self._conns:
+                conn.close()
+            for process in self._processes:
+                process.join()
+            self._conns, self._processes = [], []
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import time
+
+    print("\nput_many / get_many / merge")
+    print("---------------------------")
+    with ShardedHashMap(shards=4, map_type='sc', function='hash_function_2') as sharded:
+        sharded.put_many(('key' + str(i), i) for i in range(1000))
+        sharded.remove_many('key' + str(i) for i in range(0, 1000, 2))
+        print(sharded.get_size(), sharded.shard_sizes())
+        print(sharded.get_many(['key1', 'key2', 'key999', 'nope']))
+        m = sharded.merge('oa')
+        print(m.get_size(), m.get('key501'), m.contains_key('key500'), m.table_load())
+
+    print("\nscaling, 400000 records")
+    print("-----------------------")
+    records = [('key' + str(i), i) for i in range(400000)]
+    start = time.perf_counter()
+    single = hash_map_oa.HashMap(11, 'fnv1a')
+    single.put_many(records)
+    print(f"{'in-process':<12}{time.perf_counter() - start:8.2f}s")
+    for shards in (2, 4, 8):
+        with ShardedHashMap(shards=shards, map_type='oa', function='fnv1a') as sharded:
+            start = time.perf_counter()
+            for idx in range(0, len(records), 100000):
+                sharded.put_many(records[idx:idx + 100000])
+            sharded.get_size()
+            print(f"{str(shards) + ' shards':<12}{time.perf_counter() - start:8.2f}s")
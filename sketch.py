@@ -0,0 +1,394 @@
+"""
+Approximate frequency counting in fixed memory, for streams with too many
+distinct keys to count exactly (find_mode keeps every key in a HashMap).
+
+CountMinSketch: a depth x width matrix of counters. Each key adds its count
+to one counter per row; its estimate is the smallest of those counters, which
+is never too low and, with probability 1 - delta, at most epsilon * total too
+high. Rows are indexed with murmur3: two hashes of the key under the sketch's
+seed give every row its own index ((h1 + row * h2) % width), so a key costs
+two hash calls whatever the depth.
+
+SpaceSaving: keeps `counters` keys with their counts in a hash_map_sc.HashMap.
+A key not yet monitored, arriving when every counter is taken, replaces the
+key with the smallest count and inherits that count as its error. Counts are
+never too low and at most total / counters too high, so every key occurring
+more than total / counters times is monitored.
+
+Both can be merged, e.g. sketches built by worker processes (both pickle),
+and the result has the same guarantees for the combined stream.
+
+    summary = SpaceSaving(1000)
+    summary.update(line.split()[0] for line in log)
+    summary.top(10)
+"""
+import heapq
+from array import array
+from math import ceil, e, exp, log
+
+from a6_include import DynamicArray, murmur_hash, np, to_list
+from hash_map_sc import HashMap
+
+# seed offset for the second hash of a key in CountMinSketch
+SECOND_SEED = 0x9747B28C
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch over an array('Q') counter matrix (row-major, depth rows of width counters)
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01,
+                 width: int = None, depth: int = None, seed: int = 0) -> None:
+        """
+        Initialize an empty sketch whose estimates are at most epsilon * total too high with
+        probability 1 - delta: width = ceil(e / epsilon), depth = ceil(ln(1 / delta)).
+        width and depth can be given directly instead. Sketches can only be merged with sketches
+        of the same width, depth and seed.
+        """
+        self._width = width if width is not None else ceil(e / epsilon)
+        self._depth = depth if depth is not None else ceil(log(1 / delta))
+        if self._width < 1 or self._depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        self._seed = seed
+        self._counts = array('Q', bytes(8 * self._width * self._depth))
+        self._total = 0
+
+    def _indexes(self, key: str) -> list:
+        """
+        Return the counter index of key in each row
+        """
+        width = self._width
+        h1 = murmur_hash(key, self._seed)
+        # odd, so the rows of one key never share a column unless width shares a factor with it
+        h2 = murmur_hash(key, self._seed ^ SECOND_SEED) | 1
+        return [row * width + (h1 + row * h2) % width for row in range(self._depth)]
+
+    def get_width(self) -> int:
+        """
+        Return counters per row
+        """
+        return self._width
+
+    def get_depth(self) -> int:
+        """
+        Return number of rows
+        """
+        return self._depth
+
+    def get_total(self) -> int:
+        """
+        Return the sum of all counts added
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: str, count: int = 1) -> None:
+        """
+        Input: key and a non-negative count
+        Output: None
+        Method adds count to key's counter in every row
+        """
+        counts = self._counts
+        for idx in self._indexes(key):
+            counts[idx] += count
+        self._total += count
+
+    def update(self, iterable) -> None:
+        """
+        Input: any iterable of keys (consumed as a stream) or DynamicArray
+        Output: None
+        Method adds 1 for every key
+        """
+        counts, indexes = self._counts, self._indexes
+        if isinstance(iterable, DynamicArray):
+            iterable = to_list(iterable)
+        total = 0
+        for key in iterable:
+            for idx in indexes(key):
+                counts[idx] += 1
+            total += 1
+        self._total += total
+
+    def estimate(self, key: str) -> int:
+        """
+        Input: key
+        Output: estimated count of key; never below the true count
+        """
+        counts = self._counts
+        return min(counts[idx] for idx in self._indexes(key))
+
+    def error_bound(self) -> (int, float):
+        """
+        Input: None
+        Output: Tuple(int, float): how far an estimate can be above the true count, and the
+        probability that it is no further off than that
+        """
+        return ceil(e / self._width * self._total), 1 - exp(-self._depth)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """
+        Input: sketch with the same width, depth and seed
+        Output: None
+        Method adds the other sketch's counters to this one's, as if its keys had been added here
+        """
+        if (other._width, other._depth, other._seed) != (self._width, self._depth, self._seed):
+            raise ValueError("sketches differ in width, depth or seed")
+
+        if np is not None:
+            # both arrays viewed in place, no copies
+            counts = np.frombuffer(self._counts, dtype=np.uint64)
+            counts += np.frombuffer(other._counts, dtype=np.uint64)
+        else:
+            counts, other_counts = self._counts, other._counts
+            for idx in range(len(counts)):
+                counts[idx] += other_counts[idx]
+        self._total += other._total
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary, monitoring at most `counters` keys in a HashMap
+    """
+
+    def __init__(self, counters: int = 1000, function='fnv1a') -> None:
+        """
+        Initialize an empty summary. Counts are at most total / counters too high.
+        function is the hash function (or registered name) of the map holding the monitored keys.
+        """
+        if counters < 1:
+            raise ValueError("counters must be at least 1")
+        self._counters = counters
+        self._function = function
+        # capacity of at least counters keeps the map under the load limit, so it never resizes
+        self._monitored = HashMap(counters, function)
+        # (count, key) for every monitored key; a count here can be behind the key's real count
+        self._heap = []
+        self._total = 0
+
+    def __getstate__(self) -> tuple:
+        """
+        Pickle as the settings and the monitored entries, not the map structure
+        """
+        return self._counters, self._function, self._total, self.entries()
+
+    def __setstate__(self, state: tuple) -> None:
+        counters, function, total, entries = state
+        self.__init__(counters, function)
+        self._load(entries)
+        self._total = total
+
+    def _load(self, entries: list) -> None:
+        """
+        Monitor the given (key, count, error) entries, at most `counters` of them
+        """
+        for key, count, error in entries:
+            self._monitored.put(key, [count, error])
+            self._heap.append((count, key))
+        heapq.heapify(self._heap)
+
+    def _pop_smallest(self) -> (str, list):
+        """
+        Input: None
+        Output: monitored key with the smallest count, and its [count, error] entry, taken off the heap
+        """
+        heap, monitored = self._heap, self._monitored
+        while True:
+            count, key = heapq.heappop(heap)
+            entry = monitored.get(key)
+            if entry[0] == count:
+                return key, entry
+            # the count went up since this heap entry was made: put it back with the real count
+            heapq.heappush(heap, (entry[0], key))
+
+    def _min_count(self) -> int:
+        """
+        Return the count an unmonitored key can have at most: the smallest monitored count
+        once every counter is taken, otherwise 0
+        """
+        if self._monitored.get_size() < self._counters:
+            return 0
+        key, entry = self._pop_smallest()
+        heapq.heappush(self._heap, (entry[0], key))
+        return entry[0]
+
+    def get_total(self) -> int:
+        """
+        Return the sum of all counts added
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: str, count: int = 1) -> None:
+        """
+        Input: key and a positive count
+        Output: None
+        Method adds count to key if it is monitored, else monitors it, replacing the key
+        with the smallest count if every counter is taken
+        """
+        self._total += count
+        monitored = self._monitored
+        entry = monitored.get(key)
+        if entry is not None:
+            entry[0] += count
+            return
+
+        if monitored.get_size() < self._counters:
+            monitored.put(key, [count, 0])
+            heapq.heappush(self._heap, (count, key))
+            return
+
+        victim, smallest = self._pop_smallest()
+        monitored.remove(victim)
+        monitored.put(key, [smallest[0] + count, smallest[0]])
+        heapq.heappush(self._heap, (smallest[0] + count, key))
+
+    def update(self, iterable) -> None:
+        """
+        Input: any iterable of keys (consumed as a stream) or DynamicArray
+        Output: None
+        Method adds 1 for every key
+        """
+        if isinstance(iterable, DynamicArray):
+            iterable = to_list(iterable)
+        add = self.add
+        for key in iterable:
+            add(key)
+
+    def estimate(self, key: str) -> (int, int):
+        """
+        Input: key
+        Output: Tuple(int, int): upper bound of key's count and how far it can be above the true count.
+        An unmonitored key can have occurred at most as often as the smallest monitored count.
+        """
+        entry = self._monitored.get(key)
+        if entry is None:
+            smallest = self._min_count()
+            return smallest, smallest
+        return entry[0], entry[1]
+
+    def entries(self) -> list:
+        """
+        Return a list of (key, count, error) for every monitored key, highest count first
+        """
+        content = self._monitored.get_keys_and_values()
+        entries = [(content[idx][0], content[idx][1][0], content[idx][1][1]) for idx in range(content.length())]
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        return entries
+
+    def top(self, k: int = None) -> DynamicArray:
+        """
+        Input: number of keys wanted (all monitored keys if None)
+        Output: DynamicArray of (key, count, error) tuples, highest count first. A key whose
+        count - error is at least the next key's count is certainly ranked correctly.
+        """
+        return DynamicArray(self.entries()[:k])
+
+    def error_bound(self) -> int:
+        """
+        Return how far any count can be above the true count: total / counters
+        """
+        return self._total // self._counters
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Input: another summary
+        Output: None
+        Method combines the two summaries into this one. A key missing from one summary is
+        counted there as that summary's smallest count (the most it can have occurred), so
+        counts stay upper bounds; the `counters` highest combined counts are kept.
+        """
+        floor, other_floor = self._min_count(), other._min_count()
+        mine, theirs = self.entries(), other.entries()
+        combined = HashMap(len(mine) + len(theirs), self._function)
+        for key, count, error in mine:
+            combined.put(key, [count + other_floor, error + other_floor])
+        for key, count, error in theirs:
+            entry = combined.get(key)
+            if entry is None:
+                combined.put(key, [count + floor, error + floor])
+            else:
+                # both saw it: replace the assumed other_floor with the real count
+                entry[0] += count - other_floor
+                entry[1] += error - other_floor
+
+        content = combined.get_keys_and_values()
+        entries = [(content[idx][0], content[idx][1][0], content[idx][1][1]) for idx in range(content.length())]
+        entries = heapq.nlargest(self._counters, entries, key=lambda entry: entry[1])
+
+        total = self._total + other._total
+        self.__init__(self._counters, self._function)
+        self._load(entries)
+        self._total = total
+
+
+def find_mode_approx(iterable, counters: int = 1000, function='fnv1a') -> (DynamicArray, int):
+    """
+    Input: any iterable of keys (consumed as a stream) or DynamicArray, number of counters
+    Output: Tuple(DA, int) like hash_map_sc.find_mode: the key(s) with the highest count, and that count.
+    Uses a SpaceSaving summary, so memory stays fixed; the count can be up to total / counters too high,
+    and any key occurring more than total / counters times is found.
+    """
+    summary = SpaceSaving(counters, function)
+    summary.update(iterable)
+
+    return_da = DynamicArray()
+    entries = summary.entries()
+    if not entries:
+        return return_da, 0
+    for key, count, error in entries:
+        if count != entries[0][1]:
+            break
+        return_da.append(key)
+    return return_da, entries[0][1]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import pickle
+    import random
+
+    random.seed(7)
+    words = ['w' + str(int(random.paretovariate(1.1))) for _ in range(100000)]
+    exact = {}
+    for word in words:
+        exact[word] = exact.get(word, 0) + 1
+    print("distinct:", len(exact), "top:", sorted(exact.items(), key=lambda pair: -pair[1])[:3])
+
+    print("\nCountMinSketch")
+    print("--------------")
+    sketch = CountMinSketch(epsilon=0.001, delta=0.01)
+    sketch.update(words)
+    print(sketch.get_width(), sketch.get_depth(), sketch.error_bound())
+    print([(word, exact[word], sketch.estimate(word)) for word in ('w1', 'w2', 'w50')])
+
+    # two halves counted separately (e.g. in two processes), then merged
+    left, right = CountMinSketch(0.001, 0.01), CountMinSketch(0.001, 0.01)
+    left.update(words[:50000])
+    right.update(words[50000:])
+    left = pickle.loads(pickle.dumps(left))
+    left.merge(right)
+    print(left.get_total(), all(left.estimate(word) == sketch.estimate(word) for word in exact))
+
+    print("\nSpaceSaving")
+    print("-----------")
+    summary = SpaceSaving(100)
+    summary.update(words)
+    print(summary.error_bound(), summary.top(3), summary.estimate('w50'))
+
+    left, right = SpaceSaving(100), SpaceSaving(100)
+    left.update(words[:50000])
+    right.update(words[50000:])
+    left = pickle.loads(pickle.dumps(left))
+    left.merge(right)
+    print(left.get_total(), left.error_bound(), left.top(3))
+
+    print("\nfind_mode_approx")
+    print("----------------")
+    mode, frequency = find_mode_approx(iter(words), 100)
+    print(f"Mode : {mode}, Frequency: {frequency}")
+    mode, frequency = find_mode_approx(DynamicArray(["a", "b", "a", "c", "b"]), 3)
+    print(f"Mode : {mode}, Frequency: {frequency}")
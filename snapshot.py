@@ -0,0 +1,364 @@
+"""
+Binary snapshots of the OA and SC HashMaps.
+
+    snapshot.dump(m, 'index.snap', compress=True)
+    m = snapshot.load('index.snap')
+
+A snapshot records the table itself, not just its pairs: capacity, sizing,
+hash function name, the state of every OA slot (empty, live or tombstone) or
+the length of every SC chain, and the cached hash of every entry. load()
+puts each entry straight back into its slot or chain, so it never calls the
+hash function, put() or resize_table(), and the loaded map has the same
+layout (probe sequences, tombstones, chain order) as the dumped one.
+
+File layout (little-endian):
+
+    header   80 bytes, see HEADER; flags say whether the body is compressed
+             (zlib) and whether crc is its CRC-32
+    body     OA: capacity state bytes      SC: capacity uint32 chain lengths
+             padding to a multiple of 8
+             one int64/uint64 hash per entry, in table order
+             per entry: uint32 length + pickled key, uint32 length + pickled value
+
+An uncompressed body is read through mmap and memoryview slices, so only
+the unpickling copies anything; the mapping is closed before load() returns
+or raises. Hashes have to mean the same thing when the file is loaded as
+when it was dumped, so the hash function must be one of
+a6_include.STABLE_HASH_FUNCTIONS ('builtin' hashes change between runs
+unless PYTHONHASHSEED is fixed, and are refused), and load() also checks
+one entry against it.
+"""
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, HASH_FUNCTIONS, SIZINGS, STABLE_HASH_FUNCTIONS
+
+MAGIC = b'A6SNAP\x00\x00'
+VERSION = 1
+
+# magic, version, map type, sizing, flags, slotted, hash typecode, capacity, size, crc, body length,
+# longest probe (OA) or chain (SC), tombstone threshold (NaN for None),
+# migration budget (IncrementalHashMaps, 0 otherwise), hash function name
+HEADER = struct.Struct('<8sHBBBBcxQQIIQdI4x16s')
+
+COMPRESSED = 1
+CHECKSUM = 2
+
+# map classes dump() accepts, by the type code stored in the header
+MAP_TYPES = {
+    0: hash_map_oa.HashMap,
+    1: hash_map_sc.HashMap,
+    2: hash_map_oa.IncrementalHashMap,
+    3: hash_map_sc.IncrementalHashMap,
+}
+
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+LENGTH = struct.Struct('<I')
+
+
+def _hash_name(m) -> str:
+    """
+    Return the STABLE_HASH_FUNCTIONS name of m's hash function (ValueError if it has none)
+    """
+    function = getattr(m._hash_function, 'unmixed', m._hash_function)
+    for name in STABLE_HASH_FUNCTIONS:
+        if HASH_FUNCTIONS[name] is function:
+            return name
+    raise ValueError('only maps using a hash function in STABLE_HASH_FUNCTIONS, whose hashes are '
+                     'the same in every process, can be dumped')
+
+
+def _hash_typecode(hashes: list) -> bytes:
+    """
+    Return the struct/array typecode the hashes are stored with: 'Q' if they all fit
+    64 unsigned bits, 'q' if they fit 64 signed bits (some are negative)
+    """
+    if not hashes or (min(hashes) >= 0 and max(hashes) < 1 << 64):
+        return b'Q'
+    if min(hashes) >= -(1 << 63) and max(hashes) < 1 << 63:
+        return b'q'
+    raise ValueError('hashes do not fit in 64 bits')
+
+
+def _entries(m) -> (bytes, list):
+    """
+    Input: OA or SC map
+    Output: the per-slot states (OA) or chain lengths (SC) as bytes, and the entries
+    (key, value, hash) in table order, SC chains from head to tail
+    """
+    buckets, capacity = m._buckets, m._capacity
+    entries = []
+    if isinstance(m, hash_map_oa.HashMap):
+        states = bytearray(capacity)
+        for idx in range(capacity):
+            entry = buckets[idx]
+            if entry is None:
+                continue
+            if entry.is_tombstone:
+                states[idx] = TOMBSTONE
+            else:
+                states[idx] = LIVE
+                entries.append((entry.key, entry.value, entry.hash))
+        return bytes(states), entries
+
+    lengths = []
+    for idx in range(capacity):
+        count = 0
+        for node in buckets[idx]:
+            entries.append((node.key, node.value, node.hash))
+            count += 1
+        lengths.append(count)
+    return struct.pack(f'<{capacity}I', *lengths), entries
+
+
+def dump(m, path: str, compress: bool = False, checksum: bool = True) -> None:
+    """
+    Input: OA or SC HashMap (or IncrementalHashMap), file path, whether to zlib-compress the body
+    and whether to store its CRC-32
+    Output: None
+    Function writes a snapshot of m to path. An IncrementalHashMap finishes its migration first.
+    """
+    type_code = next((code for code, map_type in MAP_TYPES.items() if type(m) is map_type), None)
+    if type_code is None:
+        raise ValueError(f'cannot dump a {type(m).__name__}')
+    name = _hash_name(m)
+    if hasattr(m, '_finish_migration'):
+        m._finish_migration()
+
+    table, entries = _entries(m)
+    hashes = [entry[2] for entry in entries]
+    typecode = _hash_typecode(hashes)
+
+    parts = [table, bytes(-len(table) % 8), struct.pack(f'<{len(hashes)}{typecode.decode()}', *hashes)]
+    for key, value, _ in entries:
+        for item in (key, value):
+            data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+    body = b''.join(parts)
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= COMPRESSED
+    crc = 0
+    if checksum:
+        crc = zlib.crc32(body)
+        flags |= CHECKSUM
+
+    slotted = m._array_type is not DynamicArray
+    threshold = getattr(m, '_tombstone_threshold', None)
+    longest = m._max_probe if isinstance(m, hash_map_oa.HashMap) else m._max_chain
+    header = HEADER.pack(MAGIC, VERSION, type_code, SIZINGS.index(m._sizing), flags, slotted,
+                         typecode, m._capacity, len(entries), crc, len(body), longest,
+                         float('nan') if threshold is None else threshold,
+                         getattr(m, 'migration_budget', 0), name.encode())
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(body)
+
+
+def load(path: str, verify: bool = True):
+    """
+    Input: path of a file written by dump(); verify=True checks the CRC-32 (if stored) and
+    that the hash function still gives the first entry's stored hash
+    Output: map of the type that was dumped, with the same contents and layout
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < HEADER.size:
+            raise ValueError(f'{path} is not a hash map snapshot')
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    # every view of the mapping is released by the with blocks in _load, even when a check fails,
+    # so it can be closed here; the loaded map holds no reference into it
+    with mm, memoryview(mm) as view:
+        return _load(view, path, verify)
+
+
+def _load(view: memoryview, path: str, verify: bool):
+    """
+    Input: memoryview of a snapshot file, its path (for messages) and the verify flag of load()
+    Output: the loaded map
+    """
+    if len(view) < HEADER.size or bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f'{path} is not a hash map snapshot')
+    header = HEADER.unpack_from(view)
+    (_, version, type_code, sizing_code, flags, slotted, typecode, capacity, size, crc, body_length,
+     longest, threshold, budget, name) = header
+    if version != VERSION:
+        raise ValueError(f'{path} has snapshot version {version}, expected {VERSION}')
+
+    name = name.rstrip(b'\x00').decode()
+    if name not in STABLE_HASH_FUNCTIONS:
+        raise ValueError(f'{path} uses hash function {name!r}, whose hashes differ between processes')
+
+    with view[HEADER.size:HEADER.size + body_length] as body:
+        if len(body) != body_length:
+            raise ValueError(f'{path} is truncated')
+        if verify and flags & CHECKSUM and zlib.crc32(body) != crc:
+            raise ValueError(f'{path} fails its checksum')
+        if flags & COMPRESSED:
+            m = _load_body(memoryview(zlib.decompress(body)), header, name)
+        else:
+            m = _load_body(body, header, name)
+
+    if verify and m._size:
+        key, hash = _first_entry(m)
+        if m._hash_function(key) != hash:
+            raise ValueError(f'{path} was dumped with different {name!r} hashes than this process computes')
+    return m
+
+
+def _load_body(body: memoryview, header: tuple, name: str):
+    """
+    Input: uncompressed body, the unpacked header fields (migration budget 0 if not stored)
+    and the hash function name
+    Output: the loaded map. Every view taken of body is released before returning or raising.
+    """
+    (_, _, type_code, sizing_code, flags, slotted, typecode, capacity, size, crc, body_length,
+     longest, threshold, budget, _) = header
+
+    map_type = MAP_TYPES[type_code]
+    options = {'slotted': bool(slotted), 'sizing': SIZINGS[sizing_code]}
+    if issubclass(map_type, hash_map_oa.HashMap):
+        options['tombstone_threshold'] = None if threshold != threshold else threshold
+    if budget and hasattr(map_type, '_finish_migration'):
+        options['migration_budget'] = budget
+    # capacity 1 keeps the constructor's own bucket array tiny; it is replaced below
+    m = map_type(1, name, **options)
+
+    # the table section, then the hashes, 8 byte aligned
+    is_oa = isinstance(m, hash_map_oa.HashMap)
+    table_length = capacity if is_oa else 4 * capacity
+    offset = table_length + (-table_length % 8)
+    with body[offset:offset + 8 * size] as raw, raw.cast(typecode.decode()) as hashes:
+        entries = iter(_records(body, offset + 8 * size, size, hashes))
+    if is_oa:
+        with body[:capacity] as states:
+            _restore_oa(m, states, entries)
+        m._max_probe = longest
+    else:
+        with body[:table_length] as raw, raw.cast('I') as lengths:
+            _restore_sc(m, lengths, entries)
+        m._max_chain = longest
+    m._capacity, m._size = capacity, size
+    return m
+
+
+def _records(body: memoryview, offset: int, size: int, hashes: memoryview) -> list:
+    """
+    Return the size (key, value, hash) entries stored in body from offset on
+    """
+    loads, unpack_from = pickle.loads, LENGTH.unpack_from
+    records = []
+    for idx in range(size):
+        key_length, = unpack_from(body, offset)
+        offset += 4
+        key = loads(body[offset:offset + key_length])
+        offset += key_length
+        value_length, = unpack_from(body, offset)
+        offset += 4
+        records.append((key, loads(body[offset:offset + value_length]), hashes[idx]))
+        offset += value_length
+    return records
+
+
+def _first_entry(m) -> (str, int):
+    """
+    Return the key and cached hash of the first entry of m in table order
+    """
+    for idx in range(m._capacity):
+        bucket = m._buckets[idx]
+        if isinstance(m, hash_map_oa.HashMap):
+            if bucket is not None and not bucket.is_tombstone:
+                return bucket.key, bucket.hash
+        elif bucket.length():
+            node = next(iter(bucket))
+            return node.key, node.hash
+
+
+def _restore_oa(m, states: memoryview, entries) -> None:
+    """
+    Fill an OA map's slots from the state bytes and the (key, value, hash) entries in slot order
+    """
+    entry_type = m._entry_type
+    slots = [None] * len(states)
+    tombstones = 0
+    for idx, state in enumerate(states):
+        if state == LIVE:
+            key, value, hash = next(entries)
+            slots[idx] = entry_type(key, value, hash)
+        elif state == TOMBSTONE:
+            # a tombstone only has to keep probe sequences going, like _MIGRATED
+            tombstone = entry_type(None, None)
+            tombstone.is_tombstone = True
+            slots[idx] = tombstone
+            tombstones += 1
+    m._buckets = m._array_type(slots)
+    m._tombstones = tombstones
+
+
+def _restore_sc(m, lengths: memoryview, entries) -> None:
+    """
+    Fill an SC map's chains from their lengths and the (key, value, hash) entries in chain order
+    """
+    list_type = m._list_type
+    buckets = []
+    empty = 0
+    for length in lengths:
+        chain = list_type()
+        if length == 0:
+            empty += 1
+        else:
+            # insert() adds at the head, so the chain is built from its tail
+            for key, value, hash in reversed([next(entries) for _ in range(length)]):
+                chain.insert(key, value, hash)
+        buckets.append(chain)
+    m._buckets = m._array_type(buckets)
+    m._empty = empty
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+
+    print("\nOA map with tombstones")
+    print("----------------------")
+    m = hash_map_oa.HashMap(11, 'hash_function_2', tombstone_threshold=None)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 3):
+        m.remove('str' + str(i))
+    path = os.path.join(directory, 'oa.snap')
+    dump(m, path)
+    loaded = load(path)
+    print(loaded.get_size(), loaded.get_capacity(), loaded.get_tombstones(), loaded.get('str7'), loaded.get('str9'))
+    print(str(loaded.get_keys_and_values()) == str(m.get_keys_and_values()), os.path.getsize(path))
+
+    print("\nSC map, compressed")
+    print("------------------")
+    m = hash_map_sc.HashMap(11, 'fnv1a', sizing='pow2')
+    for i in range(1000):
+        m.put('key' + str(i), [i])
+    path = os.path.join(directory, 'sc.snap')
+    dump(m, path, compress=True)
+    loaded = load(path)
+    print(loaded.get_size(), loaded.get_capacity(), loaded.empty_buckets(), loaded.get('key512'))
+    print(str(loaded) == str(m), os.path.getsize(path))
+
+    print("\ncorrupted file")
+    print("--------------")
+    with open(path, 'r+b') as file:
+        file.seek(HEADER.size + 10)
+        file.write(b'\xff')
+    try:
+        load(path)
+    except ValueError as error:
+        print(error.args[0].split('/')[-1])
@@ -0,0 +1,543 @@
+"""
+Time-to-live variants of the OA and SC HashMaps.
+
+put(key, value, ttl=seconds) gives an entry a deadline. Expired entries are
+dropped two ways:
+- lazily: a get/contains_key/remove that finds an expired entry removes it
+  and reports the key as missing
+- proactively: every deadline is also scheduled on a hierarchical TimerWheel,
+  and each operation reclaims at most expire_budget of the entries that have
+  come due, so no operation ever scans the table
+
+The OA map turns expired entries into tombstones (compacting past its
+tombstone threshold, like remove()). The SC map unlinks them from their chain.
+"""
+import time
+from collections import deque
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import (DynamicArray, HashEntry, LinkedList, SLNode, hash_many, to_list,
+                        hash_function_1, hash_function_2)
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck).
+
+    Time moves in ticks of tick seconds. Level 0 has one slot per tick for
+    the next slots ticks; each level above covers slots times the span of the
+    one below. A timer sits in the lowest level whose span reaches its
+    deadline, and is moved down ("cascaded") when the level below wraps
+    around to its slot, so scheduling and advancing by one tick are O(1)
+    apart from the cascades. advance() goes straight from one tick with a
+    non-empty slot to the next, so a long idle gap costs at most
+    levels * slots slot checks, not one step per tick. Due timers are
+    queued for pop_due().
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, now: float = 0.0) -> None:
+        """
+        Initialize an empty wheel whose current time is now
+        """
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        # ticks already processed; timers for tick <= _current are due
+        self._current = int(now // tick)
+        # timers still in the wheels, in total and per level
+        self._pending = 0
+        self._level_sizes = [0] * levels
+        self._due = deque()
+
+    def pending(self) -> int:
+        """
+        Return the number of timers scheduled but not yet due
+        """
+        return self._pending
+
+    def due(self) -> int:
+        """
+        Return the number of due timers waiting for pop_due()
+        """
+        return len(self._due)
+
+    def schedule(self, item: object, deadline: float) -> None:
+        """
+        Input: item to hand back once deadline (same clock as advance()) has passed
+        Output: None
+        """
+        # the first tick at or after the deadline
+        self._pending += 1
+        self._place(item, -int(-deadline // self._tick))
+
+    def _place(self, item: object, when: int) -> None:
+        """
+        Input: item and the tick it is due at
+        Output: None
+        Method puts item in the lowest level that reaches when, or in the due queue
+        """
+        delta = when - self._current
+        if delta <= 0:
+            self._pending -= 1
+            self._due.append(item)
+            return
+
+        level, span, width = 0, self._slots, 1
+        while delta >= span and level < self._levels - 1:
+            level += 1
+            width = span
+            span *= self._slots
+
+        # beyond the top level: park it at the top level's furthest slot, it is placed again on cascade
+        slot_tick = when if delta < span else self._current + span - 1
+        self._wheels[level][slot_tick // width % self._slots].append((when, item))
+        self._level_sizes[level] += 1
+
+    def _next_tick(self) -> int:
+        """
+        Return the first tick after the current one that has work: a level 0 slot with timers
+        comes due, or a higher level slot with timers cascades. None if the wheels are empty.
+        """
+        current, slots = self._current, self._slots
+        best, width = None, 1
+        for level in range(self._levels):
+            if self._level_sizes[level]:
+                wheel = self._wheels[level]
+                # the slots of a level are processed at the multiples of its width, in slot order
+                first = current // width + 1
+                for n in range(first, first + slots):
+                    if best is not None and n * width >= best:
+                        break
+                    if wheel[n % slots]:
+                        best = n * width
+                        break
+            # nothing can come sooner than the next tick
+            if best == current + 1:
+                break
+            width *= slots
+        return best
+
+    def advance(self, now: float) -> None:
+        """
+        Input: current time
+        Output: None
+        Method processes every tick up to now, moving timers that came due to the due queue
+        """
+        target = int(now // self._tick)
+        slots = self._slots
+        while self._current < target:
+            # the ticks in between have nothing to do, so skip them
+            current = self._next_tick()
+            if current is None or current > target:
+                self._current = target
+                break
+            self._current = current
+
+            # cascade from the top down, so a timer can fall through several levels in one tick
+            for level in range(self._levels - 1, 0, -1):
+                width = slots ** level
+                if current % width == 0:
+                    bucket = self._wheels[level][current // width % slots]
+                    if bucket:
+                        self._wheels[level][current // width % slots] = []
+                        self._level_sizes[level] -= len(bucket)
+                        for when, item in bucket:
+                            self._place(item, when)
+
+            bucket = self._wheels[0][current % slots]
+            if bucket:
+                self._wheels[0][current % slots] = []
+                self._level_sizes[0] -= len(bucket)
+                # _place() hands over the due timers, and parks far-off ones again
+                for when, item in bucket:
+                    self._place(item, when)
+
+    def pop_due(self, budget: int = None) -> list:
+        """
+        Input: maximum number of timers to return (None for all)
+        Output: list of due items, oldest first
+        """
+        count = len(self._due) if budget is None else min(budget, len(self._due))
+        return [self._due.popleft() for _ in range(count)]
+
+    def clear(self) -> None:
+        """
+        Drop every timer
+        """
+        self._wheels = [[[] for _ in range(self._slots)] for _ in range(self._levels)]
+        self._pending = 0
+        self._level_sizes = [0] * self._levels
+        self._due.clear()
+
+
+class TTLHashEntry(HashEntry):
+    """
+    HashEntry with an expiry time (None for entries that never expire)
+    """
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry that does not expire yet."""
+        super().__init__(key, value, hash)
+        self.expires = None
+
+
+class TTLNode(SLNode):
+    """
+    SLNode with an expiry time (None for entries that never expire)
+    """
+
+    def __init__(self, key: str, value: object, next: SLNode = None, hash: int = None) -> None:
+        """Initialize a node that does not expire yet."""
+        super().__init__(key, value, next, hash)
+        self.expires = None
+
+
+class TTLChain(LinkedList):
+    """
+    Bucket list of an SCTTLHashMap: a LinkedList of TTLNodes whose insert returns the new node
+    """
+    _node_type = TTLNode
+
+    def insert(self, key: str, value: object, hash: int = None) -> TTLNode:
+        """Insert new node at front of the list and return it."""
+        super().insert(key, value, hash)
+        return self._head
+
+
+class _TTLMixin:
+    """
+    Expiry logic shared by OATTLHashMap and SCTTLHashMap. The map class provides
+    _entry(key, hash) (entry or node for key, expired or not) and _reclaim(entry).
+    """
+
+    def _init_ttl(self, default_ttl: float, clock, tick: float, expire_budget: int) -> None:
+        """
+        Set up the expiry state; called by the map constructors
+        """
+        self._default_ttl = default_ttl
+        self._clock = clock
+        self._wheel = TimerWheel(tick, now=clock())
+        self.expire_budget = expire_budget
+        # ttl of the put() in progress, read by _put_hashed (None means default_ttl)
+        self._put_ttl = None
+        # entries reclaimed after expiring, lazily or by the wheel
+        self.expired = 0
+
+    def _expired(self, entry) -> bool:
+        """
+        Return True if entry has a deadline that has passed
+        """
+        return entry.expires is not None and entry.expires <= self._clock()
+
+    def expire(self, budget: int = None) -> int:
+        """
+        Input: maximum number of due entries to reclaim (None for all)
+        Output: number of entries reclaimed
+        Method advances the timer wheel to now and reclaims entries whose deadlines have passed.
+        Every operation calls it with expire_budget; call it directly to reclaim more.
+        """
+        self._wheel.advance(self._clock())
+        reclaimed = 0
+        for deadline, key, hash in self._wheel.pop_due(budget):
+            entry = self._entry(key, hash)
+            # entries removed or put again since this timer was scheduled are skipped
+            if entry is not None and entry.expires == deadline:
+                self._reclaim(entry)
+                reclaimed += 1
+        return reclaimed
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Input: key, value and time to live in seconds (None for the map's default_ttl)
+        Output: None
+        Method adds or updates key; its deadline is set from ttl, replacing any earlier one
+        """
+        self.expire(self.expire_budget)
+        self._put_ttl = ttl
+        try:
+            super().put(key, value)
+        finally:
+            self._put_ttl = None
+
+    def put_many(self, pairs, ttl: float = None) -> None:
+        """
+        Input: DynamicArray or iterable of (key, value) pairs, and time to live for all of them
+        Output: None
+        """
+        self.expire(self.expire_budget)
+        self._put_ttl = ttl
+        try:
+            super().put_many(pairs)
+        finally:
+            self._put_ttl = None
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Input: key, value and the full hash of key
+        Output: None
+        Method inserts or updates key, then gives it its deadline and schedules that on the wheel
+        """
+        super()._put_hashed(key, value, hash)
+        ttl = self._default_ttl if self._put_ttl is None else self._put_ttl
+        entry = self._entry(key, hash)
+        if ttl is None:
+            entry.expires = None
+        else:
+            entry.expires = deadline = self._clock() + ttl
+            self._wheel.schedule((deadline, key, hash), deadline)
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key, or None if key is not in the map or has expired
+        """
+        self.expire(self.expire_budget)
+        return super().get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool, False for keys that have expired
+        """
+        self.expire(self.expire_budget)
+        return super().contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Input: Key value to attempt to remove (string)
+        Output: None
+        """
+        self.expire(self.expire_budget)
+        super().remove(key)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: DynamicArray
+        Method returns a DA holding the value of each key, in order (None for missing or expired keys)
+        """
+        self.expire(self.expire_budget)
+        return_da = DynamicArray()
+        keys = to_list(keys)
+        hashes = hash_many(self._hash_function, keys)
+        for idx in range(len(keys)):
+            entry = self._entry(keys[idx], hashes[idx])
+            if entry is not None and self._expired(entry):
+                self._reclaim(entry)
+                entry = None
+            return_da.append(None if entry is None else entry.value)
+        return return_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Input: DynamicArray or iterable of keys
+        Output: None
+        """
+        self.expire(self.expire_budget)
+        super().remove_many(keys)
+
+    def ttl(self, key: str) -> float:
+        """
+        Input: key
+        Output: seconds until key expires, or None if it is missing, expired or never expires
+        """
+        entry = self._entry(key, self._hash_function(key))
+        if entry is None or entry.expires is None or self._expired(entry):
+            return None
+        return entry.expires - self._clock()
+
+    def clear(self) -> None:
+        """
+        Input: None
+        Output: None
+        Method clears the map and its timers. Does not change underlying hash table capacity.
+        """
+        super().clear()
+        self._wheel.clear()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Input: None
+        Output: Dynamic Array
+        Method returns a DA of (key, value) tuples for the entries that have not expired
+        """
+        return_da = DynamicArray()
+        for key, value in to_list(super().get_keys_and_values()):
+            entry = self._entry(key, self._hash_function(key))
+            if not self._expired(entry):
+                return_da.append((key, value))
+        return return_da
+
+    def _live_entries(self):
+        """
+        Generator of the map's entries that have not expired (expired ones are left for expire(),
+        since reclaiming them here would end the iteration)
+        """
+        for entry in super()._live_entries():
+            if not self._expired(entry):
+                yield entry
+
+    def stats(self) -> dict:
+        """
+        Input: None
+        Output: dict of occupancy statistics plus the expiry counters
+        """
+        stats = super().stats()
+        stats.update({
+            'expired': self.expired,
+            'timers_pending': self._wheel.pending(),
+            'timers_due': self._wheel.due(),
+        })
+        return stats
+
+
+class OATTLHashMap(_TTLMixin, hash_map_oa.HashMap):
+    """
+    Open addressing HashMap whose entries can expire. Expired entries become tombstones.
+    """
+
+    def __init__(self, capacity: int, function, default_ttl: float = None, clock=time.monotonic,
+                 tick: float = 1.0, expire_budget: int = 16, tombstone_threshold: float = 0.25,
+                 sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty OATTLHashMap.
+        default_ttl applies to puts without a ttl (None: no expiry). clock returns the
+        current time in seconds; the timer wheel works in ticks of tick seconds. Each
+        operation reclaims at most expire_budget due entries.
+        """
+        super().__init__(capacity, function, tombstone_threshold=tombstone_threshold, sizing=sizing)
+        self._entry_type = TTLHashEntry
+        self._init_ttl(default_ttl, clock, tick, expire_budget)
+
+    def _entry(self, key: str, hash: int) -> TTLHashEntry:
+        """
+        Return the live entry for key, expired or not, or None
+        """
+        return hash_map_oa.HashMap._find_entry(self, self._buckets, key, hash)
+
+    def _find_entry(self, buckets: DynamicArray, key: str, hash: int) -> TTLHashEntry:
+        """
+        Input: bucket array to probe, key and its full hash
+        Output: live, unexpired entry for key, or None. An expired entry found here is reclaimed.
+        """
+        entry = super()._find_entry(buckets, key, hash)
+        if entry is not None and self._expired(entry):
+            self._reclaim(entry)
+            return None
+        return entry
+
+    def _reclaim(self, entry: TTLHashEntry) -> None:
+        """
+        Turn an expired entry into a tombstone
+        """
+        self._remove_entry(entry)
+        self.expired += 1
+
+
+class SCTTLHashMap(_TTLMixin, hash_map_sc.HashMap):
+    """
+    Separate chaining HashMap whose entries can expire. Expired nodes are unlinked.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 default_ttl: float = None, clock=time.monotonic, tick: float = 1.0,
+                 expire_budget: int = 16, sizing: str = 'prime') -> None:
+        """
+        Initialize new, empty SCTTLHashMap.
+        default_ttl applies to puts without a ttl (None: no expiry). clock returns the
+        current time in seconds; the timer wheel works in ticks of tick seconds. Each
+        operation reclaims at most expire_budget due entries.
+        """
+        super().__init__(capacity, function, sizing=sizing)
+        self._list_type = TTLChain
+        self._init_ttl(default_ttl, clock, tick, expire_budget)
+        # rebuild the buckets from TTLChains
+        self.clear()
+
+    def _entry(self, key: str, hash: int) -> TTLNode:
+        """
+        Return the node for key, expired or not, or None
+        """
+        return self._buckets[hash % self._capacity].contains(key, hash)
+
+    def _live(self, key: str, hash: int) -> TTLNode:
+        """
+        Return the unexpired node for key, or None. An expired node found here is reclaimed.
+        """
+        node = self._buckets[hash % self._capacity].contains(key, hash)
+        if node is not None and self._expired(node):
+            self._reclaim(node)
+            return None
+        return node
+
+    def _reclaim(self, node: TTLNode) -> None:
+        """
+        Unlink an expired node from its chain
+        """
+        self._remove_hashed(node.key, node.hash)
+        self.expired += 1
+
+    def _move_node(self, node: TTLNode) -> None:
+        """
+        Input: node from another bucket array
+        Output: None
+        Method moves the node's entry into the current buckets, keeping its deadline
+        """
+        list = self._buckets[node.hash % self._capacity]
+        if list.length() == 0:
+            self._empty -= 1
+        list.insert(node.key, node.value, node.hash).expires = node.expires
+        if list.length() > self._max_chain:
+            self._max_chain = list.length()
+
+    def get(self, key: str) -> object:
+        """
+        Input: String (Key) to locate
+        Output: Value of key, or None if key is not in the map or has expired
+        """
+        self.expire(self.expire_budget)
+        node = self._live(key, self._hash_function(key))
+        return None if node is None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Input Key to attempt to locate in Hash
+        Output: Bool, False for keys that have expired
+        """
+        self.expire(self.expire_budget)
+        return self._live(key, self._hash_function(key)) is not None
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    class FakeClock:
+        """Clock that only moves when told to"""
+
+        def __init__(self) -> None:
+            self.now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+    for map_type in (OATTLHashMap, SCTTLHashMap):
+        print("\n" + map_type.__name__)
+        print("-" * len(map_type.__name__))
+        clock = FakeClock()
+        m = map_type(11, hash_function_2, clock=clock, expire_budget=4)
+        m.put('session1', 'alice', ttl=30)
+        m.put('session2', 'bob', ttl=90)
+        m.put('config', 'forever')
+        clock.now = 31
+        print(m.get('session1'), m.contains_key('session2'), m.ttl('session2'), m.get_size())
+
+        # 200 sessions expire while nobody looks them up; the wheel reclaims them in batches of 4
+        for idx in range(200):
+            m.put('tmp' + str(idx), idx, ttl=5)
+        clock.now = 100
+        for _ in range(10):
+            m.get('config')
+        print(m.get_size(), m.expired, m.expire(), m.get_size(), m.get_keys_and_values())